@@ -1,4 +1,5 @@
 """Agents package."""
-from .decision_agent import DecisionAgent
+from .decision_agent import DecisionAgent, shared_agent
+from .offline_agent import OfflineDecisionAgent
 
-__all__ = ["DecisionAgent"]
+__all__ = ["DecisionAgent", "OfflineDecisionAgent", "shared_agent"]
@@ -1,204 +1,234 @@
 """Agent for generating decisions and analyzing impacts using Gemini."""
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
-from typing import Dict, List
-import json
+from typing import Dict, Iterator, List, Optional
+import threading
 import config
+from models import GameConfig
+from models.schemas import SchemaError, validate_scenario, validate_scenarios
+from .json_stream import JSONArrayStreamParser
+from .model_clients import model_clients
+from .prompts import (
+    DECISIONS, FINAL_REPORT, READINESS, generate, generate_stream, maturity_line, parse_json_response
+)
+from .readiness import (
+    ReadinessMemo, as_text_list, bucket_ranges, maturity_bucket, memo_key, readiness_verdict
+)
+
+
+_shared_agent: Optional['DecisionAgent'] = None
+_shared_lock = threading.Lock()
+
+
+def shared_agent() -> 'DecisionAgent':
+    """Get the decision agent shared by the game engines of the process."""
+    global _shared_agent
+    if _shared_agent is None:
+        with _shared_lock:
+            if _shared_agent is None:
+                _shared_agent = DecisionAgent()
+    return _shared_agent
 
 
 class DecisionAgent:
     """Agent that uses Gemini to generate decisions and analyze game scenarios."""
     
     def __init__(self):
-        """Initialize the Decision Agent with Vertex AI."""
-        if config.PROJECT_ID:
-            vertexai.init(project=config.PROJECT_ID, location=config.LOCATION)
-        self.model = GenerativeModel(config.MODEL_NAME)
-        self.generation_config = GenerationConfig(
-            temperature=0.7,
-            top_p=0.9,
-            max_output_tokens=2048,
+        """Initialize the Decision Agent.
+
+        Model clients come from the process-wide registry (created on first
+        use), so constructing an agent costs nothing at application start-up.
+        """
+        self._readiness_memo = None
+    
+    @property
+    def model(self):
+        """Shared Gemini model client."""
+        return model_clients.model()
+    
+    def _build_decision_prompt(self, game_state: Dict, week: int) -> str:
+        """Build the prompt for generating decision scenarios."""
+        return DECISIONS.render(
+            week=week,
+            budget=game_state['budget'],
+            time_remaining_weeks=game_state['time_remaining_weeks'],
+            resources=game_state['resources'],
+            maturity=maturity_line(game_state['maturity'])
         )
     
     def generate_decision_scenarios(self, game_state: Dict, week: int) -> List[Dict]:
         """Generate decision scenarios based on current game state."""
-        prompt = f"""You are an AI advisor for an enterprise multi-agent platform development simulation.
-
-Current Game State (Week {week}):
-- Budget: ${game_state['budget']:,}
-- Time Remaining: {game_state['time_remaining_weeks']} weeks
-- Resources: {game_state['resources']} team members
-- Maturity Levels:
-  * Agent Development: {game_state['maturity']['agent_development']}/100
-  * Agent Operations: {game_state['maturity']['agent_operations']}/100
-  * Data Platforms: {game_state['maturity']['data_platforms']}/100
-  * Security: {game_state['maturity']['security']}/100
-  * Governance: {game_state['maturity']['governance']}/100
-
-Generate 2-3 realistic decision scenarios that the player must choose from. Each decision should:
-1. Be relevant to the current maturity levels (focus on weaker areas)
-2. Have trade-offs between cost, time, and maturity improvements
-3. Include both immediate and potential delayed impacts
-4. Reflect real enterprise challenges in building agentic platforms
-
-Return your response as a JSON array with this structure:
-[
-  {{
-    "id": "unique_id",
-    "title": "Decision Title",
-    "description": "Detailed description of the situation",
-    "category": "development|operations|data|security|governance|strategic",
-    "options": [
-      {{
-        "id": "option_id",
-        "text": "Option description",
-        "cost": 50000,
-        "time_weeks": 4,
-        "resources_required": 2,
-        "maturity_impact": {{
-          "agent_development": 10,
-          "agent_operations": 5,
-          "data_platforms": 0,
-          "security": 0,
-          "governance": 0
-        }},
-        "immediate_impact": true,
-        "delayed_impact_weeks": 0,
-        "consequences": "What happens if you choose this"
-      }}
-    ]
-  }}
-]
-
-Only return valid JSON, no additional text."""
+        prompt = self._build_decision_prompt(game_state, week)
 
         try:
-            response = self.model.generate_content(
+            response = generate(
+                self.model,
+                DECISIONS,
                 prompt,
-                generation_config=self.generation_config
+                generation_config=model_clients.generation_config(DECISIONS.name)
             )
             
-            # Parse JSON response
-            response_text = response.text.strip()
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            decisions = json.loads(response_text.strip())
+            decisions, errors = validate_scenarios(parse_json_response(response.text))
+            for error in errors:
+                print(f"Dropping invalid AI decision {error['id'] or error['index']}: {error['errors']}")
+            if not decisions:
+                raise ValueError("AI returned no valid decisions")
             return decisions
         except Exception as e:
             print(f"Error generating decisions: {e}")
             return self._get_fallback_decisions(game_state)
     
-    def analyze_production_readiness(self, maturity: Dict[str, int]) -> Dict:
-        """Analyze if the platform is ready for production."""
-        prompt = f"""Analyze the production readiness of a multi-agent platform with these maturity levels:
-
-- Agent Development: {maturity['agent_development']}/100
-- Agent Operations: {maturity['agent_operations']}/100
-- Data Platforms: {maturity['data_platforms']}/100
-- Security: {maturity['security']}/100
-- Governance: {maturity['governance']}/100
-
-Thresholds:
-- Production Ready: 60+
-- Minimum Acceptable: 40-59
-- Not Ready: <40
-
-Provide analysis as JSON:
-{{
-  "ready_for_production": true/false,
-  "risk_level": "low|medium|high|critical",
-  "weak_areas": ["list of capabilities below 60"],
-  "critical_gaps": ["list of capabilities below 40"],
-  "potential_issues": ["list of 3-5 specific issues that may occur in production"],
-  "recommendations": ["list of 3-5 recommendations to improve readiness"]
-}}
-
-Only return valid JSON."""
-
+    def stream_decision_scenarios(self, game_state: Dict, week: int) -> Iterator[Dict]:
+        """
+        Stream decision scenarios as the model generates them.
+        
+        Each decision is yielded as soon as its JSON object is complete, so
+        the first one arrives long before the full completion does. Falls
+        back to the predefined decisions if the stream fails before yielding.
+        """
+        prompt = self._build_decision_prompt(game_state, week)
+        yielded = 0
+        
         try:
-            response = self.model.generate_content(
+            responses = generate_stream(
+                self.model,
+                DECISIONS,
                 prompt,
-                generation_config=self.generation_config
+                generation_config=model_clients.generation_config(DECISIONS.name)
             )
             
-            response_text = response.text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
+            parser = JSONArrayStreamParser()
+            for response in responses:
+                for element in parser.feed(self._chunk_text(response)):
+                    try:
+                        decision = validate_scenario(element)
+                    except SchemaError as e:
+                        print(f"Dropping invalid streamed decision: {e}")
+                        continue
+                    yielded += 1
+                    yield decision
+                if parser.done:
+                    break
+        except Exception as e:
+            print(f"Error streaming decisions: {e}")
+        
+        if not yielded:
+            yield from self._get_fallback_decisions(game_state)
+    
+    @staticmethod
+    def _chunk_text(response) -> str:
+        """Get the text of a streamed chunk (empty for chunks without text)."""
+        try:
+            return response.text
+        except (ValueError, AttributeError, IndexError):
+            return ""
+    
+    @property
+    def readiness_memo(self) -> ReadinessMemo:
+        """Persistent memo of readiness prose, opened on first access."""
+        if self._readiness_memo is None:
+            self._readiness_memo = ReadinessMemo(config.READINESS_CACHE_FILE)
+        return self._readiness_memo
+    
+    def cache_usage(self) -> Dict:
+        """Get the entry count and approximate bytes of this agent's in-process caches."""
+        if self._readiness_memo is None:
+            return {}
+        return {"readiness_memo": self._readiness_memo.usage()}
+    
+    def analyze_production_readiness(self, maturity: Dict[str, int],
+                                     game_config: Optional[GameConfig] = None) -> Dict:
+        """
+        Analyze if the platform is ready for production.
+        
+        The verdict (readiness, risk level, weak areas, critical gaps) is
+        computed from the thresholds. Only the potential issues and
+        recommendations are written by the AI, once per maturity bucket, and
+        memoized, so launches with a known profile need no model call.
+        
+        Args:
+            maturity: Maturity per capability
+            game_config: Thresholds to apply (defaults to config)
+        """
+        game_config = game_config or GameConfig.defaults()
+        analysis = readiness_verdict(maturity, game_config)
+        
+        bucket_size = config.READINESS_BUCKET_SIZE
+        bucket = maturity_bucket(maturity, bucket_size)
+        key = memo_key(bucket, bucket_size, game_config, analysis)
+        prose = self.readiness_memo.get(key)
+        if prose is None:
+            prose = self._generate_readiness_prose(bucket_ranges(bucket, bucket_size), analysis, game_config)
+            if prose is not None:
+                self.readiness_memo.put(key, prose)
+            else:
+                # Not memoized, so the model is asked again next time
+                prose = self._get_fallback_readiness_prose()
+        
+        analysis.update({field: list(items) for field, items in prose.items()})
+        return analysis
+    
+    def _generate_readiness_prose(self, ranges: Dict[str, str], verdict: Dict,
+                                  game_config: GameConfig) -> Optional[Dict]:
+        """Ask the model for potential issues and recommendations for a maturity bucket."""
+        ready = game_config.production_ready_threshold
+        prompt = READINESS.render(
+            maturity=", ".join(f"{d} {r}" for d, r in ranges.items()),
+            ready=ready,
+            minimum=game_config.minimum_acceptable_threshold,
+            ready_below=ready - 1,
+            risk_level=verdict['risk_level'],
+            weak_areas=', '.join(verdict['weak_areas']) or 'none',
+            critical_gaps=', '.join(verdict['critical_gaps']) or 'none'
+        )
+
+        try:
+            response = generate(
+                self.model,
+                READINESS,
+                prompt,
+                generation_config=model_clients.generation_config(READINESS.name)
+            )
             
-            analysis = json.loads(response_text.strip())
-            return analysis
+            result = parse_json_response(response.text)
+            prose = {
+                "potential_issues": as_text_list(result.get("potential_issues")),
+                "recommendations": as_text_list(result.get("recommendations"))
+            }
+            if not prose["potential_issues"] and not prose["recommendations"]:
+                raise ValueError("No issues or recommendations in response")
+            return prose
         except Exception as e:
             print(f"Error analyzing production readiness: {e}")
-            return self._get_fallback_analysis(maturity)
+            return None
     
-    def generate_final_report(self, game_state: Dict) -> Dict:
-        """Generate final game report with analysis and prescriptive guidance."""
-        prompt = f"""Generate a comprehensive final report for an enterprise multi-agent platform development simulation.
-
-Final Game State:
-- Budget Used: ${config.INITIAL_BUDGET - game_state['budget']:,} of ${config.INITIAL_BUDGET:,}
-- Time Taken: {game_state['current_week']} weeks
-- Decisions Made: {len(game_state['decisions_made'])}
-- Production Launch: Week {game_state.get('production_week', 'N/A')}
-
-Final Maturity Levels:
-- Agent Development: {game_state['maturity']['agent_development']}/100
-- Agent Operations: {game_state['maturity']['agent_operations']}/100
-- Data Platforms: {game_state['maturity']['data_platforms']}/100
-- Security: {game_state['maturity']['security']}/100
-- Governance: {game_state['maturity']['governance']}/100
-
-Production Issues Encountered: {len(game_state.get('production_issues', []))}
-
-Provide a detailed report as JSON:
-{{
-  "overall_score": 0-100,
-  "grade": "A+|A|B|C|D|F",
-  "summary": "Brief summary of performance",
-  "strengths": ["list of 3-5 strengths"],
-  "weaknesses": ["list of 3-5 weaknesses"],
-  "key_learnings": ["list of 5-7 key lessons learned"],
-  "prescriptive_guidance": {{
-    "short_term": ["3-5 immediate actions to take"],
-    "medium_term": ["3-5 actions for next 6 months"],
-    "long_term": ["3-5 strategic initiatives"]
-  }},
-  "best_practices": ["5-7 best practices for multi-agent platform development"],
-  "recommendations": ["5-7 specific recommendations based on the gameplay"]
-}}
-
-Only return valid JSON."""
+    def generate_final_report(self, game_state: Dict, game_config: Optional[GameConfig] = None) -> Dict:
+        """
+        Generate final game report with analysis and prescriptive guidance.
+        
+        Args:
+            game_state: Final game state
+            game_config: Parameters the game was played with (defaults to config)
+        """
+        initial_budget = (game_config or GameConfig.defaults()).initial_budget
+        production_week = game_state.get('production_week')
+        prompt = FINAL_REPORT.render(
+            spent=initial_budget - game_state['budget'],
+            initial_budget=initial_budget,
+            weeks=game_state['current_week'],
+            decisions=len(game_state['decisions_made']),
+            production_week='N/A' if production_week is None else production_week,
+            production_issues=len(game_state.get('production_issues', [])),
+            maturity=maturity_line(game_state['maturity'])
+        )
 
         try:
-            response = self.model.generate_content(
+            response = generate(
+                self.model,
+                FINAL_REPORT,
                 prompt,
-                generation_config=GenerationConfig(
-                    temperature=0.5,
-                    top_p=0.9,
-                    max_output_tokens=3072,
-                )
+                generation_config=model_clients.generation_config(FINAL_REPORT.name)
             )
             
-            response_text = response.text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            report = json.loads(response_text.strip())
-            return report
+            return parse_json_response(response.text)
         except Exception as e:
             print(f"Error generating final report: {e}")
             return self._get_fallback_report(game_state)
@@ -250,17 +280,9 @@ Only return valid JSON."""
             }
         ]
     
-    def _get_fallback_analysis(self, maturity: Dict[str, int]) -> Dict:
-        """Provide fallback analysis if AI analysis fails."""
-        avg = sum(maturity.values()) / len(maturity)
-        weak_areas = [k for k, v in maturity.items() if v < 60]
-        critical_gaps = [k for k, v in maturity.items() if v < 40]
-        
+    def _get_fallback_readiness_prose(self) -> Dict:
+        """Provide fallback issues and recommendations if AI analysis fails."""
         return {
-            "ready_for_production": avg >= 60 and len(critical_gaps) == 0,
-            "risk_level": "low" if avg >= 70 else "medium" if avg >= 50 else "high",
-            "weak_areas": weak_areas,
-            "critical_gaps": critical_gaps,
             "potential_issues": ["System may experience performance issues"],
             "recommendations": ["Focus on improving weak areas before production launch"]
         }
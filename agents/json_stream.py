@@ -0,0 +1,84 @@
+"""Incremental parsing of JSON arrays streamed by the model."""
+from typing import Any, List
+import json
+
+
+class JSONArrayStreamParser:
+    """
+    Parses a JSON array as it arrives, chunk by chunk.
+
+    Each time a top-level object in the array is complete it is decoded and
+    returned from `feed`, without waiting for the rest of the array. Text
+    before the opening bracket (such as a markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._buffer = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._in_array = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk of text and return the elements it completed."""
+        if self.done or not chunk:
+            return []
+
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            char = buffer[i]
+            if not self._in_array:
+                if char == '[':
+                    self._in_array = True
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0:
+                    # Closing bracket of the top-level array
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    element = self._decode(buffer[self._start:i + 1])
+                    if element is not None:
+                        completed.append(element)
+                    self._start = -1
+            i += 1
+
+        # Keep only the unfinished element so the buffer stays small
+        if self._start >= 0:
+            self._buffer = buffer[self._start:]
+            self._pos = i - self._start
+            self._start = 0
+        else:
+            self._buffer = ""
+            self._pos = 0
+        return completed
+
+    @staticmethod
+    def _decode(text: str) -> Any:
+        """Decode one element, skipping it if the model produced invalid JSON."""
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"Skipping invalid streamed element: {e}")
+            return None
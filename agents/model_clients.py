@@ -0,0 +1,90 @@
+"""Process-wide Gemini clients and per-purpose generation configs."""
+from typing import Dict, Optional
+import os
+import threading
+import config
+
+# Generation settings per purpose (the prompt template names)
+GENERATION_SETTINGS: Dict[str, Dict] = {
+    "decisions": {"temperature": 0.7, "top_p": 0.9, "max_output_tokens": 2048},
+    "readiness": {"temperature": 0.7, "top_p": 0.9, "max_output_tokens": 2048},
+    "final_report": {"temperature": 0.5, "top_p": 0.9, "max_output_tokens": 3072},
+    "pdf_scenarios": {"temperature": 0.5, "top_p": 0.9, "max_output_tokens": 4096},
+}
+
+
+class ModelClients:
+    """
+    Gemini model clients shared by every agent and parser of the process.
+
+    Vertex AI is initialised once and each model is created once, so all
+    callers reuse the same client and its connections: more agents, parsers
+    or game engines cost no client setup and open no sockets. A forked
+    worker process builds its own clients instead of using its parent's
+    connections.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Forget all clients (on first use and in a forked child)."""
+        self._pid = os.getpid()
+        self._initialized = False
+        self._models: Dict[str, object] = {}
+        self._configs: Dict[str, object] = {}
+        self.created = 0
+
+    def _current(self) -> bool:
+        """Whether the clients were created by this process."""
+        return self._pid == os.getpid()
+
+    def model(self, name: Optional[str] = None):
+        """Get the shared client of a model (defaults to config.MODEL_NAME)."""
+        name = name or config.MODEL_NAME
+        model = self._models.get(name) if self._current() else None
+        if model is None:
+            with self._lock:
+                if not self._current():
+                    self._reset()
+                model = self._models.get(name)
+                if model is None:
+                    import vertexai
+                    from vertexai.generative_models import GenerativeModel
+                    if not self._initialized:
+                        if config.PROJECT_ID:
+                            vertexai.init(project=config.PROJECT_ID, location=config.LOCATION)
+                        self._initialized = True
+                    model = self._models[name] = GenerativeModel(name)
+                    self.created += 1
+        return model
+
+    def generation_config(self, purpose: str):
+        """
+        Get the shared generation config of a purpose.
+
+        Raises:
+            KeyError: If the purpose is unknown
+        """
+        generation_config = self._configs.get(purpose)
+        if generation_config is None:
+            settings = GENERATION_SETTINGS[purpose]
+            from vertexai.generative_models import GenerationConfig
+            with self._lock:
+                generation_config = self._configs.setdefault(purpose, GenerationConfig(**settings))
+        return generation_config
+
+    def usage(self) -> Dict:
+        """Get the models and generation configs created by this process."""
+        if not self._current():
+            return {"models": [], "generation_configs": [], "created": 0}
+        return {
+            "models": sorted(self._models),
+            "generation_configs": sorted(self._configs),
+            "created": self.created
+        }
+
+
+# Shared by all agents and parsers of the process
+model_clients = ModelClients()
@@ -0,0 +1,34 @@
+"""Decision agent that never calls the model, for headless and batch runs."""
+from typing import Dict, Iterator, List, Optional
+from models import GameConfig
+from .decision_agent import DecisionAgent
+from .readiness import readiness_verdict
+
+
+class OfflineDecisionAgent(DecisionAgent):
+    """
+    Decision agent that always uses the local fallbacks.
+
+    Decisions, readiness prose and final reports come from the built-in
+    fallback content, so games run without Vertex AI credentials, network
+    access or the readiness memo file.
+    """
+
+    def generate_decision_scenarios(self, game_state: Dict, week: int) -> List[Dict]:
+        """Get the fallback decisions."""
+        return self._get_fallback_decisions(game_state)
+
+    def stream_decision_scenarios(self, game_state: Dict, week: int) -> Iterator[Dict]:
+        """Yield the fallback decisions."""
+        yield from self._get_fallback_decisions(game_state)
+
+    def analyze_production_readiness(self, maturity: Dict[str, int],
+                                     game_config: Optional[GameConfig] = None) -> Dict:
+        """Get the readiness verdict with the fallback issues and recommendations."""
+        analysis = readiness_verdict(maturity, game_config)
+        analysis.update(self._get_fallback_readiness_prose())
+        return analysis
+
+    def generate_final_report(self, game_state: Dict, game_config: Optional[GameConfig] = None) -> Dict:
+        """Get the fallback report."""
+        return self._get_fallback_report(game_state)
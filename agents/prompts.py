@@ -0,0 +1,276 @@
+"""Prompt templates (static prefix, per-call state) and per-call usage accounting."""
+from collections import deque
+from typing import Dict, Iterator, Optional
+import hashlib
+import json
+import threading
+import time
+import config
+from models import MATURITY_DIMENSIONS
+from .singleflight import SingleFlight
+
+
+class PromptTemplate:
+    """
+    A prompt split into a static prefix and a per-call state block.
+
+    The prefix (role, instructions, output schema) is identical for every
+    call, so it always comes first: the model service can reuse its cached
+    prefix computation, and only the short state block at the end differs.
+    """
+
+    def __init__(self, name: str, prefix: str, state: str):
+        """
+        Args:
+            name: Template name used in the usage statistics
+            prefix: Static instructions and schema (not formatted)
+            state: Per-call block, formatted with the render values
+        """
+        self.name = name
+        self.prefix = prefix.strip() + "\n\n"
+        self.state = state.strip()
+
+    def render(self, **values) -> str:
+        """Build the full prompt for one call."""
+        return self.prefix + self.state.format(**values)
+
+
+def parse_json_response(text: str):
+    """
+    Parse a model's JSON answer, ignoring a surrounding markdown code fence.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+
+def maturity_line(maturity: Dict[str, int]) -> str:
+    """Format maturity levels compactly, e.g. "agent_development 40, ..."."""
+    return ", ".join(f"{d} {maturity.get(d, 0)}" for d in MATURITY_DIMENSIONS)
+
+
+DECISIONS = PromptTemplate("decisions", """
+You are an AI advisor for an enterprise multi-agent platform development simulation.
+
+Generate 2-3 realistic decision scenarios that the player must choose from, for the game state given at the end. Each decision should:
+1. Be relevant to the current maturity levels (focus on weaker areas)
+2. Have trade-offs between cost, time, and maturity improvements
+3. Include both immediate and potential delayed impacts
+4. Reflect real enterprise challenges in building agentic platforms
+
+Return your response as a JSON array with this structure:
+[{"id": "unique_id", "title": "Decision Title", "description": "Detailed description of the situation",
+  "category": "development|operations|data|security|governance|strategic",
+  "options": [{"id": "option_id", "text": "Option description", "cost": 50000, "time_weeks": 4, "resources_required": 2,
+    "maturity_impact": {"agent_development": 10, "agent_operations": 5, "data_platforms": 0, "security": 0, "governance": 0},
+    "immediate_impact": true, "delayed_impact_weeks": 0, "consequences": "What happens if you choose this"}]}]
+
+Only return valid JSON, no additional text.
+""", """
+Game state: week {week}; budget ${budget:,}; {time_remaining_weeks} weeks remaining; {resources} team members.
+Maturity (0-100): {maturity}.
+""")
+
+READINESS = PromptTemplate("readiness", """
+Analyze the production readiness of a multi-agent platform from its maturity levels, thresholds and assessment given at the end.
+
+Provide analysis as JSON:
+{"potential_issues": ["list of 3-5 specific issues that may occur in production"],
+ "recommendations": ["list of 3-5 recommendations to improve readiness"]}
+
+Only return valid JSON.
+""", """
+Maturity (0-100): {maturity}.
+Thresholds: production ready {ready}+; minimum acceptable {minimum}-{ready_below}; not ready below {minimum}.
+Assessment: risk level {risk_level}; weak areas: {weak_areas}; critical gaps: {critical_gaps}.
+""")
+
+FINAL_REPORT = PromptTemplate("final_report", """
+Generate a comprehensive final report for an enterprise multi-agent platform development simulation, from the final game state given at the end.
+
+Provide a detailed report as JSON:
+{"overall_score": 0-100, "grade": "A+|A|B|C|D|F", "summary": "Brief summary of performance",
+ "strengths": ["list of 3-5 strengths"], "weaknesses": ["list of 3-5 weaknesses"],
+ "key_learnings": ["list of 5-7 key lessons learned"],
+ "prescriptive_guidance": {"short_term": ["3-5 immediate actions to take"], "medium_term": ["3-5 actions for next 6 months"], "long_term": ["3-5 strategic initiatives"]},
+ "best_practices": ["5-7 best practices for multi-agent platform development"],
+ "recommendations": ["5-7 specific recommendations based on the gameplay"]}
+
+Only return valid JSON.
+""", """
+Final game state: budget used ${spent:,} of ${initial_budget:,}; {weeks} weeks taken; {decisions} decisions made; production launch week {production_week}; {production_issues} production issues encountered.
+Final maturity (0-100): {maturity}.
+""")
+
+PDF_SCENARIOS = PromptTemplate("pdf_scenarios", """
+You are an AI that extracts game scenarios from documents about enterprise multi-agent platform development.
+
+From the document content given at the end, extract or generate 3-5 realistic decision scenarios for a simulation game where players build an enterprise multi-agent platform. Each scenario should:
+1. Be relevant to enterprise multi-agent platform development
+2. Have 2-3 options with different trade-offs (cost, time, maturity impact)
+3. Include clear consequences for each option
+4. Focus on one of these categories: development, operations, data, security, governance
+
+Return your response as a JSON array with this EXACT structure:
+[{"id": "unique_scenario_id", "title": "Decision Title", "description": "Detailed description of the scenario",
+  "category": "development|operations|data|security|governance", "week_available": 1,
+  "options": [
+    {"id": "option1_id", "text": "Option description explaining what this choice involves", "cost": 50000, "time_weeks": 4, "resources_required": 2,
+     "maturity_impact": {"agent_development": 10, "agent_operations": 5, "data_platforms": 0, "security": 0, "governance": 0},
+     "immediate_impact": true, "delayed_impact_weeks": 0, "consequences": "What happens if you choose this option"},
+    {"id": "option2_id", "text": "Alternative option description", "cost": 100000, "time_weeks": 6, "resources_required": 3,
+     "maturity_impact": {"agent_development": 20, "agent_operations": 10, "data_platforms": 5, "security": 5, "governance": 5},
+     "immediate_impact": false, "delayed_impact_weeks": 3, "consequences": "What happens if you choose this alternative"}]}]
+
+Rules:
+- cost: Between 5,000 and 200,000 (realistic enterprise costs)
+- time_weeks: Between 1 and 12 weeks
+- resources_required: Between 1 and 6 team members
+- maturity_impact: Values between -20 and +40 for each capability
+- week_available: Between 1 and 30
+- Make scenarios realistic and educational about multi-agent platforms
+
+Only return valid JSON, no additional text.
+""", """
+Document content:
+{document}
+""")
+
+
+class PromptUsage:
+    """
+    Per-call accounting of model calls: prompt size, token counts (from the
+    response's usage metadata, when the SDK reports it) and latency.
+
+    Keeps running totals per template and the most recent calls.
+    """
+
+    def __init__(self, recent: int = 100):
+        """
+        Args:
+            recent: Number of recent calls kept
+        """
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict] = {}
+        self._recent = deque(maxlen=recent)
+
+    def record(self, template: PromptTemplate, prompt: str, response=None, seconds: float = 0.0,
+               first_chunk_seconds: Optional[float] = None, failed: bool = False):
+        """Record one model call."""
+        usage = getattr(response, "usage_metadata", None)
+        call = {
+            "template": template.name,
+            "prompt_chars": len(prompt),
+            "prefix_chars": len(template.prefix),
+            "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+            "output_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+            "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+            "seconds": round(seconds, 4),
+            "first_chunk_seconds": None if first_chunk_seconds is None else round(first_chunk_seconds, 4),
+            "failed": failed,
+            "at": time.time()
+        }
+        with self._lock:
+            self._recent.append(call)
+            totals = self._totals.setdefault(template.name, dict.fromkeys((
+                "calls", "failures", "prompt_chars", "prefix_chars", "prompt_tokens",
+                "output_tokens", "cached_tokens", "seconds", "streamed", "first_chunk_seconds"
+            ), 0))
+            totals["calls"] += 1
+            totals["failures"] += failed
+            for key in ("prompt_chars", "prefix_chars", "prompt_tokens", "output_tokens", "cached_tokens", "seconds"):
+                totals[key] += call[key]
+            if first_chunk_seconds is not None:
+                totals["streamed"] += 1
+                totals["first_chunk_seconds"] += first_chunk_seconds
+
+    def snapshot(self, recent: int = 20) -> Dict:
+        """Get the per-template totals and averages and the most recent calls."""
+        with self._lock:
+            templates = {}
+            for name, totals in self._totals.items():
+                calls = totals["calls"]
+                templates[name] = dict(
+                    totals,
+                    seconds=round(totals["seconds"], 3),
+                    first_chunk_seconds=round(totals["first_chunk_seconds"], 3),
+                    mean_prompt_chars=round(totals["prompt_chars"] / calls),
+                    static_prefix_share=round(totals["prefix_chars"] / max(totals["prompt_chars"], 1), 3),
+                    mean_seconds=round(totals["seconds"] / calls, 3),
+                    mean_first_chunk_seconds=(
+                        round(totals["first_chunk_seconds"] / totals["streamed"], 3) if totals["streamed"] else None
+                    )
+                )
+            return {"templates": templates, "recent": list(self._recent)[-recent:]}
+
+
+# Shared by all agents and parsers of the process
+prompt_usage = PromptUsage()
+coalescer = SingleFlight(config.MODEL_RATE_LIMIT_PER_MINUTE, config.MODEL_RATE_LIMIT_BURST)
+
+
+def flight_key(model, template: PromptTemplate, prompt: str) -> str:
+    """Key identical calls: same model client, template and prompt up to whitespace."""
+    normalized = " ".join(prompt.split())
+    return hashlib.sha1(f"{id(model)}|{template.name}|{normalized}".encode()).hexdigest()
+
+
+def generate(model, template: PromptTemplate, prompt: str, **kwargs):
+    """
+    Call model.generate_content and record the call.
+
+    Identical concurrent calls share one request (see SingleFlight).
+
+    Raises:
+        RateLimitedError: If identical requests exceed the per-key rate
+    """
+    def call():
+        start = time.perf_counter()
+        try:
+            response = model.generate_content(prompt, **kwargs)
+        except Exception:
+            prompt_usage.record(template, prompt, seconds=time.perf_counter() - start, failed=True)
+            raise
+        prompt_usage.record(template, prompt, response, time.perf_counter() - start)
+        return response
+
+    return coalescer.do("call:" + flight_key(model, template, prompt), call)
+
+
+def generate_stream(model, template: PromptTemplate, prompt: str, **kwargs) -> Iterator:
+    """
+    Stream model.generate_content chunks and record the call, with the time
+    to the first chunk, once the stream ends or is abandoned.
+
+    Identical concurrent streams share one request (see SingleFlight).
+
+    Raises:
+        RateLimitedError: If identical requests exceed the per-key rate
+    """
+    def call() -> Iterator:
+        start = time.perf_counter()
+        first_chunk = None
+        last = None
+        failed = False
+        try:
+            for chunk in model.generate_content(prompt, stream=True, **kwargs):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                last = chunk
+                yield chunk
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # Token counts arrive with the last chunk
+            prompt_usage.record(template, prompt, last, time.perf_counter() - start, first_chunk, failed)
+
+    return coalescer.stream("stream:" + flight_key(model, template, prompt), call)
@@ -0,0 +1,151 @@
+"""Production readiness verdicts and a persistent memo for their AI-written prose."""
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+import config
+from memory_accounting import deep_sizeof
+from models import MATURITY_DIMENSIONS, GameConfig
+
+# Bump when the prose prompt changes so stale entries are not reused
+PROSE_VERSION = 3
+
+
+def readiness_verdict(maturity: Dict[str, int], game_config: Optional[GameConfig] = None) -> Dict:
+    """
+    Compute the threshold-derived part of a readiness analysis.
+
+    Args:
+        maturity: Maturity per capability
+        game_config: Thresholds to apply (defaults to config)
+
+    Returns:
+        Dictionary with ready_for_production, risk_level, weak_areas
+        (below the production-ready threshold) and critical_gaps (below the
+        minimum acceptable threshold)
+    """
+    game_config = game_config or GameConfig.defaults()
+    ready = game_config.production_ready_threshold
+    avg = sum(maturity.values()) / len(maturity)
+    weak_areas = [k for k, v in maturity.items() if v < ready]
+    critical_gaps = [k for k, v in maturity.items() if v < game_config.minimum_acceptable_threshold]
+
+    return {
+        "ready_for_production": avg >= ready and len(critical_gaps) == 0,
+        "risk_level": "low" if avg >= 70 else "medium" if avg >= 50 else "high",
+        "weak_areas": weak_areas,
+        "critical_gaps": critical_gaps
+    }
+
+
+def maturity_bucket(maturity: Dict[str, int], bucket_size: int) -> Tuple[int, ...]:
+    """Get the bucket index of every capability (100 shares the top bucket)."""
+    top = 99 // bucket_size
+    return tuple(min(maturity.get(d, 0) // bucket_size, top) for d in MATURITY_DIMENSIONS)
+
+
+def bucket_ranges(bucket: Tuple[int, ...], bucket_size: int) -> Dict[str, str]:
+    """Describe each capability's bucket as a range such as "40-49"."""
+    ranges = {}
+    top = 99 // bucket_size
+    for dimension, index in zip(MATURITY_DIMENSIONS, bucket):
+        low = index * bucket_size
+        high = 100 if index == top else low + bucket_size - 1
+        ranges[dimension] = f"{low}-{high}"
+    return ranges
+
+
+class ReadinessMemo:
+    """
+    Persistent memo of readiness prose (potential issues and recommendations).
+
+    Entries are kept in a SQLite file, shared by worker processes and
+    surviving restarts, with an in-process dictionary in front of it. With
+    ten-point buckets there are at most 10^5 maturity profiles, and the
+    common ones are filled after a handful of games.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        self._entries: Dict[str, Dict] = {}
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS readiness_prose ("
+                " key TEXT PRIMARY KEY,"
+                " prose TEXT NOT NULL,"
+                " created_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get the memoized prose for a key, if any."""
+        prose = self._entries.get(key)
+        if prose is None:
+            try:
+                row = self._connection().execute(
+                    "SELECT prose FROM readiness_prose WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error reading readiness memo: {e}")
+                return None
+            if row:
+                prose = self._entries[key] = json.loads(row[0])
+        return prose
+
+    def usage(self) -> Dict:
+        """Get the number and approximate bytes of the entries held in memory."""
+        return {"entries": len(self._entries), "bytes": deep_sizeof(self._entries)}
+
+    def put(self, key: str, prose: Dict):
+        """Memoize the prose for a key."""
+        self._entries[key] = prose
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO readiness_prose (key, prose, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(prose), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing readiness memo: {e}")
+
+
+def memo_key(bucket: Tuple[int, ...], bucket_size: int, game_config: Optional[GameConfig] = None,
+             verdict: Optional[Dict] = None) -> str:
+    """
+    Build the memo key of a maturity bucket (tied to the model, prompt version and thresholds).
+
+    The verdict's risk level, weak areas and critical gaps go into the
+    prose prompt and come from the exact maturity, which can differ within
+    a bucket, so they are part of the key too.
+    """
+    game_config = game_config or GameConfig.defaults()
+    thresholds = f"t{game_config.production_ready_threshold},{game_config.minimum_acceptable_threshold}"
+    key = f"{config.MODEL_NAME}|v{PROSE_VERSION}|b{bucket_size}|{thresholds}|" + ",".join(str(i) for i in bucket)
+    if verdict is not None:
+        weak = "".join(str(int(d in verdict["weak_areas"])) for d in MATURITY_DIMENSIONS)
+        critical = "".join(str(int(d in verdict["critical_gaps"])) for d in MATURITY_DIMENSIONS)
+        key += f"|{verdict['risk_level']}|w{weak}|c{critical}"
+    return key
+
+
+def as_text_list(value) -> List[str]:
+    """Coerce a model output field into a list of strings."""
+    if not isinstance(value, list):
+        return []
+    return [str(item) for item in value if str(item).strip()]
@@ -0,0 +1,158 @@
+"""Coalescing of identical in-flight model calls, with a per-key rate limit."""
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Tuple
+import threading
+import time
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when a key has used up its call rate."""
+
+
+class _Flight:
+    """One in-flight call: its result (or error) or the chunks streamed so far."""
+
+    __slots__ = ("done", "result", "error", "chunks", "condition")
+
+    def __init__(self):
+        self.done = False
+        self.result = None
+        self.error = None
+        self.chunks = []
+        self.condition = threading.Condition()
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the
+    same key wait for it and share its result (or its stream of chunks).
+
+    Each key may also start at most `rate_per_minute` calls per minute
+    (with bursts of `burst`); callers sharing an in-flight call do not
+    count. Beyond that, RateLimitedError is raised.
+    """
+
+    def __init__(self, rate_per_minute: float = 0, burst: int = 1, max_keys: int = 10000):
+        """
+        Args:
+            rate_per_minute: Calls per key per minute (0 for no limit)
+            burst: Calls a key may start back to back
+            max_keys: Rate-limited keys tracked (least recently used are forgotten)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(burst, 1)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.calls = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+
+    def _allow(self, key: str) -> bool:
+        """Take a token from the key's bucket (lock held)."""
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1.0
+        self._buckets[key] = (tokens - 1.0 if allowed else tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed
+
+    def _join(self, key: str) -> Tuple[_Flight, bool]:
+        """
+        Join the key's in-flight call or start one.
+
+        Returns:
+            The flight and whether the caller leads it
+
+        Raises:
+            RateLimitedError: If a new call is needed but the key is over its rate
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            if not self._allow(key):
+                self.rate_limited += 1
+                raise RateLimitedError("Too many identical model requests; try again shortly")
+            flight = self._flights[key] = _Flight()
+            self.calls += 1
+            return flight, True
+
+    def _finish(self, key: str, flight: _Flight):
+        """Mark the leader's call finished and wake the waiting callers."""
+        with self._lock:
+            self._flights.pop(key, None)
+        with flight.condition:
+            flight.done = True
+            flight.condition.notify_all()
+
+    def do(self, key: str, fn: Callable):
+        """Call fn, or wait for the identical call in flight and share its result."""
+        flight, leader = self._join(key)
+        if not leader:
+            with flight.condition:
+                while not flight.done:
+                    flight.condition.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._finish(key, flight)
+
+    def stream(self, key: str, fn: Callable[[], Iterator]) -> Iterator:
+        """
+        Iterate fn(), or replay the identical stream in flight as its chunks arrive.
+
+        If the leading caller stops early, the others get the chunks it
+        consumed.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                for chunk in fn():
+                    with flight.condition:
+                        flight.chunks.append(chunk)
+                        flight.condition.notify_all()
+                    yield chunk
+            except Exception as e:
+                flight.error = e
+                raise
+            finally:
+                self._finish(key, flight)
+            return
+
+        index = 0
+        while True:
+            with flight.condition:
+                while index >= len(flight.chunks) and not flight.done:
+                    flight.condition.wait()
+                if index < len(flight.chunks):
+                    chunk = flight.chunks[index]
+                    index += 1
+                elif flight.error is not None:
+                    raise flight.error
+                else:
+                    return
+            yield chunk
+
+    def usage(self) -> Dict:
+        """Get the number of calls made, coalesced and rate limited."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "rate_limited": self.rate_limited,
+                "in_flight": len(self._flights)
+            }
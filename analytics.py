@@ -0,0 +1,241 @@
+"""Cross-game analytics: finished games and running aggregates in SQLite."""
+from typing import Dict, List, Optional
+import math
+import os
+import sqlite3
+import threading
+import time
+import config
+from models import MATURITY_DIMENSIONS
+
+# Metrics with running count/sum/sum of squares/min/max
+METRICS = ("score", "average_maturity", "spent", "maturity_gain", "weeks", "reputation") + tuple(
+    f"maturity.{d}" for d in MATURITY_DIMENSIONS
+)
+
+# Metrics with a distribution of 10-point buckets (0-9, ..., 90-100)
+HISTOGRAMS = ("score",) + tuple(f"maturity.{d}" for d in MATURITY_DIMENSIONS)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS games ("
+    " id TEXT PRIMARY KEY,"
+    " player TEXT,"
+    " ended_at REAL NOT NULL,"
+    " score INTEGER NOT NULL,"
+    " grade TEXT NOT NULL,"
+    " average_maturity REAL NOT NULL,"
+    " spent INTEGER NOT NULL,"
+    " maturity_gain INTEGER NOT NULL,"
+    " weeks INTEGER NOT NULL,"
+    " decisions INTEGER NOT NULL,"
+    " is_production INTEGER NOT NULL,"
+    " reputation INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC, ended_at)",
+    "CREATE TABLE IF NOT EXISTS metrics ("
+    " name TEXT PRIMARY KEY,"
+    " count INTEGER NOT NULL,"
+    " total REAL NOT NULL,"
+    " total_sq REAL NOT NULL,"
+    " min REAL NOT NULL,"
+    " max REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS histogram ("
+    " metric TEXT NOT NULL,"
+    " bucket INTEGER NOT NULL,"
+    " count INTEGER NOT NULL,"
+    " PRIMARY KEY (metric, bucket))",
+    "CREATE TABLE IF NOT EXISTS counters ("
+    " name TEXT PRIMARY KEY,"
+    " count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS option_picks ("
+    " option_id TEXT PRIMARY KEY,"
+    " games INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS option_picks_by_games ON option_picks (games DESC)",
+)
+
+
+def game_summary(game_state: Dict, score: Dict, initial_budget: Optional[int] = None) -> Dict:
+    """
+    Summarize a finished game for the analytics store.
+
+    Args:
+        game_state: Final game state (GameState.to_dict)
+        score: Local score (report_service.score_game)
+        initial_budget: Budget the game started with (defaults to config)
+    """
+    initial_budget = config.INITIAL_BUDGET if initial_budget is None else initial_budget
+    maturity = game_state["maturity"]
+    return {
+        "score": score["overall_score"],
+        "grade": score["grade"],
+        "average_maturity": sum(maturity.values()) / len(maturity),
+        "maturity": dict(maturity),
+        # Games start at zero maturity and the initial budget
+        "spent": initial_budget - game_state["budget"],
+        "maturity_gain": sum(maturity.values()),
+        "weeks": game_state["current_week"],
+        "decisions": len(game_state["decisions_made"]),
+        "options": sorted({d["option_id"] for d in game_state["decisions_made"]}),
+        "is_production": bool(game_state["is_production"]),
+        "reputation": game_state["reputation"],
+    }
+
+
+def histogram_bucket(value: float) -> int:
+    """Get the 10-point bucket of a 0-100 value (100 falls in the top bucket)."""
+    return max(0, min(int(value) // 10, 9))
+
+
+class AnalyticsStore:
+    """
+    Finished games and their aggregates.
+
+    Each game is stored once (by id) and folded into running aggregates in
+    the same transaction, so recording a game costs O(1) in the number of
+    games recorded and reading the stats never scans the games.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record(self, game_id: str, summary: Dict, player: Optional[str] = None) -> bool:
+        """
+        Store a finished game and fold it into the aggregates.
+
+        Args:
+            game_id: Unique id of the finished game; a game already
+                recorded is ignored
+            summary: Game summary (see game_summary)
+            player: Optional player name for the leaderboard
+
+        Returns:
+            True if the game was recorded, False if it already was
+        """
+        values = {f"maturity.{d}": v for d, v in summary["maturity"].items()}
+        values.update({name: summary[name] for name in METRICS if name in summary})
+        with self._connection() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO games (id, player, ended_at, score, grade, average_maturity, spent,"
+                " maturity_gain, weeks, decisions, is_production, reputation)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (game_id, player, time.time(), summary["score"], summary["grade"], summary["average_maturity"],
+                 summary["spent"], summary["maturity_gain"], summary["weeks"], summary["decisions"],
+                 int(summary["is_production"]), summary["reputation"])
+            ).rowcount
+            if not inserted:
+                return False
+
+            conn.executemany(
+                "INSERT INTO metrics (name, count, total, total_sq, min, max) VALUES (?, 1, ?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET count = count + 1, total = total + excluded.total,"
+                " total_sq = total_sq + excluded.total_sq, min = MIN(min, excluded.min), max = MAX(max, excluded.max)",
+                [(name, values[name], values[name] ** 2, values[name], values[name]) for name in METRICS]
+            )
+            conn.executemany(
+                "INSERT INTO histogram (metric, bucket, count) VALUES (?, ?, 1)"
+                " ON CONFLICT (metric, bucket) DO UPDATE SET count = count + 1",
+                [(name, histogram_bucket(values[name])) for name in HISTOGRAMS]
+            )
+            conn.executemany(
+                "INSERT INTO counters (name, count) VALUES (?, 1)"
+                " ON CONFLICT (name) DO UPDATE SET count = count + 1",
+                [("games",), (f"grade.{summary['grade']}",)]
+                + ([("production_games",)] if summary["is_production"] else [])
+            )
+            conn.executemany(
+                "INSERT INTO option_picks (option_id, games) VALUES (?, 1)"
+                " ON CONFLICT (option_id) DO UPDATE SET games = games + 1",
+                [(option_id,) for option_id in summary["options"]]
+            )
+        return True
+
+    def leaderboard(self, limit: int = 10) -> List[Dict]:
+        """Get the best games, highest score first (earliest first on ties)."""
+        rows = self._connection().execute(
+            "SELECT id, player, ended_at, score, grade, average_maturity, weeks, is_production, reputation"
+            " FROM games ORDER BY score DESC, ended_at LIMIT ?", (limit,)
+        ).fetchall()
+        return [
+            {
+                "game_id": row[0],
+                "player": row[1],
+                "ended_at": row[2],
+                "score": row[3],
+                "grade": row[4],
+                "average_maturity": round(row[5], 2),
+                "weeks": row[6],
+                "is_production": bool(row[7]),
+                "reputation": row[8]
+            }
+            for row in rows
+        ]
+
+    def stats(self, top_options: int = 10) -> Dict:
+        """
+        Get the aggregates over all recorded games.
+
+        Returns:
+            Dictionary with the number of `games`, per-metric `metrics`
+            (count, mean, stddev, min, max), `distributions` (counts per
+            10-point bucket), `grades`, the `production_rate`, the
+            `cost_per_maturity_point` and the most picked options with
+            their pick rate (share of games)
+        """
+        conn = self._connection()
+        counters = dict(conn.execute("SELECT name, count FROM counters").fetchall())
+        games = counters.get("games", 0)
+
+        metrics = {}
+        totals = {}
+        for name, count, total, total_sq, low, high in conn.execute(
+            "SELECT name, count, total, total_sq, min, max FROM metrics"
+        ):
+            mean = total / count
+            totals[name] = total
+            metrics[name] = {
+                "count": count,
+                "mean": round(mean, 2),
+                "stddev": round(math.sqrt(max(total_sq / count - mean ** 2, 0)), 2),
+                "min": low,
+                "max": high
+            }
+
+        distributions: Dict[str, List[int]] = {name: [0] * 10 for name in HISTOGRAMS}
+        for name, bucket, count in conn.execute("SELECT metric, bucket, count FROM histogram"):
+            if name in distributions:
+                distributions[name][bucket] = count
+
+        picks = conn.execute(
+            "SELECT option_id, games FROM option_picks ORDER BY games DESC LIMIT ?", (top_options,)
+        ).fetchall()
+
+        gain = totals.get("maturity_gain", 0)
+        return {
+            "games": games,
+            "metrics": metrics,
+            "distributions": distributions,
+            "grades": {name[len("grade."):]: count for name, count in counters.items() if name.startswith("grade.")},
+            "production_rate": round(counters.get("production_games", 0) / games, 4) if games else 0,
+            "cost_per_maturity_point": round(totals["spent"] / gain, 2) if gain else None,
+            "top_options": [
+                {"option_id": option_id, "games": count, "pick_rate": round(count / games, 4)}
+                for option_id, count in picks
+            ]
+        }
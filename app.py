@@ -1,34 +1,226 @@
 """Flask application for the Agentic Platform Simulation Game."""
-from flask import Flask, render_template, jsonify, request
+from flask import Blueprint, Flask, Response, current_app, render_template, jsonify, request, stream_with_context
 from flask_cors import CORS
-from game_engine import GameEngine
-from scenario_manager import ScenarioManager
-from pdf_scenario_parser import PDFScenarioParser
+from typing import Optional, Tuple
+from compression import compress, encoded_etag, init_compression, negotiate_encoding
+import config
+import hashlib
+import json
+import os
+import threading
 import traceback
 
-app = Flask(__name__)
-CORS(app)
+api = Blueprint('api', __name__)
 
-# Initialize game engine, scenario manager, and PDF parser
-game_engine = GameEngine()
-scenario_manager = ScenarioManager()
-pdf_parser = PDFScenarioParser()
 
+class AppServices:
+    """Session store, scenario manager and PDF parser, created on first use.
 
-@app.route('/')
+    Building these eagerly pulled in Vertex AI and PyPDF2 at import time,
+    which made every worker spawn pay for them before serving a request.
+    """
+    
+    def __init__(self, session_store: str = "memory"):
+        """
+        Initialize the (empty) service holder.
+        
+        Args:
+            session_store: "memory" (single process) or "sqlite" (shared by workers)
+        """
+        self.session_store_kind = session_store
+        self._lock = threading.Lock()
+        self._sessions = None
+        self._reports = None
+        self._analytics = None
+        self._decision_agent = None
+        self._scenario_manager = None
+        self._catalog = None
+        self._pdf_parser = None
+    
+    @property
+    def sessions(self):
+        """Get the game session store, creating it on first access."""
+        if self._sessions is None:
+            with self._lock:
+                if self._sessions is None:
+                    from session_store import create_session_store
+                    self._sessions = create_session_store(
+                        self.session_store_kind,
+                        self._new_engine,
+                        config.SESSION_DB_FILE,
+                        config.SESSION_LOCK_LEASE_SECONDS,
+                        config.SESSION_LOCK_WAIT_SECONDS,
+                        config.SESSION_MEMORY_LIMIT_BYTES,
+                        config.SESSION_MAX_BYTES,
+                        config.SESSION_OVERFLOW,
+                        config.SESSION_SPILL_DIR
+                    )
+        return self._sessions
+    
+    @property
+    def reports(self):
+        """Get the background report service, creating it on first access."""
+        if self._reports is None:
+            sessions = self.sessions
+            with self._lock:
+                if self._reports is None:
+                    from report_service import ReportService
+                    self._reports = ReportService(sessions, config.REPORT_WORKERS)
+        return self._reports
+    
+    @property
+    def analytics(self):
+        """Get the cross-game analytics store, creating it on first access."""
+        if self._analytics is None:
+            with self._lock:
+                if self._analytics is None:
+                    from analytics import AnalyticsStore
+                    self._analytics = AnalyticsStore(config.ANALYTICS_DB_FILE)
+        return self._analytics
+    
+    @property
+    def decision_agent(self):
+        """Get the decision agent shared by all game engines, creating it on first access."""
+        if self._decision_agent is None:
+            with self._lock:
+                if self._decision_agent is None:
+                    from agents import shared_agent
+                    self._decision_agent = shared_agent()
+        return self._decision_agent
+    
+    def scenario_catalog(self, encoding: Optional[str] = None) -> Tuple[bytes, str]:
+        """
+        Get the /api/scenarios response body and its ETag, optionally compressed.
+        
+        The body, its hash and each compressed variant are computed once per
+        catalog version and reused until the scenarios change.
+        """
+        manager = self.scenario_manager
+        manager.refresh()
+        cached = self._catalog
+        if cached is None or cached[0] != manager.version:
+            version = manager.version
+            body = current_app.json.dumps({
+                'success': True,
+                'scenarios': manager.get_all_scenarios()
+            }).encode('utf-8')
+            cached = self._catalog = (version, body, hashlib.sha1(body).hexdigest(), {})
+        version, body, etag, encoded = cached
+        if encoding is None:
+            return body, etag
+        if encoding not in encoded:
+            encoded[encoding] = compress(body, encoding, best=True)
+        return encoded[encoding], encoded_etag(etag, encoding)
+    
+    def _new_engine(self):
+        """Create an empty game engine sharing this process's decision agent."""
+        from game_engine import GameEngine
+        return GameEngine(self.decision_agent)
+    
+    @property
+    def scenario_manager(self):
+        """Get the scenario manager, creating it on first access."""
+        if self._scenario_manager is None:
+            with self._lock:
+                if self._scenario_manager is None:
+                    from scenario_manager import ScenarioManager
+                    self._scenario_manager = ScenarioManager()
+        return self._scenario_manager
+    
+    @property
+    def pdf_parser(self):
+        """Get the PDF parser, creating it on first access."""
+        if self._pdf_parser is None:
+            with self._lock:
+                if self._pdf_parser is None:
+                    from pdf_scenario_parser import PDFScenarioParser
+                    self._pdf_parser = PDFScenarioParser()
+        return self._pdf_parser
+
+
+def create_app() -> Flask:
+    """Create and configure the Flask application."""
+    app = Flask(__name__)
+    CORS(app)
+    # Worker processes cannot share in-memory sessions
+    session_store = "sqlite" if config.WORKERS > 1 else config.SESSION_STORE
+    app.extensions['simulator'] = AppServices(session_store)
+    init_compression(app, config.COMPRESSION_MIN_BYTES)
+    if config.TRACEMALLOC:
+        from memory_accounting import TracemallocDiff
+        app.extensions['tracemalloc'] = TracemallocDiff()
+    app.register_blueprint(api)
+    return app
+
+
+def get_services() -> AppServices:
+    """Get the services of the current application."""
+    return current_app.extensions['simulator']
+
+
+def get_session_id() -> str:
+    """Get the game session of the request from the X-Session-ID header or session_id cookie."""
+    return (
+        request.headers.get('X-Session-ID')
+        or request.cookies.get('session_id')
+        or config.DEFAULT_SESSION_ID
+    )
+
+
+def game_session():
+    """Check out the request's game engine for exclusive use; changes are saved on exit."""
+    return get_services().sessions.session(get_session_id())
+
+
+def peek_game():
+    """Get the request's game engine for reading only."""
+    return get_services().sessions.peek(get_session_id())
+
+
+def set_validators(response: Response, etag: str):
+    """Mark a response as revalidated on every use with its (strong) ETag."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.update(('X-Session-ID', 'Cookie'))
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """
+    Get a 304 response if the request's If-None-Match matches the ETag, or
+    the ETag of its compressed representation for the negotiated encoding.
+    """
+    encoding = negotiate_encoding()
+    for tag in (encoded_etag(etag, encoding), etag):
+        if request.if_none_match.contains(tag):
+            response = Response(status=304)
+            set_validators(response, tag)
+            response.vary.add('Accept-Encoding')
+            return response
+    return None
+
+
+def is_admin_request() -> bool:
+    """Check the X-Admin-Token header; without a configured token only local requests are admitted."""
+    if config.ADMIN_TOKEN:
+        return request.headers.get('X-Admin-Token') == config.ADMIN_TOKEN
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+@api.route('/')
 def index():
     """Render the main game interface."""
     return render_template('index.html')
 
 
-@app.route('/api/game/new', methods=['POST'])
+@api.route('/api/game/new', methods=['POST'])
 def new_game():
     """Start a new game."""
     try:
-        game_state = game_engine.start_new_game()
+        with game_session() as engine:
+            game_state = engine.start_new_game().to_dict()
         return jsonify({
             'success': True,
-            'game_state': game_state.to_dict()
+            'game_state': game_state
         })
     except Exception as e:
         print(f"Error starting new game: {e}")
@@ -39,16 +231,30 @@ def new_game():
         }), 500
 
 
-@app.route('/api/game/state', methods=['GET'])
+@api.route('/api/game/state', methods=['GET'])
 def get_game_state():
-    """Get the current game state."""
+    """
+    Get the current game state.
+    
+    The ETag is the session's state version; a matching If-None-Match gets
+    304 Not Modified without loading or serializing the state.
+    """
     try:
-        state = game_engine.get_current_state()
+        etag = get_services().sessions.state_tag(get_session_id())
+        if etag is not None:
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+        
+        state = peek_game().get_current_state()
         if state:
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'game_state': state
             })
+            if etag is not None:
+                set_validators(response, etag)
+            return response
         return jsonify({
             'success': False,
             'error': 'No active game'
@@ -60,25 +266,27 @@ def get_game_state():
         }), 500
 
 
-@app.route('/api/decisions/available', methods=['GET'])
+@api.route('/api/decisions/available', methods=['GET'])
 def get_available_decisions():
-    """Get available decisions using AI."""
+    """
+    Get available decisions.
+    
+    Predefined scenarios that best address the current maturity gaps come
+    first; the AI is only asked for decisions when they cannot fill all
+    slots.
+    """
     try:
-        # Get decisions from both AI and predefined scenarios
-        ai_decisions = game_engine.get_available_decisions()
+        services = get_services()
         
-        # Also get predefined scenarios
-        state = game_engine.get_current_state()
-        if state:
-            week = state['current_week']
-            predefined = scenario_manager.get_scenarios_for_week(week)
-            
-            # Combine and limit to 3 decisions
-            all_decisions = ai_decisions + predefined
-            # Remove duplicates and limit
-            decisions = all_decisions[:3]
-        else:
-            decisions = ai_decisions
+        engine = peek_game()
+        state = engine.get_current_state()
+        decisions = services.scenario_manager.rank_scenarios(
+            state, limit=3, ready_threshold=engine.game_config.production_ready_threshold
+        ) if state else []
+        
+        if len(decisions) < 3:
+            ai_decisions = engine.get_available_decisions()
+            decisions = decisions + ai_decisions[:3 - len(decisions)]
         
         return jsonify({
             'success': True,
@@ -93,12 +301,55 @@ def get_available_decisions():
         }), 500
 
 
-@app.route('/api/decision/make', methods=['POST'])
+@api.route('/api/decisions/stream', methods=['GET'])
+def stream_available_decisions():
+    """
+    Stream available decisions as newline-delimited JSON.
+    
+    Each line is {"decision": {...}}. The best-ranked predefined scenarios
+    are sent immediately; AI decisions fill up the remaining slots, each
+    sent as soon as the AI finishes it. The stream ends with {"done": true}
+    (or {"error": "..."}).
+    """
+    services = get_services()
+    engine = peek_game()
+    state = engine.get_current_state()
+    
+    def generate():
+        try:
+            ranked = services.scenario_manager.rank_scenarios(
+                state, limit=3, ready_threshold=engine.game_config.production_ready_threshold
+            ) if state else []
+            for decision in ranked:
+                yield json.dumps({'decision': decision}) + '\n'
+            
+            sent = len(ranked)
+            if sent < 3:
+                for decision in engine.stream_available_decisions():
+                    yield json.dumps({'decision': decision}) + '\n'
+                    sent += 1
+                    if sent >= 3:
+                        break
+            yield json.dumps({'done': True}) + '\n'
+        except Exception as e:
+            print(f"Error streaming decisions: {e}")
+            traceback.print_exc()
+            yield json.dumps({'error': str(e)}) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@api.route('/api/decision/make', methods=['POST'])
 def make_decision():
     """Process a decision."""
     try:
         data = request.json
         option = data.get('option')
+        scenario_id = data.get('scenario_id')
         
         if not option:
             return jsonify({
@@ -106,8 +357,15 @@ def make_decision():
                 'error': 'Option data required'
             }), 400
         
-        result = game_engine.process_decision_impact(option)
+        with game_session() as engine:
+            result = engine.process_decision_impact(option, scenario_id)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': str(e)
+        }), 400
     except Exception as e:
         print(f"Error making decision: {e}")
         traceback.print_exc()
@@ -117,11 +375,167 @@ def make_decision():
         }), 500
 
 
-@app.route('/api/production/launch', methods=['POST'])
+@api.route('/api/game/advance', methods=['POST'])
+def advance_game():
+    """
+    Fast-forward the game by `?weeks=N` weeks without decisions.
+    
+    Returns the aggregated change over the period (budget, time, maturity,
+    events) instead of the full game state.
+    """
+    try:
+        weeks = request.args.get('weeks', 1, type=int)
+        if weeks < 1 or weeks > config.MAX_ADVANCE_WEEKS:
+            return jsonify({
+                'success': False,
+                'error': f'Weeks must be between 1 and {config.MAX_ADVANCE_WEEKS}'
+            }), 400
+        
+        with game_session() as engine:
+            delta = engine.advance_weeks(weeks)
+            state = engine.game_state
+            summary = {
+                'current_week': state.current_week,
+                'time_remaining_weeks': state.time_remaining_weeks,
+                'budget': state.budget
+            }
+        return jsonify({
+            'success': True,
+            'delta': delta,
+            'state': summary
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except Exception as e:
+        print(f"Error advancing game: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/game/undo', methods=['POST'])
+def undo_action():
+    """Undo the last action (a decision, time passing, the launch or the end of the game)."""
+    return _replay_step('undo')
+
+
+@api.route('/api/game/redo', methods=['POST'])
+def redo_action():
+    """Redo the last undone action."""
+    return _replay_step('redo')
+
+
+def _replay_step(direction: str):
+    """Undo or redo one logged step of the request's game."""
+    try:
+        with game_session() as engine:
+            step = engine.undo() if direction == 'undo' else engine.redo()
+            game_state = engine.get_current_state()
+            can_undo, can_redo = engine.log.can_undo, engine.log.can_redo
+        if step is None:
+            return jsonify({
+                'success': False,
+                'error': f'Nothing to {direction}'
+            }), 400
+        return jsonify({
+            'success': True,
+            'step': {'action': step.action, 'week': step.week, 'changes': len(step.events)},
+            'game_state': game_state,
+            'can_undo': can_undo,
+            'can_redo': can_redo
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except Exception as e:
+        print(f"Error during {direction}: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/game/history', methods=['GET'])
+def get_game_history():
+    """Get the audit trail of the game: the last `?limit=N` steps with their state changes."""
+    try:
+        limit = min(max(request.args.get('limit', 50, type=int), 1), config.HISTORY_MAX_STEPS)
+        history = peek_game().history(limit)
+        return jsonify(dict(history, success=True))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/game/whatif', methods=['POST'])
+def what_if():
+    """
+    Compare alternative decisions from the current game without changing it.
+    
+    Body: {"branches": [{"label": "...", "options": [option, ...]}, ...],
+    "baseline": 0, "forecast_runs": 0}. Each branch plays its options on a
+    copy-on-write fork of the game; the response holds every branch's
+    outcome, its change from the current state and its diff against the
+    baseline branch.
+    """
+    try:
+        data = request.json
+        branches = data.get('branches') if isinstance(data, dict) else None
+        if not isinstance(branches, list) or not branches or not all(
+                isinstance(branch, dict) and isinstance(branch.get('options', []), list) for branch in branches):
+            return jsonify({
+                'success': False,
+                'error': 'A non-empty list of branches, each with a list of options, is required'
+            }), 400
+        if len(branches) > config.WHATIF_MAX_BRANCHES or any(
+                len(branch.get('options', [])) > config.WHATIF_MAX_OPTIONS for branch in branches):
+            return jsonify({
+                'success': False,
+                'error': f'At most {config.WHATIF_MAX_BRANCHES} branches of '
+                         f'{config.WHATIF_MAX_OPTIONS} options are allowed'
+            }), 400
+        
+        from whatif import run_what_if
+        forecast_runs = min(max(int(data.get('forecast_runs', 0)), 0), 20000)
+        # Read-only: branch from a fork of the stored game, never check the session out
+        result = run_what_if(peek_game().fork(), branches, forecast_runs, data.get('baseline', 0))
+        return jsonify(dict(result, success=True))
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'details': getattr(e, 'errors', None)
+        }), 400
+    except Exception as e:
+        print(f"Error running what-if branches: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/production/launch', methods=['POST'])
 def launch_production():
     """Launch to production."""
     try:
-        result = game_engine.launch_to_production()
+        with game_session() as engine:
+            result = engine.launch_to_production()
         return jsonify(result)
     except Exception as e:
         print(f"Error launching production: {e}")
@@ -132,11 +546,63 @@ def launch_production():
         }), 500
 
 
-@app.route('/api/game/end', methods=['POST'])
+@api.route('/api/production/forecast', methods=['GET'])
+def forecast_production():
+    """Forecast production cost and reputation loss before launching."""
+    try:
+        runs = min(request.args.get('runs', 1000, type=int), 20000)
+        forecast = peek_game().forecast_production(max(runs, 1))
+        return jsonify({
+            'success': True,
+            'forecast': forecast
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except Exception as e:
+        print(f"Error forecasting production: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/game/end', methods=['POST'])
 def end_game():
-    """End the game and get final report."""
+    """
+    End the game.
+    
+    Returns the final state and a locally computed score immediately. The
+    full AI report is generated in the background; fetch it with the
+    returned `report_id` from /api/reports/<report_id>. The game is added
+    to the cross-game analytics, under the optional `player` name, once
+    per game: ending it again (after undo) does not add another entry.
+    """
     try:
-        result = game_engine.end_game()
+        services = get_services()
+        with game_session() as engine:
+            result = engine.end_game()
+            handle = services.reports.request(get_session_id(), engine, result['game_state'])
+            game_id = f"{get_session_id()}/{engine.game_id}"
+            initial_budget = engine.game_config.initial_budget
+        result['report_id'] = handle['id']
+        result['report_status'] = handle['status']
+        if handle['status'] == 'ready':
+            result['report'] = handle['report']
+        
+        player = (request.get_json(silent=True) or {}).get('player')
+        try:
+            from analytics import game_summary
+            services.analytics.record(
+                game_id,
+                game_summary(result['game_state'], result['score'], initial_budget),
+                str(player)[:config.PLAYER_NAME_MAX_LENGTH] if player else None
+            )
+        except Exception as e:
+            print(f"Error recording game analytics: {e}")
         return jsonify({
             'success': True,
             'result': result
@@ -150,14 +616,48 @@ def end_game():
         }), 500
 
 
-@app.route('/api/scenarios', methods=['GET'])
-def get_scenarios():
-    """Get all scenarios."""
+@api.route('/api/reports/<report_id>', methods=['GET'])
+def get_report(report_id):
+    """
+    Get a final report.
+    
+    `status` is "pending", "ready" (with the `report`) or "failed". With
+    `?wait=N` the request waits up to N seconds for a pending report.
+    """
+    try:
+        wait = min(max(request.args.get('wait', 0, type=float), 0), config.REPORT_MAX_WAIT_SECONDS)
+        handle = get_services().reports.get(get_session_id(), report_id, wait)
+        response = {
+            'success': True,
+            'report_id': report_id,
+            'status': handle['status'],
+            'report': handle.get('report')
+        }
+        if handle['status'] == 'failed':
+            response['error'] = handle.get('error')
+        return jsonify(response)
+    except KeyError:
+        return jsonify({
+            'success': False,
+            'error': 'Report not found'
+        }), 404
+    except Exception as e:
+        print(f"Error getting report: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/analytics/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Get the best finished games (`?limit=N`)."""
     try:
-        scenarios = scenario_manager.get_all_scenarios()
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
         return jsonify({
             'success': True,
-            'scenarios': scenarios
+            'leaderboard': get_services().analytics.leaderboard(limit)
         })
     except Exception as e:
         return jsonify({
@@ -166,31 +666,201 @@ def get_scenarios():
         }), 500
 
 
-@app.route('/api/scenarios/add', methods=['POST'])
+@api.route('/api/analytics/stats', methods=['GET'])
+def get_analytics_stats():
+    """Get aggregates over all finished games (`?top_options=N` most picked options)."""
+    try:
+        top_options = min(max(request.args.get('top_options', 10, type=int), 1), 100)
+        return jsonify({
+            'success': True,
+            'stats': get_services().analytics.stats(top_options)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/scenarios', methods=['GET'])
+def get_scenarios():
+    """
+    Get all scenarios, or one page of them.
+    
+    Without query parameters, the whole catalog is returned; its body is
+    serialized (and compressed) once per catalog version and its hash is
+    the ETag. With any of `limit`, `cursor`, `category`, `week_min`,
+    `week_max` or `fields` (comma-separated), one page ordered by week
+    available is returned with the `next_cursor`. A matching If-None-Match
+    gets 304 Not Modified.
+    """
+    if any(name in request.args for name in PAGE_PARAMS):
+        return get_scenarios_page()
+    try:
+        services = get_services()
+        body, etag = services.scenario_catalog()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        # Compressed once per catalog version, not per request
+        encoding = negotiate_encoding() if len(body) >= config.COMPRESSION_MIN_BYTES else None
+        if encoding is not None:
+            body, etag = services.scenario_catalog(encoding)
+        response = Response(body, mimetype='application/json')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        set_validators(response, etag)
+        return response
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+PAGE_PARAMS = ('limit', 'cursor', 'category', 'week_min', 'week_max', 'fields')
+
+
+def get_scenarios_page():
+    """Get one page of scenarios (see `get_scenarios`)."""
+    try:
+        fields = request.args.get('fields')
+        page = get_services().scenario_manager.query_scenarios(
+            category=request.args.get('category'),
+            week_min=request.args.get('week_min', type=int),
+            week_max=request.args.get('week_max', type=int),
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int),
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None
+        )
+        body = current_app.json.dumps(dict(page, success=True)).encode('utf-8')
+        etag = hashlib.sha1(body).hexdigest()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        response = Response(body, mimetype='application/json')
+        set_validators(response, etag)
+        return response
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/scenarios/add', methods=['POST'])
 def add_scenario():
     """Add a new scenario."""
     try:
         scenario = request.json
-        success = scenario_manager.add_scenario(scenario)
+        result = get_services().scenario_manager.ingest_scenario(scenario)
         
-        if success:
+        if result['status'] == 'duplicate':
+            return jsonify({
+                'success': False,
+                'error': f"Scenario is a near-duplicate of '{result['duplicate_of']}'",
+                'duplicate_of': result['duplicate_of'],
+                'similarity': result['similarity']
+            }), 409
+        if result['saved']:
             return jsonify({
                 'success': True,
-                'message': 'Scenario added successfully'
+                'message': 'Scenario merged into an existing scenario' if result['status'] == 'merged'
+                           else 'Scenario added successfully',
+                'status': result['status']
             })
         else:
             return jsonify({
                 'success': False,
                 'error': 'Failed to add scenario'
             }), 500
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid scenario: {e}',
+            'details': getattr(e, 'errors', None)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def iter_request_lines(stream, max_line_bytes: int, chunk_size: int = 64 * 1024):
+    """
+    Yield the lines of a request body one at a time.
+    
+    The body is read in fixed-size chunks (line-by-line reads on the WSGI
+    input stream are very slow), so memory stays bounded by the chunk size
+    plus one line. Lines longer than max_line_bytes are replaced by a short
+    marker, which then fails to parse and is reported as an error.
+    """
+    buffer = b''
+    skipping = False
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end < 0:
+                break
+            if skipping:
+                skipping = False
+            elif end - start >= max_line_bytes:
+                yield b'<line exceeds %d bytes>' % max_line_bytes
+            else:
+                yield buffer[start:end + 1]
+            start = end + 1
+        buffer = buffer[start:]
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield b'<line exceeds %d bytes>' % max_line_bytes
+            skipping = True
+            buffer = b''
+    if buffer and not skipping:
+        yield buffer
+
+
+@api.route('/api/scenarios/bulk', methods=['POST'])
+def bulk_import_scenarios():
+    """
+    Import many scenarios from an NDJSON body (one scenario per line).
+    
+    The body is streamed line by line; every record is validated and checked
+    for near-duplicates, and all accepted scenarios are saved in one write.
+    Errors and duplicates are reported per line.
+    """
+    try:
+        result = get_services().scenario_manager.import_ndjson(
+            iter_request_lines(request.stream, config.BULK_IMPORT_MAX_LINE_BYTES),
+            batch_size=config.BULK_IMPORT_BATCH_SIZE
+        )
+        status = 200 if result['saved'] else 500
+        return jsonify({
+            'success': result['saved'],
+            'message': f"Imported {result['added']} scenarios from {result['lines']} lines",
+            **result
+        }), status
     except Exception as e:
+        print(f"Error importing scenarios: {e}")
+        traceback.print_exc()
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-@app.route('/api/scenarios/add-from-pdf', methods=['POST'])
+@api.route('/api/scenarios/add-from-pdf', methods=['POST'])
 def add_scenarios_from_pdf():
     """
     Add scenarios from a PDF document.
@@ -220,20 +890,27 @@ def add_scenarios_from_pdf():
                 'error': 'File must be a PDF'
             }), 400
         
+        services = get_services()
+        
         # Parse PDF and generate scenarios
-        scenarios = pdf_parser.parse_pdf_to_scenarios(pdf_file)
+        scenarios = services.pdf_parser.parse_pdf_to_scenarios(pdf_file)
         
-        # Add all scenarios to the scenario manager
-        added_count = 0
-        for scenario in scenarios:
-            if scenario_manager.add_scenario(scenario):
-                added_count += 1
+        # Validate and add all scenarios to the scenario manager in one batch
+        result = services.scenario_manager.add_scenarios(scenarios)
+        added_count = result['added']
+        if not result['saved']:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to save scenarios'
+            }), 500
         
         return jsonify({
             'success': True,
             'message': f'Successfully added {added_count} scenarios from PDF',
             'scenarios_added': added_count,
-            'scenarios': scenarios
+            'scenarios': result['scenarios'],
+            'duplicates': result['duplicates'],
+            'rejected': result['errors']
         })
         
     except ValueError as e:
@@ -250,5 +927,145 @@ def add_scenarios_from_pdf():
         }), 500
 
 
+@api.route('/api/scenarios/add-from-pdfs', methods=['POST'])
+def add_scenarios_from_pdfs():
+    """
+    Add scenarios from several PDF documents (multipart files under "pdf_files").
+
+    Text is extracted from all files in parallel in worker processes, and
+    scenarios are generated from each file as soon as its text is ready.
+    Streams one NDJSON line per file as it finishes ({"file", "scenarios_added",
+    "duplicates", "rejected"} or {"file", "error"}), then {"done": true,
+    "files": N, "scenarios_added": M}.
+    """
+    files = [f for f in request.files.getlist('pdf_files') if f.filename]
+    if not files:
+        return jsonify({
+            'success': False,
+            'error': 'No PDF files provided. Please upload files with key "pdf_files"'
+        }), 400
+    if len(files) > config.PDF_BATCH_MAX_FILES:
+        return jsonify({
+            'success': False,
+            'error': f'At most {config.PDF_BATCH_MAX_FILES} files are allowed per upload'
+        }), 400
+    not_pdf = [f.filename for f in files if not f.filename.lower().endswith('.pdf')]
+    if not_pdf:
+        return jsonify({
+            'success': False,
+            'error': f'Files must be PDFs: {", ".join(not_pdf)}'
+        }), 400
+
+    services = get_services()
+    uploads = [(f.filename, f.read()) for f in files]
+
+    def generate():
+        added = 0
+        try:
+            for result in services.pdf_parser.parse_pdfs_to_scenarios(uploads):
+                if 'scenarios' in result:
+                    try:
+                        outcome = services.scenario_manager.add_scenarios(result['scenarios'])
+                    except Exception as e:
+                        # One bad model answer must not cost the other files their results
+                        print(f"Error adding scenarios from '{result['file']}': {e}")
+                        result = {'file': result['file'], 'error': str(e)}
+                    else:
+                        if outcome['saved']:
+                            added += outcome['added']
+                            result = {
+                                'file': result['file'],
+                                'scenarios_added': outcome['added'],
+                                'duplicates': outcome['duplicates'],
+                                'rejected': outcome['errors']
+                            }
+                        else:
+                            result = {'file': result['file'], 'error': 'Failed to save scenarios'}
+                yield json.dumps(result) + '\n'
+            yield json.dumps({'done': True, 'files': len(uploads), 'scenarios_added': added}) + '\n'
+        except Exception as e:
+            print(f"Error processing PDF batch: {e}")
+            traceback.print_exc()
+            yield json.dumps({'error': str(e)}) + '\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@api.route('/api/admin/sessions', methods=['GET'])
+def admin_sessions():
+    """List the heaviest game sessions (approximate bytes) and cache sizes."""
+    if not is_admin_request():
+        return jsonify({
+            'success': False,
+            'error': 'Forbidden'
+        }), 403
+    try:
+        services = get_services()
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 1000)
+        return jsonify({
+            'success': True,
+            'sessions': services.sessions.memory_usage(limit),
+            'caches': services.decision_agent.cache_usage()
+        })
+    except Exception as e:
+        print(f"Error reporting session memory: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/api/admin/memory/diff', methods=['GET'])
+def admin_memory_diff():
+    """Report allocation growth by source line since the previous call (needs TRACEMALLOC=1)."""
+    if not is_admin_request():
+        return jsonify({
+            'success': False,
+            'error': 'Forbidden'
+        }), 403
+    tracer = current_app.extensions.get('tracemalloc')
+    if tracer is None:
+        return jsonify({
+            'success': False,
+            'error': 'Allocation tracing is off; start the app with TRACEMALLOC=1'
+        }), 404
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+    return jsonify({
+        'success': True,
+        'memory': tracer.diff(limit)
+    })
+
+
+@api.route('/api/admin/prompts', methods=['GET'])
+def admin_prompts():
+    """Report model call statistics per prompt template, the most recent calls and the shared clients."""
+    if not is_admin_request():
+        return jsonify({
+            'success': False,
+            'error': 'Forbidden'
+        }), 403
+    from agents.model_clients import model_clients
+    from agents.prompts import coalescer, prompt_usage
+    recent = min(max(request.args.get('recent', 20, type=int), 0), 100)
+    return jsonify({
+        'success': True,
+        'prompts': prompt_usage.snapshot(recent),
+        'clients': model_clients.usage(),
+        'coalescing': coalescer.usage()
+    })
+
+
+app = create_app()
+
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if config.WORKERS > 1 and hasattr(os, 'fork'):
+        from worker_server import serve_workers
+        serve_workers(create_app, host='0.0.0.0', port=config.PORT, workers=config.WORKERS)
+    else:
+        app.run(debug=True, host='0.0.0.0', port=config.PORT)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Headless batch runner: play many games without the web app or a browser.
+
+Each game is played by a policy (random, greedy or scripted) against the
+game engine with the offline decision agent, so no Vertex AI calls are made.
+Games are spread over a process pool; one NDJSON line per game is streamed
+to the output and a summary is printed at the end.
+
+Usage:
+    python batch_runner.py --games 10000 --policy greedy --workers 4 --output results.ndjson
+    python batch_runner.py --games 100 --policy scripted --script script.json
+"""
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from agents import OfflineDecisionAgent
+from agents.readiness import readiness_verdict
+from analytics import game_summary
+from game_engine import GameEngine
+from models import MATURITY_DIMENSIONS, GameConfig, GameState
+from option_index import METRICS, gap_weights, option_value
+from scenario_manager import ScenarioManager
+
+# (scenario, option) pair a policy can pick
+Choice = Tuple[Dict, Dict]
+
+
+class Policy:
+    """Plays a game: picks decision options and decides when to launch."""
+
+    def __init__(self, rng: random.Random, game_config: Optional[GameConfig] = None):
+        self.rng = rng
+        self.game_config = game_config or GameConfig.defaults()
+
+    def choose(self, state: GameState, choices: List[Choice]) -> Optional[Choice]:
+        """Pick one of the affordable options, or None to let a week pass."""
+        return None
+
+    def should_launch(self, state: GameState) -> bool:
+        """Launch to production once the platform is ready."""
+        return readiness_verdict(state.maturity.to_dict(), self.game_config)["ready_for_production"]
+
+
+class RandomPolicy(Policy):
+    """Picks a random affordable option, sometimes waiting a week instead."""
+
+    WAIT_PROBABILITY = 0.2
+
+    def choose(self, state: GameState, choices: List[Choice]) -> Optional[Choice]:
+        if not choices or self.rng.random() < self.WAIT_PROBABILITY:
+            return None
+        return self.rng.choice(choices)
+
+
+class GreedyPolicy(Policy):
+    """
+    Picks the option with the most maturity gain where it is needed most.
+
+    Gains are weighted by how far each capability is below the
+    production-ready threshold. With the "gain" metric the total weighted
+    gain counts; with "dollar", "week" or "resource" it is the gain per
+    unit of that cost (see option_index).
+    """
+
+    def __init__(self, rng: random.Random, game_config: Optional[GameConfig] = None, metric: str = "gain"):
+        super().__init__(rng, game_config)
+        self.metric = metric
+
+    def choose(self, state: GameState, choices: List[Choice]) -> Optional[Choice]:
+        weights = gap_weights(state.maturity.to_dict(), self.game_config.production_ready_threshold)
+        best, best_score = None, 0.0
+        for position, (scenario, option) in enumerate(choices):
+            if self.metric == "gain":
+                values = [option["maturity_impact"].get(d, 0) for d in MATURITY_DIMENSIONS]
+            else:
+                values = option_value(position, scenario, option).values(self.metric)
+            score = sum(w * v for w, v in zip(weights, values))
+            if score > best_score:
+                best, best_score = (scenario, option), score
+        return best
+
+
+class ScriptedPolicy(Policy):
+    """Picks the options of a script (a list of option ids) in order, waiting until each is available."""
+
+    def __init__(self, rng: random.Random, script: List[str], game_config: Optional[GameConfig] = None):
+        super().__init__(rng, game_config)
+        self.script = list(script)
+        self.position = 0
+
+    def choose(self, state: GameState, choices: List[Choice]) -> Optional[Choice]:
+        if self.position >= len(self.script):
+            return None
+        for scenario, option in choices:
+            if option["id"] == self.script[self.position]:
+                self.position += 1
+                return scenario, option
+        return None
+
+
+POLICIES = {"random": RandomPolicy, "greedy": GreedyPolicy, "scripted": ScriptedPolicy}
+
+
+def make_policy(name: str, rng: random.Random, script: Optional[List[str]] = None,
+                metric: str = "gain", game_config: Optional[GameConfig] = None) -> Policy:
+    """
+    Create a policy by name.
+
+    Raises:
+        ValueError: If the policy is unknown, or scripted without a script
+    """
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy '{name}' (choose from {', '.join(POLICIES)})")
+    if name == "scripted":
+        if not script:
+            raise ValueError("The scripted policy needs a script")
+        return ScriptedPolicy(rng, script, game_config)
+    if name == "greedy":
+        if metric not in ("gain",) + METRICS:
+            raise ValueError(f"Unknown metric '{metric}'")
+        return GreedyPolicy(rng, game_config, metric)
+    return POLICIES[name](rng, game_config)
+
+
+def affordable_choices(state: GameState, scenarios: List[Dict], decided: set) -> List[Choice]:
+    """Get the options of undecided, available scenarios the player can afford."""
+    return [
+        (scenario, option)
+        for scenario in scenarios
+        if scenario["id"] not in decided and scenario.get("week_available", 0) <= state.current_week
+        for option in scenario["options"]
+        if option["cost"] <= state.budget
+        and option.get("resources_required", 0) <= state.resources
+        and option.get("time_weeks", 1) <= state.time_remaining_weeks
+    ]
+
+
+def play_game(seed: int, policy_name: str, scenarios: List[Dict], agent: OfflineDecisionAgent,
+              script: Optional[List[str]] = None, metric: str = "gain",
+              game_config: Optional[GameConfig] = None, max_steps: int = 1000) -> Dict:
+    """
+    Play one game from start to end.
+
+    The policy decides week by week until it launches or time runs out; a
+    platform that was never launched is launched at the end.
+
+    Args:
+        game_config: Game parameters of this game (defaults to config)
+
+    Returns:
+        Game summary (see analytics.game_summary) with the `seed`, `policy`
+        and number of `events`
+    """
+    engine = GameEngine(agent, game_config)
+    engine.rng.seed(seed)
+    policy = make_policy(policy_name, random.Random(f"policy-{seed}"), script, metric, engine.game_config)
+    state = engine.start_new_game()
+    decided: set = set()
+
+    for _ in range(max_steps):
+        if state.time_remaining_weeks <= 0 or policy.should_launch(state):
+            break
+        choice = policy.choose(state, affordable_choices(state, scenarios + engine.get_available_decisions(), decided))
+        if choice is None:
+            engine.advance_weeks(1)
+            continue
+        scenario, option = choice
+        if engine.process_decision_impact(option, scenario["id"])["success"]:
+            decided.add(scenario["id"])
+    engine.launch_to_production()
+
+    result = engine.end_game()
+    summary = game_summary(result["game_state"], result["score"], engine.game_config.initial_budget)
+    summary.update(seed=seed, policy=policy_name, events=len(result["game_state"]["events"]))
+    return summary
+
+
+# Per-process state of pool workers
+_worker: Dict = {}
+
+
+def _init_worker(scenarios_file: str, policy_name: str, script: Optional[List[str]], metric: str):
+    """Load the scenarios and create the offline agent once per worker process."""
+    _worker.update(
+        scenarios=ScenarioManager(scenarios_file).get_all_scenarios(),
+        agent=OfflineDecisionAgent(),
+        policy=policy_name,
+        script=script,
+        metric=metric
+    )
+
+
+def _play(seed: int) -> Dict:
+    """Play one game in a worker process."""
+    return play_game(seed, _worker["policy"], _worker["scenarios"], _worker["agent"],
+                     _worker["script"], _worker["metric"])
+
+
+def run_games(games: int, policy_name: str, workers: int = 1, seed: int = 0,
+              scenarios_file: str = "scenarios.json", script: Optional[List[str]] = None,
+              metric: str = "gain") -> Iterator[Dict]:
+    """
+    Play games with seeds `seed`, `seed + 1`, ... and yield their summaries as they finish.
+
+    Workers share nothing but their inputs, so throughput grows with the
+    number of worker processes up to the number of cores.
+    """
+    make_policy(policy_name, random.Random(), script, metric)  # fail fast on a bad policy
+    initargs = (scenarios_file, policy_name, script, metric)
+    seeds = range(seed, seed + games)
+    if workers <= 1:
+        _init_worker(*initargs)
+        yield from map(_play, seeds)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.imap_unordered(_play, seeds, chunksize=max(1, min(64, games // (workers * 8))))
+
+
+class BatchSummary:
+    """Running totals over the games of a batch."""
+
+    def __init__(self):
+        self.games = 0
+        self.score_total = 0
+        self.production = 0
+        self.grades: Counter = Counter()
+        self.options: Counter = Counter()
+
+    def add(self, summary: Dict):
+        """Fold one game summary into the totals."""
+        self.games += 1
+        self.score_total += summary["score"]
+        self.production += summary["is_production"]
+        self.grades[summary["grade"]] += 1
+        self.options.update(summary["options"])
+
+    def to_dict(self, elapsed: float) -> Dict:
+        """Get the batch summary."""
+        games = max(self.games, 1)
+        return {
+            "games": self.games,
+            "seconds": round(elapsed, 2),
+            "games_per_second": round(self.games / elapsed, 1) if elapsed > 0 else None,
+            "mean_score": round(self.score_total / games, 2),
+            "production_rate": round(self.production / games, 4),
+            "grades": dict(sorted(self.grades.items())),
+            "top_options": [
+                {"option_id": option_id, "pick_rate": round(count / games, 4)}
+                for option_id, count in self.options.most_common(10)
+            ]
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy", help="policy playing the games")
+    parser.add_argument("--metric", default="gain", help="greedy policy value: gain, dollar, week or resource")
+    parser.add_argument("--script", help="JSON file with the list of option ids for the scripted policy")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--scenarios", default="scenarios.json", help="scenarios file")
+    parser.add_argument("--output", default="-", help="NDJSON output file ('-' for stdout)")
+    parser.add_argument("--analytics", metavar="DB", help="also record the games in this analytics database")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+
+    store = None
+    if args.analytics:
+        from analytics import AnalyticsStore
+        store = AnalyticsStore(args.analytics)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    totals = BatchSummary()
+    run_id = f"{int(time.time())}-{os.getpid()}"
+    start = time.monotonic()
+    try:
+        for summary in run_games(args.games, args.policy, args.workers, args.seed, args.scenarios,
+                                 script, args.metric):
+            out.write(json.dumps(summary) + "\n")
+            totals.add(summary)
+            if store is not None:
+                store.record(f"batch-{run_id}-{summary['seed']}", summary, player=f"batch:{args.policy}")
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(json.dumps(totals.to_dict(time.monotonic() - start), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
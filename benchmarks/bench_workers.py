@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for multi-process worker mode.
+
+Starts the pre-fork server with 1, 2, 4, ... worker processes and a shared
+SQLite session store, then drives it from concurrent client processes, each
+playing its own game session: production forecasts (CPU bound) and
+decisions (session read/modify/write). Reports requests per second and the
+speedup over a single worker. No Vertex AI calls are made.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1 2 4] [--clients 8] [--seconds 10]
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER = (
+    "from app import create_app; from worker_server import serve_workers; "
+    "serve_workers(create_app, '127.0.0.1', {port}, workers={workers})"
+)
+
+OPTION = {
+    "id": "bench_option",
+    "text": "Benchmark investment",
+    "cost": 1000,
+    "time_weeks": 0,
+    "resources_required": 1,
+    "maturity_impact": {"security": 1, "governance": 1},
+}
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(base_url: str, timeout: float = 30.0):
+    """Wait until the server answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/api/scenarios", timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def client(base_url: str, seconds: float, runs: int, results) -> None:
+    """Play one session as fast as possible for `seconds`; report the request count."""
+    http = requests.Session()
+    http.headers["X-Session-ID"] = uuid.uuid4().hex
+    http.post(f"{base_url}/api/game/new").raise_for_status()
+    count = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        http.get(f"{base_url}/api/production/forecast", params={"runs": runs}).raise_for_status()
+        response = http.post(f"{base_url}/api/decision/make", json={"option": OPTION})
+        result = response.json() if response.status_code == 200 else {}
+        if not result.get("success") or result["new_state"]["budget"] < OPTION["cost"]:
+            # Budget or resources ran out: start over
+            http.post(f"{base_url}/api/game/new").raise_for_status()
+        count += 2
+    results.put(count)
+
+
+def run(workers: int, clients: int, seconds: float, runs: int) -> float:
+    """Benchmark one worker count; returns requests per second."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            SESSION_STORE="sqlite",
+            SESSION_DB_FILE=os.path.join(tmp, "sessions.db"),
+            WORKERS=str(workers),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-c", SERVER.format(port=port, workers=workers)],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up(base_url)
+            results = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(target=client, args=(base_url, seconds, runs, results))
+                for _ in range(clients)
+            ]
+            start = time.monotonic()
+            for p in processes:
+                p.start()
+            total = sum(results.get() for _ in processes)
+            elapsed = time.monotonic() - start
+            for p in processes:
+                p.join()
+            return total / elapsed
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to compare")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent client processes")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration per worker count")
+    parser.add_argument("--runs", type=int, default=2000, help="Monte Carlo runs per forecast request")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients, {args.seconds:.0f}s per case\n")
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>10}")
+    print("-" * 30)
+    baseline = None
+    for workers in args.workers:
+        rate = run(workers, args.clients, args.seconds, args.runs)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.1f} {rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the Flask application.
+
+Measures, in fresh interpreters, how long it takes to import `app`, to
+create the application and to serve the first request, next to the cost of
+the heavy imports (Vertex AI, PyPDF2) that are now deferred to first use.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("import app", "import app"),
+    ("create_app()", "import app; app.create_app()"),
+    ("first request (GET /api/scenarios)",
+     "import app; app.create_app().test_client().get('/api/scenarios')"),
+    ("deferred: vertexai", "import vertexai; from vertexai.generative_models import GenerativeModel"),
+    ("deferred: PyPDF2", "import PyPDF2"),
+]
+
+TIMER = """
+import time
+_start = time.perf_counter()
+try:
+{body}
+except Exception as e:
+    print('error: %s' % e)
+    raise SystemExit(1)
+print(time.perf_counter() - _start)
+"""
+
+
+def time_snippet(snippet: str) -> float:
+    """Run a snippet in a fresh interpreter and return its wall time in seconds."""
+    body = "\n".join("    " + line for line in snippet.split("; "))
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(body=body)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError((lines[-1] if lines else result.stderr.strip()) or "failed")
+    return float(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="runs per case (median is reported)")
+    args = parser.parse_args()
+
+    print(f"{'case':<40} {'median ms':>10} {'min ms':>10}")
+    print("-" * 62)
+    for label, snippet in CASES:
+        try:
+            samples = [time_snippet(snippet) * 1000 for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{label:<40} {'n/a':>10} {'':>10}  ({e})")
+            continue
+        print(f"{label:<40} {statistics.median(samples):>10.1f} {min(samples):>10.1f}")
+
+    print("\nThe 'deferred' rows are paid on the first AI call or PDF upload "
+          "instead of at import time.")
+
+
+if __name__ == "__main__":
+    main()
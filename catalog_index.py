@@ -0,0 +1,84 @@
+"""Sorted index over the scenario catalog for paginated, filtered listing."""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# Upper bound for open-ended week ranges
+_MAX_WEEK = float("inf")
+
+
+def encode_cursor(key: Tuple[int, int]) -> str:
+    """Encode the (week_available, position) of the last listed scenario."""
+    return f"{key[0]}.{key[1]}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor from `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        week, position = cursor.split(".")
+        return int(week), int(position)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+class CatalogIndex:
+    """
+    Scenario positions sorted by (week_available, position), overall and
+    per category.
+
+    Listing is ordered by week and then by catalog order, so a week range
+    is a contiguous slice and a cursor is the key of the last item seen:
+    a page costs a binary search plus the page itself, whatever the
+    catalog size.
+    """
+
+    def __init__(self, scenarios: List[Dict]):
+        """Build the index over a list of validated scenarios."""
+        keys: Dict[Optional[str], List[Tuple[int, int]]] = {None: []}
+        for position, scenario in enumerate(scenarios):
+            key = (scenario.get("week_available", 0), position)
+            keys[None].append(key)
+            keys.setdefault(scenario.get("category"), []).append(key)
+        for category_keys in keys.values():
+            category_keys.sort()
+        self._keys = keys
+
+    @property
+    def categories(self) -> List[str]:
+        """Categories present in the catalog."""
+        return sorted(category for category in self._keys if category is not None)
+
+    def page(self, category: Optional[str] = None, week_min: Optional[int] = None,
+             week_max: Optional[int] = None, cursor: Optional[str] = None,
+             limit: int = 50) -> Dict:
+        """
+        Get one page of scenario positions.
+
+        Args:
+            category: Only scenarios of this category
+            week_min: Only scenarios available from this week on
+            week_max: Only scenarios available by this week
+            cursor: `next_cursor` of the previous page
+            limit: Maximum number of positions
+
+        Returns:
+            Dictionary with the `positions`, the `total` number of matching
+            scenarios and the `next_cursor` (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        keys = self._keys.get(category, [])
+        low = bisect_left(keys, (week_min, -1)) if week_min is not None else 0
+        high = bisect_right(keys, (week_max, _MAX_WEEK)) if week_max is not None else len(keys)
+        start = max(low, bisect_right(keys, decode_cursor(cursor))) if cursor else low
+        end = min(high, start + limit)
+        return {
+            "positions": [position for _, position in keys[start:end]],
+            "total": max(0, high - low),
+            "next_cursor": encode_cursor(keys[end - 1]) if start < end < high else None
+        }
@@ -0,0 +1,68 @@
+"""Response compression negotiated from Accept-Encoding (brotli if installed, gzip)."""
+from typing import Optional
+import gzip
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Preferred first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/plain", "text/css", "application/javascript"}
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Pick the best supported encoding the client accepts (None for identity)."""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Compress data with "br" or "gzip".
+
+    Args:
+        best: Use the highest compression level (for payloads that are
+            compressed once and served many times)
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+    raise ValueError(f"Unsupported encoding '{encoding}'")
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Get the ETag of an encoded representation (strong ETags differ per encoding)."""
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def init_compression(app: Flask, min_bytes: int = 1024):
+    """Compress eligible responses of the application on the way out."""
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add("Accept-Encoding")
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        data = response.get_data()
+        encoding = negotiate_encoding() if len(data) >= min_bytes else None
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(encoded_etag(etag, encoding), weak)
+        return response
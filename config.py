@@ -26,3 +26,85 @@ MATURITY_LEVELS = {
 # Thresholds for production readiness
 PRODUCTION_READY_THRESHOLD = 60
 MINIMUM_ACCEPTABLE_THRESHOLD = 40
+
+# Production incidents: chance per week that an immature capability fails, by severity
+# (Critical below the minimum acceptable threshold, Major below production ready)
+PRODUCTION_INCIDENT_WEEKLY_PROBABILITY = {
+    "Major": 0.015,
+    "Critical": 0.04
+}
+# Late launches still face at least this many weeks of production
+MIN_PRODUCTION_WEEKS = 4
+
+# Optional JSON file with extra (or overriding) random event rules
+EVENT_RULES_FILE = os.getenv("EVENT_RULES_FILE", "event_rules.json")
+
+# Near-duplicate scenario detection on ingest
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.8"))
+DEDUP_MODE = os.getenv("DEDUP_MODE", "reject")  # reject | merge | off
+
+# Bulk NDJSON scenario import
+BULK_IMPORT_MAX_LINE_BYTES = int(os.getenv("BULK_IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "500"))
+
+# Game sessions and worker processes
+PORT = int(os.getenv("PORT", "5000"))
+WORKERS = int(os.getenv("WORKERS", "1"))
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")  # memory | sqlite (always sqlite with WORKERS > 1)
+SESSION_DB_FILE = os.getenv("SESSION_DB_FILE", "sessions.db")
+SESSION_LOCK_LEASE_SECONDS = float(os.getenv("SESSION_LOCK_LEASE_SECONDS", "120"))
+SESSION_LOCK_WAIT_SECONDS = float(os.getenv("SESSION_LOCK_WAIT_SECONDS", "30"))
+DEFAULT_SESSION_ID = "default"
+
+# Production readiness analysis: maturity bucket width for memoized AI prose
+READINESS_BUCKET_SIZE = int(os.getenv("READINESS_BUCKET_SIZE", "10"))
+READINESS_CACHE_FILE = os.getenv("READINESS_CACHE_FILE", "readiness_cache.db")
+
+# Background final report generation
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_MAX_WAIT_SECONDS = 30
+
+# What-if branch comparison limits
+WHATIF_MAX_BRANCHES = 8
+WHATIF_MAX_OPTIONS = 20
+
+# Fast-forward limit per /api/game/advance call
+MAX_ADVANCE_WEEKS = 520
+
+# Actions that can be undone per game (0 for all); older ones leave the game log
+UNDO_MAX_STEPS = int(os.getenv("UNDO_MAX_STEPS", "50"))
+# Most game log steps returned by /api/game/history
+HISTORY_MAX_STEPS = 500
+
+# In-memory session caps (0 = unlimited); sessions above them are spilled to disk or evicted
+SESSION_MEMORY_LIMIT_BYTES = int(os.getenv("SESSION_MEMORY_LIMIT_BYTES", str(256 * 1024 * 1024)))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(8 * 1024 * 1024)))
+SESSION_OVERFLOW = os.getenv("SESSION_OVERFLOW", "spill")  # spill | evict
+SESSION_SPILL_DIR = os.getenv("SESSION_SPILL_DIR", "session_spill")
+
+# Admin endpoints: required X-Admin-Token value (empty: local requests only)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+# Trace allocations for /api/admin/memory/diff (slows the app down)
+TRACEMALLOC = os.getenv("TRACEMALLOC", "") == "1"
+
+# Response compression (gzip, or brotli when the brotli package is installed)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Paginated scenario listing (/api/scenarios?limit=...)
+SCENARIO_PAGE_SIZE = int(os.getenv("SCENARIO_PAGE_SIZE", "50"))
+SCENARIO_PAGE_MAX = int(os.getenv("SCENARIO_PAGE_MAX", "500"))
+
+# Cross-game analytics and leaderboard
+ANALYTICS_DB_FILE = os.getenv("ANALYTICS_DB_FILE", "analytics.db")
+PLAYER_NAME_MAX_LENGTH = 40
+
+# Identical concurrent model calls share one request; each distinct prompt
+# may start at most this many calls per minute (0 for no limit)
+MODEL_RATE_LIMIT_PER_MINUTE = float(os.getenv("MODEL_RATE_LIMIT_PER_MINUTE", "30"))
+MODEL_RATE_LIMIT_BURST = int(os.getenv("MODEL_RATE_LIMIT_BURST", "10"))
+
+# PDF uploads: text extraction processes (0 extracts in the request thread),
+# pages read per file (0 for all) and files per batch upload
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "200"))
+PDF_BATCH_MAX_FILES = int(os.getenv("PDF_BATCH_MAX_FILES", "20"))
@@ -0,0 +1,190 @@
+"""Data-driven random event rules for the game engine."""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import bisect
+import json
+import os
+import random
+import config
+from models import MATURITY_DIMENSIONS
+
+
+DEFAULT_EVENT_RULES = [
+    {
+        "id": "security_audit",
+        "title": "Security Audit Required",
+        "description": "A security audit has revealed potential vulnerabilities. Additional security measures needed.",
+        "conditions": {"security": {"below": 40}},
+        "impact": {"budget": -20000},
+        "weight": 1.0
+    },
+    {
+        "id": "data_quality",
+        "title": "Data Quality Issues",
+        "description": "Poor data quality is affecting agent performance.",
+        "conditions": {"data_platforms": {"below": 40}},
+        "impact": {"maturity": {"agent_operations": -5}},
+        "weight": 1.0
+    },
+    {
+        "id": "compliance_review",
+        "title": "Compliance Review",
+        "description": "Regulatory compliance review identified gaps in governance.",
+        "conditions": {"governance": {"below": 50}},
+        "impact": {"budget": -30000, "time": 2},
+        "weight": 1.0
+    },
+]
+
+
+@dataclass
+class EventRule:
+    """A random event and the maturity conditions under which it can fire.
+
+    Each condition bounds one maturity dimension with `below` (exclusive)
+    and/or `at_least` (inclusive); all conditions must hold.
+    """
+    id: str
+    title: str
+    description: str
+    conditions: Dict[str, Dict[str, int]]
+    impact: Dict[str, Any]
+    weight: float = 1.0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EventRule':
+        """Build a rule from its JSON representation, validating conditions."""
+        conditions = data.get('conditions', {})
+        for dimension, bounds in conditions.items():
+            if dimension not in MATURITY_DIMENSIONS:
+                raise ValueError(f"Event rule '{data.get('id')}': unknown dimension '{dimension}'")
+            unknown = set(bounds) - {"below", "at_least"}
+            if unknown:
+                raise ValueError(f"Event rule '{data.get('id')}': unknown bound(s) {sorted(unknown)}")
+        weight = float(data.get('weight', 1.0))
+        if weight <= 0:
+            raise ValueError(f"Event rule '{data.get('id')}': weight must be positive")
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            description=data.get('description', ''),
+            conditions=conditions,
+            impact=data.get('impact', {}),
+            weight=weight
+        )
+
+    def matches_value(self, dimension: str, value: int) -> bool:
+        """Check this rule's condition on a single dimension."""
+        bounds = self.conditions.get(dimension)
+        if not bounds:
+            return True
+        if "below" in bounds and not value < bounds["below"]:
+            return False
+        if "at_least" in bounds and not value >= bounds["at_least"]:
+            return False
+        return True
+
+
+class EventRuleTable:
+    """Event rules compiled into per-dimension threshold indexes.
+
+    For every maturity dimension the distinct thresholds split 0-100 into
+    intervals, and each interval stores a bitmask of the rules satisfied
+    there. Finding the matching rules is one bisect per dimension and an AND
+    of the masks; no rule condition is evaluated at match time.
+    """
+
+    def __init__(self, rules: List[EventRule]):
+        """Compile the given rules."""
+        self.rules = list(rules)
+        self._full_mask = (1 << len(self.rules)) - 1
+        self._index: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._choices: Dict[int, Tuple[List[EventRule], List[float]]] = {}
+
+        for dimension in MATURITY_DIMENSIONS:
+            boundaries = sorted({
+                bound
+                for rule in self.rules
+                for bound in rule.conditions.get(dimension, {}).values()
+            })
+            if not boundaries:
+                continue
+            # Interval i covers [boundaries[i-1], boundaries[i]); pick a value inside it
+            representatives = [boundaries[0] - 1] + boundaries
+            masks = []
+            for value in representatives:
+                mask = 0
+                for bit, rule in enumerate(self.rules):
+                    if rule.matches_value(dimension, value):
+                        mask |= 1 << bit
+                masks.append(mask)
+            self._index[dimension] = (boundaries, masks)
+
+    @classmethod
+    def from_dicts(cls, data: List[Dict]) -> 'EventRuleTable':
+        """Compile a table from JSON-style rule dictionaries."""
+        return cls([EventRule.from_dict(d) for d in data])
+
+    def _match_mask(self, maturity) -> int:
+        """Get the bitmask of rules whose conditions hold for `maturity`."""
+        mask = self._full_mask
+        for dimension, (boundaries, masks) in self._index.items():
+            mask &= masks[bisect.bisect_right(boundaries, getattr(maturity, dimension, 0))]
+            if not mask:
+                break
+        return mask
+
+    def matching(self, maturity) -> List[EventRule]:
+        """Get all rules whose conditions hold for the given maturity metrics."""
+        return self._choices_for(self._match_mask(maturity))[0]
+
+    def choose(self, maturity, rng: Optional[random.Random] = None) -> Optional[EventRule]:
+        """Pick one matching rule at random, weighted by rule weight."""
+        mask = self._match_mask(maturity)
+        if not mask:
+            return None
+        rules, cumulative = self._choices_for(mask)
+        point = (rng or random).random() * cumulative[-1]
+        return rules[bisect.bisect_right(cumulative, point)]
+
+    def _choices_for(self, mask: int) -> Tuple[List[EventRule], List[float]]:
+        """Get (and memoize) the rules and cumulative weights for a match mask."""
+        cached = self._choices.get(mask)
+        if cached is None:
+            rules = [rule for bit, rule in enumerate(self.rules) if mask >> bit & 1]
+            cumulative = []
+            total = 0.0
+            for rule in rules:
+                total += rule.weight
+                cumulative.append(total)
+            cached = self._choices[mask] = (rules, cumulative)
+        return cached
+
+
+def load_event_rules(path: str) -> List[Dict]:
+    """Load event rule dictionaries from a JSON file (a list of rules)."""
+    with open(path, 'r') as f:
+        rules = json.load(f)
+    if not isinstance(rules, list):
+        raise ValueError(f"Event rules file '{path}' must contain a JSON list")
+    return rules
+
+
+def build_event_rule_table(rules_file: str = "") -> EventRuleTable:
+    """Compile the default rules, extended (or overridden by id) from a file."""
+    rules = {rule['id']: rule for rule in DEFAULT_EVENT_RULES}
+    if rules_file and os.path.exists(rules_file):
+        for rule in load_event_rules(rules_file):
+            rules[rule['id']] = rule
+    return EventRuleTable.from_dicts(list(rules.values()))
+
+
+_default_table: Optional[EventRuleTable] = None
+
+
+def get_event_rule_table() -> EventRuleTable:
+    """Get the process-wide rule table, compiled once on first use."""
+    global _default_table
+    if _default_table is None:
+        _default_table = build_event_rule_table(config.EVENT_RULES_FILE)
+    return _default_table
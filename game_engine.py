@@ -1,42 +1,237 @@
 """Game engine for the multi-agent platform simulation."""
-from typing import Dict, List, Optional
-from models import GameState, MaturityMetrics, GameEvent, Decision, DecisionOption, DecisionCategory
-from agents import DecisionAgent
-import config
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Union
+from models import GameConfig, GameLog, GameState, MaturityMetrics, GameEvent, Decision, DecisionOption, DecisionCategory, Step
+from models.game_log import (
+    Adjusted, DecisionRecorded, EventAdded, FieldSet, ImpactRealized, ImpactScheduled, MaturityAdjusted, WeeksPassed
+)
+from models.schemas import to_decision_option
+from agents import DecisionAgent, shared_agent
+from event_rules import get_event_rule_table
+from production_simulator import ProductionSimulator
+from report_service import score_game
+import hashlib
+import math
 import random
+import uuid
+
+# Chance of a random event in any week
+RANDOM_EVENT_WEEKLY_PROBABILITY = 0.1
+_LOG_NO_EVENT = math.log(1.0 - RANDOM_EVENT_WEEKLY_PROBABILITY)
 
 
 class GameEngine:
-    """Main game engine that manages game state and logic."""
+    """
+    Main game engine that manages game state and logic.
+    
+    Every change to the game state goes through the game log as a typed,
+    invertible change, one step per player action, so actions can be
+    undone and redone and the state can be rebuilt from the log. Undo does
+    not rewind the random generator: replaying an action after undoing it
+    draws new luck.
+    """
     
-    def __init__(self):
-        """Initialize the game engine."""
+    def __init__(self, decision_agent: Optional[DecisionAgent] = None,
+                 game_config: Optional[GameConfig] = None):
+        """
+        Initialize the game engine.
+        
+        Args:
+            decision_agent: Agent to use (defaults to the agent shared by the process)
+            game_config: Starting resources and thresholds (defaults to config)
+        """
+        self.game_config = game_config or GameConfig.defaults()
         self.game_state: Optional[GameState] = None
-        self.decision_agent = DecisionAgent()
+        # Identifies the current game, from its start to its end (and through undo)
+        self.game_id: Optional[str] = None
+        self.decision_agent = decision_agent or shared_agent()
         self.pending_impacts: List[Dict] = []
+        self.final_report: Optional[Dict] = None
+        self.log = GameLog()
+        self.event_rules = get_event_rule_table()
+        self.production_simulator = ProductionSimulator(
+            ready_threshold=self.game_config.production_ready_threshold,
+            minimum_threshold=self.game_config.minimum_acceptable_threshold
+        )
+        self.rng = random.Random()
     
-    def start_new_game(self) -> GameState:
-        """Start a new game with initial state."""
-        self.game_state = GameState(
-            budget=config.INITIAL_BUDGET,
-            time_remaining_weeks=config.INITIAL_TIME_WEEKS,
-            resources=config.INITIAL_RESOURCES,
+    def _initial_state(self) -> GameState:
+        """Get the state every game starts from, before any logged change."""
+        return GameState(
+            budget=self.game_config.initial_budget,
+            time_remaining_weeks=self.game_config.initial_time_weeks,
+            resources=self.game_config.initial_resources,
             current_week=0,
             maturity=MaturityMetrics()
         )
+    
+    def start_new_game(self) -> GameState:
+        """Start a new game with initial state."""
+        self.game_state = self._initial_state()
+        self.game_id = uuid.uuid4().hex
         self.pending_impacts = []
+        self.final_report = None
+        self.log = GameLog()
         
         # Add initial welcome event
-        self.game_state.events.append(GameEvent(
-            week=0,
-            title="Welcome to Agentic Platform Simulation",
-            description="You have been appointed to lead the development of a multi-agent platform. "
-                       "You must make strategic decisions to build a production-ready platform within the given budget and timeline.",
-            impact={}
-        ))
+        with self._step("start"):
+            self._add_event(GameEvent(
+                week=0,
+                title="Welcome to Agentic Platform Simulation",
+                description="You have been appointed to lead the development of a multi-agent platform. "
+                           "You must make strategic decisions to build a production-ready platform within the given budget and timeline.",
+                impact={}
+            ))
         
         return self.game_state
     
+    @contextmanager
+    def _step(self, action: str):
+        """
+        Log the changes made inside the block as one undoable step.
+        
+        If the block raises, its changes are reverted. Nested blocks belong
+        to the outer step.
+        """
+        if self.log.is_open:
+            yield
+            return
+        self.log.begin(action, self.game_state.current_week)
+        try:
+            yield
+        except BaseException:
+            self.log.abort(self.game_state, self.pending_impacts)
+            raise
+        self.log.commit()
+    
+    def _change(self, event):
+        """Apply a state change and log it."""
+        event.apply(self.game_state, self.pending_impacts)
+        self.log.record(event)
+    
+    def _add_event(self, event: GameEvent):
+        """Append a game event to the history."""
+        self._change(EventAdded(event))
+    
+    def _set(self, field: str, value):
+        """Set a state field (logged with its previous value)."""
+        old = getattr(self.game_state, field)
+        if old != value:
+            self._change(FieldSet(field, old, value))
+    
+    def undo(self) -> Optional[Step]:
+        """
+        Undo the last action (a decision, time passing, the launch or the end).
+        
+        Returns:
+            The undone step, or None if there is nothing to undo
+        """
+        if not self.game_state:
+            raise ValueError("No active game")
+        step = self.log.undo(self.game_state, self.pending_impacts)
+        if step is not None:
+            self.final_report = None
+        return step
+    
+    def redo(self) -> Optional[Step]:
+        """
+        Redo the last undone action.
+        
+        Returns:
+            The redone step, or None if there is nothing to redo
+        """
+        if not self.game_state:
+            raise ValueError("No active game")
+        step = self.log.redo(self.game_state, self.pending_impacts)
+        if step is not None:
+            self.final_report = None
+        return step
+    
+    def replay(self) -> GameState:
+        """
+        Rebuild the current game state from the log (the engine is not changed).
+        
+        Starts from the initial state, or, once the log has dropped its
+        oldest steps, from the state before the oldest kept step.
+        """
+        if not self.game_state:
+            raise ValueError("No active game")
+        if self.log.trimmed:
+            state, pending = self.game_state.fork(), list(self.pending_impacts)
+            self.log.rewind(state, pending)
+        else:
+            state, pending = self._initial_state(), []
+        self.log.replay(state, pending)
+        return state
+    
+    def history(self, limit: int = 50) -> Dict:
+        """
+        Get the audit trail: the most recent logged steps with their changes.
+        
+        Returns:
+            The `steps` (oldest first), the total number of steps and
+            whether undo and redo are possible
+        """
+        if not self.game_state:
+            raise ValueError("No active game")
+        done = self.log.done
+        return {
+            "steps": [step.to_dict() for step in islice(done, max(len(done) - limit, 0), None)],
+            "total_steps": len(done),
+            "trimmed_steps": self.log.trimmed,
+            "can_undo": self.log.can_undo,
+            "can_redo": self.log.can_redo
+        }
+    
+    def fork(self) -> 'GameEngine':
+        """
+        Branch the engine for a what-if run.
+        
+        The fork shares the decision agent, rules and simulator, branches the
+        game state copy-on-write and continues from the same random state,
+        so branches see the same luck and differ only by their decisions.
+        """
+        other = GameEngine.__new__(GameEngine)
+        other.game_config = self.game_config
+        other.decision_agent = self.decision_agent
+        other.event_rules = self.event_rules
+        other.production_simulator = self.production_simulator
+        other.game_state = self.game_state.fork() if self.game_state else None
+        other.game_id = self.game_id
+        other.pending_impacts = list(self.pending_impacts)
+        other.final_report = None
+        other.log = self.log.fork()
+        other.rng = random.Random()
+        other.rng.setstate(self.rng.getstate())
+        return other
+    
+    def snapshot(self) -> Dict:
+        """Get the complete engine state (game, pending impacts, RNG) as JSON-compatible data."""
+        version, internal, gauss = self.rng.getstate()
+        return {
+            "game_state": self.game_state.to_dict() if self.game_state else None,
+            "game_id": self.game_id,
+            "pending_impacts": self.pending_impacts,
+            "final_report": self.final_report,
+            "log": self.log.to_dict(),
+            "rng_state": [version, list(internal), gauss]
+        }
+    
+    def restore(self, snapshot: Dict):
+        """Restore the engine state from a snapshot."""
+        game_state = snapshot.get("game_state")
+        self.game_state = GameState.from_dict(game_state) if game_state else None
+        self.game_id = snapshot.get("game_id") or (uuid.uuid4().hex if game_state else None)
+        self.pending_impacts = list(snapshot.get("pending_impacts", []))
+        self.final_report = snapshot.get("final_report")
+        # Snapshots taken before the game log existed restore without undo history
+        self.log = GameLog.from_dict(snapshot.get("log", {}))
+        rng_state = snapshot.get("rng_state")
+        if rng_state:
+            version, internal, gauss = rng_state
+            self.rng.setstate((version, tuple(internal), gauss))
+    
     def get_current_state(self) -> Optional[Dict]:
         """Get the current game state as a dictionary."""
         if self.game_state:
@@ -61,49 +256,64 @@ class GameEngine:
         # For demonstration, we'll return the result
         return result
     
-    def process_decision_impact(self, option: Dict) -> Dict:
-        """Process the impact of a decision option."""
+    def process_decision_impact(self, option: Union[Dict, DecisionOption],
+                                scenario_id: Optional[str] = None) -> Dict:
+        """
+        Process the impact of a decision option.
+        
+        Option dictionaries are validated into a DecisionOption first.
+        
+        Args:
+            option: The chosen option
+            scenario_id: Id of the decision (scenario) the option belongs to,
+                recorded so the scenario is not offered again
+        
+        Raises:
+            SchemaError: If the option dictionary is invalid
+        """
         if not self.game_state:
             raise ValueError("No active game")
         
-        # Deduct costs
-        self.game_state.budget -= option.get('cost', 0)
+        if not isinstance(option, DecisionOption):
+            option = to_decision_option(option)
         
         # Allocate resources
-        resources_required = option.get('resources_required', 0)
-        if resources_required > self.game_state.resources:
+        if option.resources_required > self.game_state.resources:
             return {
                 "success": False,
                 "message": "Insufficient resources"
             }
         
-        # Process maturity impacts
-        maturity_impact = option.get('maturity_impact', {})
-        
-        if option.get('immediate_impact', True):
-            # Apply immediate impacts
-            self._apply_maturity_changes(maturity_impact)
-        else:
-            # Schedule delayed impact
-            delayed_weeks = option.get('delayed_impact_weeks', 0)
-            self.pending_impacts.append({
-                'week': self.game_state.current_week + delayed_weeks,
-                'impact': maturity_impact,
-                'description': option.get('text', '')
-            })
-        
-        # Advance time
-        time_weeks = option.get('time_weeks', 1)
-        self._advance_time(time_weeks)
-        
-        # Record decision
-        self.game_state.decisions_made.append({
-            'week': self.game_state.current_week,
-            'option_id': option.get('id'),
-            'text': option.get('text', ''),
-            'cost': option.get('cost', 0),
-            'maturity_impact': maturity_impact
-        })
+        with self._step("decision"):
+            # Deduct costs
+            self._change(Adjusted("budget", -option.cost))
+            
+            # Process maturity impacts
+            maturity_impact = option.maturity_impact
+            
+            if option.immediate_impact:
+                # Apply immediate impacts
+                self._apply_maturity_changes(maturity_impact)
+            else:
+                # Schedule delayed impact
+                self._change(ImpactScheduled({
+                    'week': self.game_state.current_week + option.delayed_impact_weeks,
+                    'impact': maturity_impact,
+                    'description': option.text
+                }))
+            
+            # Advance time
+            self._advance_time(option.time_weeks)
+            
+            # Record decision
+            self._change(DecisionRecorded({
+                'week': self.game_state.current_week,
+                'scenario_id': scenario_id,
+                'option_id': option.id,
+                'text': option.text,
+                'cost': option.cost,
+                'maturity_impact': maturity_impact
+            }))
         
         return {
             "success": True,
@@ -116,75 +326,123 @@ class GameEngine:
         for key, value in changes.items():
             current = getattr(self.game_state.maturity, key, 0)
             new_value = max(0, min(100, current + value))
-            setattr(self.game_state.maturity, key, new_value)
+            if new_value != current:
+                self._change(MaturityAdjusted(key, new_value - current))
+    
+    def advance_weeks(self, weeks: int) -> Dict:
+        """
+        Let time pass without decisions (fast-forward).
+        
+        Returns:
+            Aggregated change: the number of `weeks` advanced, the change in
+            budget, time remaining, reputation and each maturity capability,
+            and the `events` that happened
+        """
+        if not self.game_state:
+            raise ValueError("No active game")
+        if weeks < 0:
+            raise ValueError("Weeks must not be negative")
+        
+        state = self.game_state
+        start_week = state.current_week
+        budget = state.budget
+        time_remaining = state.time_remaining_weeks
+        reputation = state.reputation
+        maturity = state.maturity.to_dict()
+        event_count = len(state.events)
+        
+        with self._step("advance"):
+            self._advance_time(weeks)
+        
+        return {
+            "weeks": state.current_week - start_week,
+            "budget": state.budget - budget,
+            "time_remaining_weeks": state.time_remaining_weeks - time_remaining,
+            "reputation": state.reputation - reputation,
+            "maturity": {
+                key: value - maturity[key]
+                for key, value in state.maturity.to_dict().items()
+            },
+            "events": [
+                {"week": e.week, "title": e.title, "description": e.description, "impact": e.impact}
+                for e in islice(state.events, event_count, None)
+            ]
+        }
     
     def _advance_time(self, weeks: int):
-        """Advance game time and process pending impacts."""
-        for _ in range(weeks):
-            self.game_state.current_week += 1
-            self.game_state.time_remaining_weeks -= 1
-            
-            # Process pending impacts
-            impacts_to_remove = []
-            for pending in self.pending_impacts:
-                if pending['week'] == self.game_state.current_week:
-                    self._apply_maturity_changes(pending['impact'])
-                    self.game_state.events.append(GameEvent(
-                        week=self.game_state.current_week,
-                        title="Delayed Impact Realized",
-                        description=f"Previous investment in '{pending['description']}' is now showing results",
-                        impact=pending['impact']
-                    ))
-                    impacts_to_remove.append(pending)
+        """
+        Advance game time and process pending impacts and random events.
+        
+        Jumps straight from one scheduled impact or random event to the next
+        instead of stepping week by week. The gap to the next random event
+        is drawn from the geometric distribution of a weekly roll.
+        """
+        if weeks <= 0:
+            return
+        
+        state = self.game_state
+        end_week = state.current_week + weeks
+        due_weeks = sorted({
+            pending['week'] for pending in self.pending_impacts
+            if state.current_week < pending['week'] <= end_week
+        })
+        due_weeks.append(end_week + 1)
+        due_index = 0
+        next_event = state.current_week + self._weeks_until_event()
+        
+        while state.current_week < end_week:
+            week = min(due_weeks[due_index], next_event, end_week)
+            self._change(WeeksPassed(week - state.current_week))
             
-            for impact in impacts_to_remove:
-                self.pending_impacts.remove(impact)
+            if week == due_weeks[due_index]:
+                self._realize_pending_impacts(week)
+                due_index += 1
             
-            # Generate random events based on maturity levels
-            if random.random() < 0.1:  # 10% chance per week
+            if week == next_event:
                 self._generate_random_event()
+                next_event = week + self._weeks_until_event()
+    
+    def _weeks_until_event(self) -> int:
+        """Draw the number of weeks until the next random event."""
+        return 1 + int(math.log(1.0 - self.rng.random()) / _LOG_NO_EVENT)
+    
+    def _realize_pending_impacts(self, week: int):
+        """Apply the delayed impacts that are due in the given week."""
+        index = 0
+        while index < len(self.pending_impacts):
+            pending = self.pending_impacts[index]
+            if pending['week'] != week:
+                index += 1
+                continue
+            self._change(ImpactRealized(index, pending))
+            self._apply_maturity_changes(pending['impact'])
+            self._add_event(GameEvent(
+                week=week,
+                title="Delayed Impact Realized",
+                description=f"Previous investment in '{pending['description']}' is now showing results",
+                impact=pending['impact']
+            ))
     
     def _generate_random_event(self):
         """Generate a random event based on current maturity levels."""
-        events = [
-            {
-                "title": "Security Audit Required",
-                "description": "A security audit has revealed potential vulnerabilities. Additional security measures needed.",
-                "condition": lambda m: m.security < 40,
-                "impact": {"budget": -20000}
-            },
-            {
-                "title": "Data Quality Issues",
-                "description": "Poor data quality is affecting agent performance.",
-                "condition": lambda m: m.data_platforms < 40,
-                "impact": {"maturity": {"agent_operations": -5}}
-            },
-            {
-                "title": "Compliance Review",
-                "description": "Regulatory compliance review identified gaps in governance.",
-                "condition": lambda m: m.governance < 50,
-                "impact": {"budget": -30000, "time": 2}
-            },
-        ]
-        
-        for event_template in events:
-            if event_template["condition"](self.game_state.maturity):
-                impact = event_template["impact"]
-                
-                if "budget" in impact:
-                    self.game_state.budget += impact["budget"]
-                if "maturity" in impact:
-                    self._apply_maturity_changes(impact["maturity"])
-                if "time" in impact:
-                    self.game_state.time_remaining_weeks -= impact["time"]
-                
-                self.game_state.events.append(GameEvent(
-                    week=self.game_state.current_week,
-                    title=event_template["title"],
-                    description=event_template["description"],
-                    impact=impact
-                ))
-                break
+        rule = self.event_rules.choose(self.game_state.maturity, self.rng)
+        if rule is None:
+            return
+        
+        impact = rule.impact
+        if "budget" in impact:
+            self._change(Adjusted("budget", impact["budget"]))
+        if "maturity" in impact:
+            self._apply_maturity_changes(impact["maturity"])
+        if "time" in impact:
+            self._change(Adjusted("time_remaining_weeks", -impact["time"]))
+        
+        self._add_event(GameEvent(
+            week=self.game_state.current_week,
+            title=rule.title,
+            description=rule.description,
+            impact=impact
+        ))
     
     def launch_to_production(self) -> Dict:
         """Launch the platform to production and analyze results."""
@@ -199,25 +457,27 @@ class GameEngine:
         
         # Analyze production readiness
         analysis = self.decision_agent.analyze_production_readiness(
-            self.game_state.maturity.to_dict()
+            self.game_state.maturity.to_dict(),
+            self.game_config
         )
         
-        self.game_state.is_production = True
-        self.game_state.production_week = self.game_state.current_week
-        
-        # Generate production issues based on maturity gaps
-        self.game_state.production_issues = analysis.get('potential_issues', [])
-        
-        # Add production launch event
-        self.game_state.events.append(GameEvent(
-            week=self.game_state.current_week,
-            title="Production Launch",
-            description=f"Platform launched to production. Risk Level: {analysis.get('risk_level', 'unknown').upper()}",
-            impact={"production": True}
-        ))
-        
-        # Simulate production impacts over the remaining weeks
-        self._simulate_production_period()
+        with self._step("launch"):
+            self._set("is_production", True)
+            self._set("production_week", self.game_state.current_week)
+            
+            # Generate production issues based on maturity gaps
+            self._set("production_issues", list(analysis.get('potential_issues', [])))
+            
+            # Add production launch event
+            self._add_event(GameEvent(
+                week=self.game_state.current_week,
+                title="Production Launch",
+                description=f"Platform launched to production. Risk Level: {analysis.get('risk_level', 'unknown').upper()}",
+                impact={"production": True}
+            ))
+            
+            # Simulate production impacts over the remaining weeks
+            self._simulate_production_period()
         
         return {
             "success": True,
@@ -226,72 +486,75 @@ class GameEngine:
         }
     
     def _simulate_production_period(self):
-        """Simulate production period and generate issues based on maturity."""
-        maturity = self.game_state.maturity
-        
-        # Generate issues for each low maturity area
-        if maturity.agent_development < config.PRODUCTION_READY_THRESHOLD:
-            severity = "Critical" if maturity.agent_development < config.MINIMUM_ACCEPTABLE_THRESHOLD else "Major"
-            self.game_state.events.append(GameEvent(
-                week=self.game_state.current_week + random.randint(1, 4),
-                title=f"{severity}: Agent Development Issues",
-                description="Agents are experiencing frequent errors due to inadequate development practices.",
-                impact={"cost": -50000, "reputation": -10}
-            ))
+        """
+        Simulate production over the remaining weeks and apply incident impacts.
         
-        if maturity.agent_operations < config.PRODUCTION_READY_THRESHOLD:
-            severity = "Critical" if maturity.agent_operations < config.MINIMUM_ACCEPTABLE_THRESHOLD else "Major"
-            self.game_state.events.append(GameEvent(
-                week=self.game_state.current_week + random.randint(1, 4),
-                title=f"{severity}: Operational Issues",
-                description="Poor monitoring and operations leading to downtime and performance problems.",
-                impact={"cost": -75000, "reputation": -15}
-            ))
+        The whole period is settled at launch: every incident's cost and
+        reputation loss is applied now, as a lump sum, while its event keeps
+        the week it happens in. The game usually ends right after launch,
+        so charging incidents week by week would leave most of them out of
+        the final score.
+        """
+        weeks = self.production_simulator.production_weeks(self.game_state.time_remaining_weeks)
+        incidents = self.production_simulator.simulate(
+            self.game_state.maturity.to_dict(),
+            self.game_state.current_week,
+            weeks,
+            self.rng
+        )
         
-        if maturity.data_platforms < config.PRODUCTION_READY_THRESHOLD:
-            severity = "Critical" if maturity.data_platforms < config.MINIMUM_ACCEPTABLE_THRESHOLD else "Major"
-            self.game_state.events.append(GameEvent(
-                week=self.game_state.current_week + random.randint(1, 4),
-                title=f"{severity}: Data Platform Issues",
-                description="Data quality and availability issues causing agent failures.",
-                impact={"cost": -60000, "reputation": -12}
-            ))
+        for incident in incidents:
+            self._change(Adjusted("budget", incident.impact["cost"]))
+            reputation = self.game_state.reputation
+            self._change(Adjusted("reputation", max(0, reputation + incident.impact["reputation"]) - reputation))
+            self._add_event(incident)
+    
+    def forecast_production(self, runs: int = 1000) -> Dict:
+        """
+        Forecast production cost and reputation loss for the current maturity.
         
-        if maturity.security < config.PRODUCTION_READY_THRESHOLD:
-            severity = "Critical" if maturity.security < config.MINIMUM_ACCEPTABLE_THRESHOLD else "Major"
-            self.game_state.events.append(GameEvent(
-                week=self.game_state.current_week + random.randint(1, 4),
-                title=f"{severity}: Security Breach",
-                description="Security vulnerabilities exploited, requiring immediate response.",
-                impact={"cost": -150000, "reputation": -25}
-            ))
+        Read-only: the forecast draws from a private generator seeded from
+        the game's random state, maturity and remaining time, so it never
+        changes the luck of the game and is the same for the same state in
+        every worker process.
+        """
+        if not self.game_state:
+            raise ValueError("No active game")
         
-        if maturity.governance < config.PRODUCTION_READY_THRESHOLD:
-            severity = "Critical" if maturity.governance < config.MINIMUM_ACCEPTABLE_THRESHOLD else "Major"
-            self.game_state.events.append(GameEvent(
-                week=self.game_state.current_week + random.randint(1, 4),
-                title=f"{severity}: Governance and Compliance Issues",
-                description="Lack of governance causing compliance violations and audit failures.",
-                impact={"cost": -100000, "reputation": -20}
-            ))
+        maturity = self.game_state.maturity.to_dict()
+        weeks = self.production_simulator.production_weeks(self.game_state.time_remaining_weeks)
+        # A digest, not hash(): the state holds None, whose hash differs between processes
+        key = repr((self.rng.getstate(), tuple(maturity.values()), weeks)).encode()
+        rng = random.Random(int.from_bytes(hashlib.sha256(key).digest()[:8], "big"))
+        return self.production_simulator.forecast(maturity, weeks, runs, rng)
     
     def end_game(self) -> Dict:
-        """End the game and generate final report."""
+        """
+        End the game.
+        
+        Returns the final state and a score computed locally; the full AI
+        report is generated separately (see generate_final_report).
+        """
         if not self.game_state:
             raise ValueError("No active game")
         
-        self.game_state.game_over = True
-        
-        # Generate final report using AI agent
-        report = self.decision_agent.generate_final_report(
-            self.game_state.to_dict()
-        )
+        with self._step("end"):
+            self._set("game_over", True)
+        game_state = self.game_state.to_dict()
         
         return {
-            "game_state": self.game_state.to_dict(),
-            "report": report
+            "game_state": game_state,
+            "score": score_game(game_state)
         }
     
+    def generate_final_report(self, game_state: Optional[Dict] = None) -> Dict:
+        """Generate the final report using the AI agent (slow: a long model completion)."""
+        if game_state is None:
+            if not self.game_state:
+                raise ValueError("No active game")
+            game_state = self.game_state.to_dict()
+        return self.decision_agent.generate_final_report(game_state, self.game_config)
+    
     def get_available_decisions(self) -> List[Dict]:
         """Get available decisions for current week using AI agent."""
         if not self.game_state or self.game_state.game_over:
@@ -303,3 +566,13 @@ class GameEngine:
         )
         
         return decisions
+    
+    def stream_available_decisions(self) -> Iterator[Dict]:
+        """Stream available decisions for the current week as the AI agent produces them."""
+        if not self.game_state or self.game_state.game_over:
+            return iter([])
+        
+        return self.decision_agent.stream_decision_scenarios(
+            self.game_state.to_dict(),
+            self.game_state.current_week
+        )
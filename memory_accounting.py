@@ -0,0 +1,98 @@
+"""Approximate memory accounting for game sessions and caches."""
+from typing import Dict, List, Optional
+import sys
+import tracemalloc
+
+_ATOMIC = (str, bytes, int, float, bool, type(None))
+
+# Allocations of tracemalloc itself and of the import machinery are noise in a diff
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """
+    Approximate the memory held by an object and everything it references.
+
+    Walks containers, instance dictionaries and slots; objects reached twice
+    are counted once. Classes, functions and modules are not followed.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, _ATOMIC) or isinstance(item, type) or callable(item):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, '__dict__'):
+                stack.append(vars(item))
+            for cls in type(item).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    value = getattr(item, slot, None)
+                    if value is not None:
+                        stack.append(value)
+    return total
+
+
+def engine_size(engine) -> int:
+    """
+    Approximate the memory of one session: its game state, pending impacts,
+    game log and cached final report. Shared parts (agent, rules, simulator) are
+    not counted.
+    """
+    seen: set = set()
+    return (
+        deep_sizeof(engine.game_state, seen)
+        + deep_sizeof(engine.pending_impacts, seen)
+        + deep_sizeof(engine.log, seen)
+        + deep_sizeof(engine.final_report, seen)
+    )
+
+
+class TracemallocDiff:
+    """
+    Compares tracemalloc snapshots: each call reports the allocation growth
+    since the previous one, grouped by source line.
+    """
+
+    def __init__(self, frames: int = 1):
+        """Start tracing (if it is not already running)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._previous = self._snapshot()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Take a snapshot without the noise (every snapshot must be filtered alike to compare)."""
+        return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+    def diff(self, limit: int = 20) -> Dict:
+        """Get the top allocation changes since the previous call."""
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._previous, 'lineno')
+        self._previous = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        top: List[Dict] = [
+            {
+                'location': str(stat.traceback),
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff,
+                'size': stat.size
+            }
+            for stat in stats[:limit]
+        ]
+        return {'traced_bytes': current, 'peak_bytes': peak, 'top': top}
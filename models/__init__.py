@@ -5,8 +5,12 @@ from .game_state import (
     Decision,
     DecisionOption,
     GameEvent,
-    DecisionCategory
+    DecisionCategory,
+    MATURITY_DIMENSIONS
 )
+from .cow_list import CowList
+from .game_config import GameConfig
+from .game_log import GameLog, Step
 
 __all__ = [
     "GameState",
@@ -14,5 +18,10 @@ __all__ = [
     "Decision",
     "DecisionOption",
     "GameEvent",
-    "DecisionCategory"
+    "DecisionCategory",
+    "MATURITY_DIMENSIONS",
+    "CowList",
+    "GameConfig",
+    "GameLog",
+    "Step"
 ]
@@ -0,0 +1,106 @@
+"""Append-friendly list with O(1) copy-on-write forks."""
+from collections.abc import MutableSequence
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Tuple
+
+
+class CowList(MutableSequence):
+    """
+    A list whose forks share their existing items.
+
+    Items live in frozen segments shared between forks plus a private tail
+    that takes appends. Forking seals the tail into a segment and gives
+    both lists an empty tail, so forking and appending cost O(1) whatever
+    the length. Each list sees a prefix of every segment, so popping the
+    last item only shortens its own view of the last segment and is O(1)
+    too (undo pops events right after a what-if fork). Any other mutation
+    first copies the items into a private list (once), so forks never see
+    each other's changes.
+
+    Items themselves are shared, not copied; game events and decision
+    records are never modified after they are appended.
+    """
+
+    __slots__ = ("_segments", "_tail")
+
+    # Beyond this many segments, reads get slower than one flattening copy
+    MAX_SEGMENTS = 32
+
+    def __init__(self, items: Iterable = ()):
+        # (shared items, length): this list holds the first `length` items of each segment
+        self._segments: Tuple[Tuple[List, int], ...] = ()
+        self._tail: List = list(items)
+
+    def fork(self) -> 'CowList':
+        """Get an independent copy that shares the current items."""
+        if self._tail:
+            self._segments = self._segments + ((self._tail, len(self._tail)),)
+            self._tail = []
+        if len(self._segments) > self.MAX_SEGMENTS:
+            items = list(self)
+            self._segments = ((items, len(items)),)
+        other = CowList()
+        other._segments = self._segments
+        return other
+
+    def _own(self) -> List:
+        """Make all items private so they can be changed in place."""
+        if self._segments:
+            self._tail = list(self)
+            self._segments = ()
+        return self._tail
+
+    def __len__(self) -> int:
+        return sum(length for _, length in self._segments) + len(self._tail)
+
+    def __iter__(self) -> Iterator:
+        return chain(*(islice(items, length) for items, length in self._segments), self._tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or not self._segments:
+            return (self._tail if not self._segments else list(self))[index]
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for items, length in self._segments + ((self._tail, len(self._tail)),):
+                if index < length:
+                    return items[index]
+                index -= length
+        raise IndexError("list index out of range")
+
+    def __setitem__(self, index, value):
+        self._own()[index] = value
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice) and index in (-1, len(self) - 1):
+            self.pop()
+        else:
+            del self._own()[index]
+
+    def insert(self, index: int, value):
+        self._own().insert(index, value)
+
+    def append(self, value):
+        self._tail.append(value)
+
+    def extend(self, values: Iterable):
+        self._tail.extend(values)
+
+    def pop(self, index: int = -1):
+        if index == -1:
+            if self._tail:
+                return self._tail.pop()
+            if self._segments:
+                # Shorten this list's view of the last segment; the items stay shared
+                items, length = self._segments[-1]
+                self._segments = self._segments[:-1] + (((items, length - 1),) if length > 1 else ())
+                return items[length - 1]
+        return self._own().pop(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CowList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CowList({list(self)!r})"
@@ -0,0 +1,59 @@
+"""Per-run game parameters."""
+from dataclasses import dataclass, fields
+from typing import Dict
+import config
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """
+    Game parameters of one engine: starting resources and readiness thresholds.
+
+    Engines read these instead of the module constants in config, so runs
+    with different parameters can share a process without interfering.
+    """
+    initial_budget: int
+    initial_time_weeks: int
+    initial_resources: int
+    production_ready_threshold: int
+    minimum_acceptable_threshold: int
+
+    def __post_init__(self):
+        """
+        Raises:
+            ValueError: If a parameter is out of range
+        """
+        if self.initial_budget < 0 or self.initial_time_weeks < 1 or self.initial_resources < 0:
+            raise ValueError("Budget and resources must not be negative and time must be at least one week")
+        if not 0 < self.minimum_acceptable_threshold <= self.production_ready_threshold <= 100:
+            raise ValueError("Thresholds must satisfy 0 < minimum acceptable <= production ready <= 100")
+
+    @classmethod
+    def defaults(cls) -> 'GameConfig':
+        """Get the parameters configured in config."""
+        return cls(
+            initial_budget=config.INITIAL_BUDGET,
+            initial_time_weeks=config.INITIAL_TIME_WEEKS,
+            initial_resources=config.INITIAL_RESOURCES,
+            production_ready_threshold=config.PRODUCTION_READY_THRESHOLD,
+            minimum_acceptable_threshold=config.MINIMUM_ACCEPTABLE_THRESHOLD
+        )
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> 'GameConfig':
+        """
+        Get the default parameters with some of them replaced.
+
+        Raises:
+            ValueError: If a name is unknown or a parameter is out of range
+        """
+        names = {f.name for f in fields(cls)}
+        unknown = set(values) - names
+        if unknown:
+            raise ValueError(f"Unknown game parameters: {', '.join(sorted(unknown))}")
+        defaults = cls.defaults()
+        return cls(**{name: int(values.get(name, getattr(defaults, name))) for name in names})
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to dictionary."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
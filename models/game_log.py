@@ -0,0 +1,315 @@
+"""Typed, invertible game state changes and the undo/redo log built from them."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import sys
+import config
+from .cow_list import CowList
+from .game_state import GameEvent, GameState
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Adjusted:
+    """A numeric field (budget, time_remaining_weeks, reputation) changed by `delta`."""
+    field: str
+    delta: int
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        setattr(state, self.field, getattr(state, self.field) + self.delta)
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        setattr(state, self.field, getattr(state, self.field) - self.delta)
+
+    def to_record(self) -> List:
+        return ["adjusted", self.field, self.delta]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class WeeksPassed:
+    """Time moved forward: the current week grows and the time remaining shrinks."""
+    weeks: int
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        state.current_week += self.weeks
+        state.time_remaining_weeks -= self.weeks
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        state.current_week -= self.weeks
+        state.time_remaining_weeks += self.weeks
+
+    def to_record(self) -> List:
+        return ["weeks_passed", self.weeks]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class MaturityAdjusted:
+    """A maturity capability changed by `delta` (after clamping to 0-100)."""
+    dimension: str
+    delta: int
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        setattr(state.maturity, self.dimension, getattr(state.maturity, self.dimension, 0) + self.delta)
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        setattr(state.maturity, self.dimension, getattr(state.maturity, self.dimension) - self.delta)
+
+    def to_record(self) -> List:
+        return ["maturity_adjusted", self.dimension, self.delta]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class EventAdded:
+    """A game event was appended to the event history."""
+    event: GameEvent
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        state.events.append(self.event)
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        state.events.pop()
+
+    def to_record(self) -> List:
+        e = self.event
+        return ["event_added", {"week": e.week, "title": e.title, "description": e.description, "impact": e.impact}]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class DecisionRecorded:
+    """A decision was appended to the decision history."""
+    decision: Dict
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        state.decisions_made.append(self.decision)
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        state.decisions_made.pop()
+
+    def to_record(self) -> List:
+        return ["decision_recorded", self.decision]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class ImpactScheduled:
+    """A delayed maturity impact was scheduled."""
+    impact: Dict
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        pending.append(self.impact)
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        pending.pop()
+
+    def to_record(self) -> List:
+        return ["impact_scheduled", self.impact]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class ImpactRealized:
+    """The scheduled impact at `index` fell due and left the pending list."""
+    index: int
+    impact: Dict
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        del pending[self.index]
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        pending.insert(self.index, self.impact)
+
+    def to_record(self) -> List:
+        return ["impact_realized", self.index, self.impact]
+
+
+@dataclass(frozen=True, **_SLOTS)
+class FieldSet:
+    """A field (is_production, production_week, production_issues, game_over) went from `old` to `new`."""
+    field: str
+    old: Any
+    new: Any
+
+    def apply(self, state: GameState, pending: List[Dict]):
+        setattr(state, self.field, self.new)
+
+    def revert(self, state: GameState, pending: List[Dict]):
+        setattr(state, self.field, self.old)
+
+    def to_record(self) -> List:
+        return ["field_set", self.field, self.old, self.new]
+
+
+EVENT_TYPES = {
+    "adjusted": Adjusted,
+    "weeks_passed": WeeksPassed,
+    "maturity_adjusted": MaturityAdjusted,
+    "event_added": EventAdded,
+    "decision_recorded": DecisionRecorded,
+    "impact_scheduled": ImpactScheduled,
+    "impact_realized": ImpactRealized,
+    "field_set": FieldSet,
+}
+
+
+def event_from_record(record: List):
+    """
+    Rebuild a state change from its record (see to_record).
+
+    Raises:
+        ValueError: If the record kind is unknown
+    """
+    kind, *values = record
+    if kind not in EVENT_TYPES:
+        raise ValueError(f"Unknown state change '{kind}'")
+    if kind == "event_added":
+        return EventAdded(GameEvent(**values[0]))
+    return EVENT_TYPES[kind](*values)
+
+
+@dataclass
+class Step:
+    """The state changes of one player action (a decision, time passing, the launch, ...)."""
+    action: str
+    week: int
+    events: List = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {"action": self.action, "week": self.week, "events": [e.to_record() for e in self.events]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Step':
+        return cls(data["action"], data["week"], [event_from_record(r) for r in data["events"]])
+
+
+class GameLog:
+    """
+    Log of every state change, grouped into one step per player action.
+
+    The game state is the result of applying the logged changes in order,
+    so it can be rebuilt from the log (see replay). Every change knows how
+    to revert itself: undoing a step reverts its changes in reverse order
+    and redoing applies them again, at a cost that depends only on the
+    size of that step, never on the length of the game. The first step
+    (the start of the game) cannot be undone.
+
+    Only the last `max_steps` steps are kept, so the log (and the session
+    snapshots that carry it) stays the same size however long the game
+    runs. Once older steps have been dropped, the state is rebuilt from the
+    state before the oldest kept step instead of the start of the game.
+    """
+
+    def __init__(self, max_steps: Optional[int] = None):
+        """
+        Args:
+            max_steps: Steps kept for undo (defaults to config.UNDO_MAX_STEPS; 0 keeps all)
+        """
+        self.max_steps = config.UNDO_MAX_STEPS if max_steps is None else max_steps
+        self.done = CowList()
+        self.undone: List[Step] = []
+        # Number of oldest steps dropped to stay within max_steps
+        self.trimmed = 0
+        self._open: Optional[Step] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a step is being recorded."""
+        return self._open is not None
+
+    def begin(self, action: str, week: int):
+        """Start recording the changes of an action."""
+        self._open = Step(action, week)
+
+    def record(self, event):
+        """Log a change that was just applied."""
+        self._open.events.append(event)
+
+    def commit(self):
+        """Close the open step; a new step discards the redo history."""
+        step, self._open = self._open, None
+        if step.events:
+            self.done.append(step)
+            self.undone.clear()
+            self._trim()
+
+    def _trim(self):
+        """Drop the oldest steps beyond max_steps."""
+        if self.max_steps and len(self.done) > self.max_steps:
+            excess = len(self.done) - self.max_steps
+            del self.done[:excess]
+            self.trimmed += excess
+
+    def abort(self, state: GameState, pending: List[Dict]):
+        """Revert the changes of the open step and drop it (the action failed)."""
+        step, self._open = self._open, None
+        for event in reversed(step.events):
+            event.revert(state, pending)
+
+    @property
+    def can_undo(self) -> bool:
+        # The start of the game is the first step until it is trimmed
+        return len(self.done) > (0 if self.trimmed else 1)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.undone)
+
+    def undo(self, state: GameState, pending: List[Dict]) -> Optional[Step]:
+        """Revert the last step; None if there is nothing to undo."""
+        if not self.can_undo:
+            return None
+        step = self.done.pop()
+        for event in reversed(step.events):
+            event.revert(state, pending)
+        self.undone.append(step)
+        return step
+
+    def redo(self, state: GameState, pending: List[Dict]) -> Optional[Step]:
+        """Apply the last undone step again; None if there is nothing to redo."""
+        if not self.undone:
+            return None
+        step = self.undone.pop()
+        for event in step.events:
+            event.apply(state, pending)
+        self.done.append(step)
+        return step
+
+    def replay(self, state: GameState, pending: List[Dict]):
+        """Apply every logged step, in order, to an initial state and pending list."""
+        for step in self.done:
+            for event in step.events:
+                event.apply(state, pending)
+
+    def rewind(self, state: GameState, pending: List[Dict]):
+        """Revert every logged step, newest first, leaving the state before the oldest kept step."""
+        for step in reversed(self.done):
+            for event in reversed(step.events):
+                event.revert(state, pending)
+
+    def fork(self) -> 'GameLog':
+        """Branch the log; the done steps are shared copy-on-write."""
+        other = GameLog(self.max_steps)
+        other.done = self.done.fork()
+        other.undone = list(self.undone)
+        other.trimmed = self.trimmed
+        return other
+
+    def to_dict(self) -> Dict:
+        """Get the log as JSON-compatible data."""
+        return {
+            "done": [step.to_dict() for step in self.done],
+            "undone": [step.to_dict() for step in self.undone],
+            "trimmed": self.trimmed
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'GameLog':
+        """
+        Rebuild a log from its dictionary form (see to_dict).
+
+        Raises:
+            ValueError: If a change record is unknown
+        """
+        log = cls()
+        log.done = CowList(Step.from_dict(step) for step in data.get("done", []))
+        log.undone = [Step.from_dict(step) for step in data.get("undone", [])][-log.max_steps or None:]
+        log.trimmed = data.get("trimmed", 0)
+        log._trim()
+        return log
@@ -1,7 +1,20 @@
 """Game state models for the simulation."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional
 from enum import Enum
+import sys
+from .cow_list import CowList
+
+# Slot-based dataclasses where supported (Python 3.10+) for hot-path objects
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+MATURITY_DIMENSIONS = (
+    "agent_development",
+    "agent_operations",
+    "data_platforms",
+    "security",
+    "governance"
+)
 
 
 class DecisionCategory(Enum):
@@ -43,7 +56,7 @@ class MaturityMetrics:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Decision:
     """Represents a decision point in the game."""
     id: str
@@ -55,7 +68,7 @@ class Decision:
     completed: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DecisionOption:
     """Represents an option for a decision."""
     id: str
@@ -86,11 +99,12 @@ class GameState:
     resources: int
     current_week: int
     maturity: MaturityMetrics
-    decisions_made: List[Dict] = field(default_factory=list)
-    events: List[GameEvent] = field(default_factory=list)
+    decisions_made: List[Dict] = field(default_factory=CowList)
+    events: List[GameEvent] = field(default_factory=CowList)
     is_production: bool = False
     production_week: Optional[int] = None
     production_issues: List[str] = field(default_factory=list)
+    reputation: int = 100
     game_over: bool = False
     
     def to_dict(self) -> Dict:
@@ -101,7 +115,7 @@ class GameState:
             "resources": self.resources,
             "current_week": self.current_week,
             "maturity": self.maturity.to_dict(),
-            "decisions_made": self.decisions_made,
+            "decisions_made": list(self.decisions_made),
             "events": [
                 {
                     "week": e.week,
@@ -112,6 +126,41 @@ class GameState:
             ],
             "is_production": self.is_production,
             "production_week": self.production_week,
-            "production_issues": self.production_issues,
+            "production_issues": list(self.production_issues),
+            "reputation": self.reputation,
             "game_over": self.game_over
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'GameState':
+        """Rebuild a game state from its dictionary form (see to_dict)."""
+        return cls(
+            budget=data["budget"],
+            time_remaining_weeks=data["time_remaining_weeks"],
+            resources=data["resources"],
+            current_week=data["current_week"],
+            maturity=MaturityMetrics(**data["maturity"]),
+            decisions_made=CowList(data.get("decisions_made", [])),
+            events=CowList(GameEvent(**e) for e in data.get("events", [])),
+            is_production=data.get("is_production", False),
+            production_week=data.get("production_week"),
+            production_issues=list(data.get("production_issues", [])),
+            reputation=data.get("reputation", 100),
+            game_over=data.get("game_over", False)
+        )
+    
+    def fork(self) -> 'GameState':
+        """
+        Branch the game state.
+        
+        The decision and event histories are shared copy-on-write (see
+        CowList), so a fork costs O(1) in the length of the game and each
+        branch only pays for what it changes.
+        """
+        return replace(
+            self,
+            maturity=replace(self.maturity),
+            decisions_made=self.decisions_made.fork(),
+            events=self.events.fork(),
+            production_issues=list(self.production_issues)
+        )
@@ -0,0 +1,146 @@
+"""Validation schemas for scenarios and decision options.
+
+Scenarios arrive from the API, PDF imports and LLM output. They are
+validated and normalized once, at ingest, so the game logic can rely on
+every field being present and well-typed.
+"""
+from typing import Dict, List, Tuple
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from .game_state import DecisionCategory, DecisionOption
+
+
+class SchemaError(ValueError):
+    """Raised when data fails validation; `errors` lists the field errors."""
+
+    def __init__(self, errors: List[Dict]):
+        self.errors = errors
+        summary = "; ".join(f"{e['field']}: {e['message']}" for e in errors[:5])
+        if len(errors) > 5:
+            summary += f" (and {len(errors) - 5} more)"
+        super().__init__(summary)
+
+
+class MaturityImpactSchema(BaseModel):
+    """Maturity change per capability; unknown capabilities are rejected."""
+    model_config = ConfigDict(extra='forbid')
+
+    agent_development: int = Field(0, ge=-100, le=100)
+    agent_operations: int = Field(0, ge=-100, le=100)
+    data_platforms: int = Field(0, ge=-100, le=100)
+    security: int = Field(0, ge=-100, le=100)
+    governance: int = Field(0, ge=-100, le=100)
+
+
+class OptionSchema(BaseModel):
+    """A decision option."""
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=True)
+
+    id: str = Field(min_length=1)
+    text: str = Field(min_length=1)
+    cost: int = Field(ge=0)
+    time_weeks: int = Field(1, ge=0, le=52)
+    resources_required: int = Field(0, ge=0)
+    maturity_impact: MaturityImpactSchema = Field(default_factory=MaturityImpactSchema)
+    immediate_impact: bool = True
+    delayed_impact_weeks: int = Field(0, ge=0, le=52)
+    consequences: str = ""
+
+
+class ScenarioSchema(BaseModel):
+    """A decision scenario with its options."""
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=True, use_enum_values=True)
+
+    id: str = Field(min_length=1)
+    title: str = Field(min_length=1)
+    description: str = ""
+    category: DecisionCategory = Field(DecisionCategory.STRATEGIC, validate_default=True)
+    week_available: int = Field(0, ge=0)
+    options: List[OptionSchema] = Field(min_length=1)
+
+
+# Compiled once; reused for every validation
+_scenario_list_adapter = TypeAdapter(List[ScenarioSchema])
+
+
+def _format_errors(errors: List[Dict], skip: int = 0) -> List[Dict]:
+    """Flatten pydantic errors into {field, message} dictionaries."""
+    return [
+        {
+            'field': ".".join(str(part) for part in e['loc'][skip:]) or "(root)",
+            'message': e['msg']
+        }
+        for e in errors
+    ]
+
+
+def validate_scenario(data: Dict) -> Dict:
+    """
+    Validate and normalize a single scenario.
+
+    Returns:
+        The normalized scenario dictionary
+
+    Raises:
+        SchemaError: If the scenario is invalid
+    """
+    try:
+        return ScenarioSchema.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise SchemaError(_format_errors(e.errors()))
+
+
+def validate_scenarios(batch: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Validate a batch of scenarios in one pass.
+
+    Returns:
+        Tuple of (normalized valid scenarios, errors). Each error holds the
+        `index` and `id` of the rejected scenario and its field `errors`.
+    """
+    try:
+        models = _scenario_list_adapter.validate_python(batch)
+        return [m.model_dump() for m in models], []
+    except ValidationError as e:
+        failures: Dict[int, List] = {}
+        for err in e.errors():
+            if err['loc'] and isinstance(err['loc'][0], int):
+                failures.setdefault(err['loc'][0], []).append(err)
+            else:
+                raise SchemaError(_format_errors(e.errors()))
+
+    errors = []
+    for index in sorted(failures):
+        item = batch[index]
+        errors.append({
+            'index': index,
+            'id': item.get('id') if isinstance(item, dict) else None,
+            'errors': _format_errors(failures[index], skip=1)
+        })
+
+    remaining = [item for i, item in enumerate(batch) if i not in failures]
+    models = _scenario_list_adapter.validate_python(remaining)
+    return [m.model_dump() for m in models], errors
+
+
+def to_decision_option(data: Dict) -> DecisionOption:
+    """
+    Validate an option dictionary into a slot-based DecisionOption.
+
+    Raises:
+        SchemaError: If the option is invalid
+    """
+    try:
+        option = OptionSchema.model_validate(data)
+    except ValidationError as e:
+        raise SchemaError(_format_errors(e.errors()))
+    return DecisionOption(
+        id=option.id,
+        text=option.text,
+        cost=option.cost,
+        time_weeks=option.time_weeks,
+        resources_required=option.resources_required,
+        maturity_impact=option.maturity_impact.model_dump(),
+        immediate_impact=option.immediate_impact,
+        delayed_impact_weeks=option.delayed_impact_weeks,
+        consequences=option.consequences
+    )
@@ -0,0 +1,138 @@
+"""Precomputed option value index for ranking predefined decisions."""
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import heapq
+import config
+from models import MATURITY_DIMENSIONS
+
+
+METRICS = ("dollar", "week", "resource")
+
+# Per-dollar values are expressed per this many dollars to keep scores readable
+DOLLAR_UNIT = 100000
+
+
+class OptionValue(NamedTuple):
+    """Value vectors of one option: maturity gain per dollar, per week and per resource."""
+    scenario_pos: int
+    scenario_id: str
+    option_id: str
+    week_available: int
+    cost: int
+    time_weeks: int
+    resources_required: int
+    per_dollar: Tuple[float, ...]
+    per_week: Tuple[float, ...]
+    per_resource: Tuple[float, ...]
+
+    def values(self, metric: str) -> Tuple[float, ...]:
+        """Get the value vector for a metric."""
+        if metric == "week":
+            return self.per_week
+        if metric == "resource":
+            return self.per_resource
+        return self.per_dollar
+
+
+def option_value(scenario_pos: int, scenario: Dict, option: Dict) -> OptionValue:
+    """Compute the value vectors of an option of a (validated) scenario."""
+    impact = tuple(option['maturity_impact'].get(d, 0) for d in MATURITY_DIMENSIONS)
+    cost = option['cost']
+    weeks = option['time_weeks']
+    resources = option['resources_required']
+    return OptionValue(
+        scenario_pos=scenario_pos,
+        scenario_id=scenario['id'],
+        option_id=option['id'],
+        week_available=scenario.get('week_available', 0),
+        cost=cost,
+        time_weeks=weeks,
+        resources_required=resources,
+        per_dollar=tuple(v * DOLLAR_UNIT / max(cost, 1) for v in impact),
+        per_week=tuple(v / max(weeks, 1) for v in impact),
+        per_resource=tuple(v / max(resources, 1) for v in impact)
+    )
+
+
+def gap_weights(maturity: Dict[str, int], ready_threshold: Optional[int] = None) -> Tuple[float, ...]:
+    """Weight each capability by how far it is below the production-ready threshold."""
+    threshold = config.PRODUCTION_READY_THRESHOLD if ready_threshold is None else ready_threshold
+    return tuple(
+        max(0, threshold - maturity.get(d, 0)) / threshold
+        for d in MATURITY_DIMENSIONS
+    )
+
+
+class OptionValueIndex:
+    """
+    Ranking index over option value vectors.
+
+    For every metric and capability the options are kept sorted by value.
+    Ranking walks the lists of the capabilities with a gap in parallel
+    (Fagin's threshold algorithm) and stops as soon as no unseen option can
+    beat the current top results, so typically only the first few entries
+    of each list are touched, whatever the catalog size.
+    """
+
+    def __init__(self, scenarios: List[Dict]):
+        """Build the index over a list of validated scenarios."""
+        self.entries: List[OptionValue] = [
+            option_value(position, scenario, option)
+            for position, scenario in enumerate(scenarios)
+            for option in scenario.get('options', [])
+        ]
+        self._sorted: Dict[str, List[List[OptionValue]]] = {
+            metric: [
+                sorted(self.entries, key=lambda e, m=metric, d=d: -e.values(m)[d])
+                for d in range(len(MATURITY_DIMENSIONS))
+            ]
+            for metric in METRICS
+        }
+
+    def rank(self, weights: Tuple[float, ...], accept: Callable[[OptionValue], bool],
+             limit: int = 3, metric: str = "dollar") -> List[Tuple[float, OptionValue]]:
+        """
+        Get the best option of the top `limit` scenarios.
+
+        Args:
+            weights: Non-negative weight per capability (see gap_weights)
+            accept: Filter for options the player can actually take
+            limit: Number of scenarios to return
+            metric: "dollar", "week" or "resource"
+
+        Returns:
+            List of (score, option value), best first; only positive scores
+        """
+        dims = [d for d, w in enumerate(weights) if w > 0]
+        if not dims or not self.entries:
+            return []
+        lists = [self._sorted[metric][d] for d in dims]
+
+        seen: Set[int] = set()  # ids of entries already scored
+        best: Dict[int, Tuple[float, OptionValue]] = {}
+        kth_score = None
+        for depth in range(len(self.entries)):
+            threshold = 0.0
+            changed = False
+            for d, ordered in zip(dims, lists):
+                entry = ordered[depth]
+                values = entry.values(metric)
+                threshold += weights[d] * values[d]
+                if id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                if not accept(entry):
+                    continue
+                score = sum(weights[i] * values[i] for i in dims)
+                current = best.get(entry.scenario_pos)
+                if score > 0 and (current is None or score > current[0]):
+                    best[entry.scenario_pos] = (score, entry)
+                    changed = True
+
+            if changed and len(best) >= limit:
+                kth_score = heapq.nlargest(limit, (s for s, _ in best.values()))[-1]
+            # Nothing unseen can score above the threshold
+            if threshold <= 0 or (kth_score is not None and kth_score >= threshold):
+                break
+
+        ranked = sorted(best.values(), key=lambda item: -item[0])
+        return ranked[:limit]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep: how game outcomes respond to the game parameters.
+
+Samples the starting budget, time and resources and the readiness
+thresholds on a grid or a Latin hypercube, plays a batch of games with a
+policy at every sample point (in parallel, with the offline agent) and
+reports how strongly each outcome moves with each parameter.
+
+Every point plays the same seeds, so the differences between points come
+from the parameters rather than from luck.
+
+Usage:
+    python parameter_sweep.py --design lhs --samples 64 --games 200
+    python parameter_sweep.py --design grid --levels 3 --params initial_budget production_ready_threshold
+"""
+from itertools import product
+from typing import Dict, Iterator, List, Sequence, Tuple
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from agents import OfflineDecisionAgent
+from batch_runner import POLICIES, play_game
+from models import GameConfig
+from scenario_manager import ScenarioManager
+
+# Default sampling range of each parameter (inclusive)
+PARAMETER_RANGES: Dict[str, Tuple[int, int]] = {
+    "initial_budget": (250000, 2000000),
+    "initial_time_weeks": (26, 104),
+    "initial_resources": (3, 20),
+    "production_ready_threshold": (40, 80),
+    "minimum_acceptable_threshold": (20, 60),
+}
+
+# Game summary fields averaged over the games of a point
+OUTCOMES = ("score", "average_maturity", "reputation", "spent", "weeks", "decisions")
+
+
+def grid_points(ranges: Dict[str, Tuple[int, int]], levels: int) -> List[Dict[str, int]]:
+    """Get every combination of `levels` evenly spaced values per parameter."""
+    axes = [
+        sorted({round(low + (high - low) * i / max(levels - 1, 1)) for i in range(levels)})
+        for low, high in ranges.values()
+    ]
+    return [dict(zip(ranges, values)) for values in product(*axes)]
+
+
+def latin_hypercube(ranges: Dict[str, Tuple[int, int]], samples: int, rng: random.Random) -> List[Dict[str, int]]:
+    """
+    Get a Latin hypercube sample: each parameter's range is split into
+    `samples` equal strata and every stratum is used exactly once.
+    """
+    columns = {}
+    for name, (low, high) in ranges.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        columns[name] = [round(low + (high - low) * (s + rng.random()) / samples) for s in strata]
+    return [{name: columns[name][i] for name in ranges} for i in range(samples)]
+
+
+def to_game_config(point: Dict[str, int]) -> GameConfig:
+    """Build the game parameters of a point; the minimum threshold is capped at the ready threshold."""
+    values = dict(GameConfig.defaults().to_dict(), **point)
+    values["minimum_acceptable_threshold"] = min(values["minimum_acceptable_threshold"],
+                                                 values["production_ready_threshold"])
+    return GameConfig.from_dict(values)
+
+
+def linear_fit(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """Get the (slope, correlation) of the least-squares line through the points."""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    if sxx == 0:
+        return 0.0, 0.0
+    return sxy / sxx, (sxy / math.sqrt(sxx * syy) if syy else 0.0)
+
+
+def sensitivities(results: List[Dict], ranges: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Measure how each outcome moves with each swept parameter.
+
+    Returns:
+        Per parameter and outcome: the `correlation` and the `effect`, the
+        change in the outcome across the parameter's whole range on the
+        fitted line
+    """
+    report = {}
+    for name, (low, high) in ranges.items():
+        xs = [result["parameters"][name] for result in results]
+        report[name] = {}
+        for outcome in OUTCOMES:
+            slope, correlation = linear_fit(xs, [result["outcomes"][outcome] for result in results])
+            report[name][outcome] = {
+                "correlation": round(correlation, 3),
+                "effect": round(slope * (high - low), 2)
+            }
+    return report
+
+
+# Per-process state of pool workers
+_worker: Dict = {}
+
+
+def _init_worker(scenarios_file: str, policy_name: str, metric: str, games: int, seed: int):
+    """Load the scenarios and create the offline agent once per worker process."""
+    _worker.update(
+        scenarios=ScenarioManager(scenarios_file).get_all_scenarios(),
+        agent=OfflineDecisionAgent(),
+        policy=policy_name,
+        metric=metric,
+        seeds=range(seed, seed + games)
+    )
+
+
+def _run_point(task: Tuple[int, Dict[str, int]]) -> Dict:
+    """Play the games of one sample point in a worker process."""
+    index, point = task
+    game_config = to_game_config(point)
+    totals = dict.fromkeys(OUTCOMES, 0.0)
+    for seed in _worker["seeds"]:
+        summary = play_game(seed, _worker["policy"], _worker["scenarios"], _worker["agent"],
+                            metric=_worker["metric"], game_config=game_config)
+        for outcome in OUTCOMES:
+            totals[outcome] += summary[outcome]
+    games = len(_worker["seeds"])
+    return {
+        "index": index,
+        "parameters": game_config.to_dict(),
+        "games": games,
+        "outcomes": {outcome: round(total / games, 3) for outcome, total in totals.items()}
+    }
+
+
+def run_sweep(points: List[Dict[str, int]], games: int, policy_name: str = "greedy", metric: str = "gain",
+              workers: int = 1, seed: int = 0, scenarios_file: str = "scenarios.json") -> Iterator[Dict]:
+    """Play `games` games at every point and yield each point's mean outcomes as it finishes."""
+    for point in points:
+        to_game_config(point)  # fail fast on invalid parameters
+    initargs = (scenarios_file, policy_name, metric, games, seed)
+    tasks = list(enumerate(points))
+    if workers <= 1:
+        _init_worker(*initargs)
+        yield from map(_run_point, tasks)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.imap_unordered(_run_point, tasks)
+
+
+def parse_range(text: str) -> Tuple[str, Tuple[int, int]]:
+    """Parse a NAME=LOW:HIGH range override."""
+    try:
+        name, bounds = text.split("=")
+        low, high = (int(value) for value in bounds.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected NAME=LOW:HIGH, got '{text}'")
+    if name not in PARAMETER_RANGES or low > high:
+        raise argparse.ArgumentTypeError(f"Invalid range '{text}'")
+    return name, (low, high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--design", choices=["grid", "lhs"], default="lhs", help="sampling design")
+    parser.add_argument("--levels", type=int, default=3, help="values per parameter (grid)")
+    parser.add_argument("--samples", type=int, default=32, help="sample points (lhs)")
+    parser.add_argument("--params", nargs="+", choices=sorted(PARAMETER_RANGES), default=sorted(PARAMETER_RANGES),
+                        help="parameters to vary (the others keep their configured values)")
+    parser.add_argument("--range", type=parse_range, action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="override a parameter's sampling range")
+    parser.add_argument("--games", type=int, default=200, help="games per sample point")
+    parser.add_argument("--policy", choices=sorted(set(POLICIES) - {"scripted"}), default="greedy",
+                        help="policy playing the games")
+    parser.add_argument("--metric", default="gain", help="greedy policy value: gain, dollar, week or resource")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the sample and of the first game")
+    parser.add_argument("--scenarios", default="scenarios.json", help="scenarios file")
+    parser.add_argument("--output", help="also write each point's outcomes to this NDJSON file")
+    args = parser.parse_args()
+
+    ranges = dict(PARAMETER_RANGES, **dict(args.range))
+    ranges = {name: ranges[name] for name in args.params}
+    if args.design == "grid":
+        points = grid_points(ranges, args.levels)
+    else:
+        points = latin_hypercube(ranges, args.samples, random.Random(args.seed))
+
+    out = open(args.output, "w") if args.output else None
+    results = []
+    start = time.monotonic()
+    try:
+        for result in run_sweep(points, args.games, args.policy, args.metric, args.workers, args.seed, args.scenarios):
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+            print(f"\r{len(results)}/{len(points)} points", end="", file=sys.stderr)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.monotonic() - start
+    print(file=sys.stderr)
+
+    print(json.dumps({
+        "design": args.design,
+        "points": len(results),
+        "games_per_point": args.games,
+        "seconds": round(elapsed, 2),
+        "games_per_second": round(len(results) * args.games / elapsed, 1) if elapsed > 0 else None,
+        "ranges": ranges,
+        "sensitivity": sensitivities(results, ranges)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,138 +1,137 @@
 """PDF Scenario Parser - Extracts game scenarios from PDF documents using AI."""
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
-import PyPDF2
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+import io
 import json
+import multiprocessing
+import os
+import threading
 import config
-from typing import List, Dict
-import io
+from agents.model_clients import model_clients
+from agents.prompts import PDF_SCENARIOS, generate, parse_json_response
+
+# Scenario generation needs at least this much document text
+MIN_PDF_TEXT_CHARS = 100
+
+
+def extract_pdf_text(data: bytes, max_pages: int = 0) -> str:
+    """
+    Extract the text of a PDF (runs in the extraction worker processes).
+    
+    Args:
+        data: PDF file content
+        max_pages: Pages read from the start of the document (0 for all)
+    """
+    import PyPDF2
+    
+    pages = PyPDF2.PdfReader(io.BytesIO(data)).pages
+    if max_pages > 0:
+        pages = islice(pages, max_pages)
+    return "\n".join(page.extract_text() for page in pages).strip()
 
 
 class PDFScenarioParser:
-    """Parses PDF documents and extracts game scenarios using AI."""
+    """
+    Parses PDF documents and extracts game scenarios using AI.
+    
+    Page extraction is CPU-bound pure Python that holds the GIL, so it runs
+    in a pool of worker processes: a large upload no longer stalls the
+    other requests of the web process, and a batch of files is extracted
+    in parallel.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, max_pages: Optional[int] = None):
+        """Initialize the PDF parser.
+
+        PyPDF2 is imported lazily, on the first upload; the model client
+        comes from the process-wide registry shared with the decision agent.
+        
+        Args:
+            workers: Extraction processes (defaults to config.PDF_WORKERS;
+                0 extracts in the calling thread)
+            max_pages: Pages read per file (defaults to config.PDF_MAX_PAGES; 0 for all)
+        """
+        self.workers = config.PDF_WORKERS if workers is None else workers
+        self.max_pages = config.PDF_MAX_PAGES if max_pages is None else max_pages
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid = os.getpid()
+    
+    @property
+    def model(self):
+        """Shared Gemini model client."""
+        return model_clients.model()
     
-    def __init__(self):
-        """Initialize the PDF parser with Vertex AI."""
-        if config.PROJECT_ID:
-            vertexai.init(project=config.PROJECT_ID, location=config.LOCATION)
-        self.model = GenerativeModel(config.MODEL_NAME)
-        self.generation_config = GenerationConfig(
-            temperature=0.5,
-            top_p=0.9,
-            max_output_tokens=4096,
-        )
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Get the extraction process pool, starting it on first use (and again in a forked child)."""
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    # Spawned, not forked: the web process runs threads that a fork would copy mid-flight
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+                    self._pid = os.getpid()
+        return self._executor
+    
+    def _submit(self, data: bytes) -> Future:
+        """Start extracting the text of a PDF."""
+        if self.workers > 0:
+            return self.executor.submit(extract_pdf_text, data, self.max_pages)
+        future: Future = Future()
+        try:
+            future.set_result(extract_pdf_text(data, self.max_pages))
+        except Exception as e:
+            future.set_exception(e)
+        return future
     
     def extract_text_from_pdf(self, pdf_file) -> str:
         """Extract text content from PDF file."""
         try:
             # Read PDF from file object or bytes
-            if isinstance(pdf_file, bytes):
-                pdf_file = io.BytesIO(pdf_file)
-            
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            
-            # Extract text from all pages
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text.strip()
+            data = pdf_file if isinstance(pdf_file, bytes) else pdf_file.read()
+            return self._submit(data).result()
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
             raise
     
+    def extract_texts(self, files: List[Tuple[str, bytes]]) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+        """
+        Extract the text of several PDFs in parallel.
+        
+        Args:
+            files: (name, content) pairs
+        
+        Returns:
+            (name, text, error) per file, in the order extraction finishes;
+            the text is None if extraction failed
+        """
+        futures = {self._submit(data): name for name, data in files}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                print(f"Error extracting PDF text from '{futures[future]}': {e}")
+                yield futures[future], None, e
+    
     def generate_scenarios_from_text(self, pdf_text: str) -> List[Dict]:
         """Use AI to generate game scenarios from PDF text."""
-        prompt = f"""You are an AI that extracts game scenarios from documents about enterprise multi-agent platform development.
-
-Given the following document content, extract or generate realistic decision scenarios for a simulation game where players build an enterprise multi-agent platform.
-
-Document Content:
-{pdf_text[:10000]}  # Limit to first 10000 chars to avoid token limits
-
-Generate 3-5 realistic decision scenarios based on the document content. Each scenario should:
-1. Be relevant to enterprise multi-agent platform development
-2. Have 2-3 options with different trade-offs (cost, time, maturity impact)
-3. Include clear consequences for each option
-4. Focus on one of these categories: development, operations, data, security, governance
-
-Return your response as a JSON array with this EXACT structure:
-[
-  {{
-    "id": "unique_scenario_id",
-    "title": "Decision Title",
-    "description": "Detailed description of the scenario",
-    "category": "development|operations|data|security|governance",
-    "week_available": 1,
-    "options": [
-      {{
-        "id": "option1_id",
-        "text": "Option description explaining what this choice involves",
-        "cost": 50000,
-        "time_weeks": 4,
-        "resources_required": 2,
-        "maturity_impact": {{
-          "agent_development": 10,
-          "agent_operations": 5,
-          "data_platforms": 0,
-          "security": 0,
-          "governance": 0
-        }},
-        "immediate_impact": true,
-        "delayed_impact_weeks": 0,
-        "consequences": "What happens if you choose this option"
-      }},
-      {{
-        "id": "option2_id",
-        "text": "Alternative option description",
-        "cost": 100000,
-        "time_weeks": 6,
-        "resources_required": 3,
-        "maturity_impact": {{
-          "agent_development": 20,
-          "agent_operations": 10,
-          "data_platforms": 5,
-          "security": 5,
-          "governance": 5
-        }},
-        "immediate_impact": false,
-        "delayed_impact_weeks": 3,
-        "consequences": "What happens if you choose this alternative"
-      }}
-    ]
-  }}
-]
-
-Rules:
-- cost: Between 5,000 and 200,000 (realistic enterprise costs)
-- time_weeks: Between 1 and 12 weeks
-- resources_required: Between 1 and 6 team members
-- maturity_impact: Values between -20 and +40 for each capability
-- week_available: Between 1 and 30
-- Make scenarios realistic and educational about multi-agent platforms
-
-Only return valid JSON, no additional text."""
+        # Only the start of long documents is sent, to stay within token limits
+        prompt = PDF_SCENARIOS.render(document=pdf_text[:10000])
 
         try:
-            response = self.model.generate_content(
+            response = generate(
+                self.model,
+                PDF_SCENARIOS,
                 prompt,
-                generation_config=self.generation_config
+                generation_config=model_clients.generation_config(PDF_SCENARIOS.name)
             )
             
-            # Parse JSON response
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            scenarios = json.loads(response_text.strip())
+            response_text = response.text
+            scenarios = parse_json_response(response_text)
+            if not isinstance(scenarios, list):
+                raise ValueError("Failed to parse AI response. The AI did not return a JSON array of scenarios.")
             return scenarios
-            
         except json.JSONDecodeError as e:
             print(f"Error parsing AI response as JSON: {e}")
             print(f"Response text: {response_text[:500]}")
@@ -155,7 +154,7 @@ Only return valid JSON, no additional text."""
         print("Extracting text from PDF...")
         pdf_text = self.extract_text_from_pdf(pdf_file)
         
-        if not pdf_text or len(pdf_text) < 100:
+        if not pdf_text or len(pdf_text) < MIN_PDF_TEXT_CHARS:
             raise ValueError("PDF appears to be empty or contains insufficient text")
         
         # Step 2: Generate scenarios using AI
@@ -164,3 +163,27 @@ Only return valid JSON, no additional text."""
         
         print(f"Successfully generated {len(scenarios)} scenarios from PDF")
         return scenarios
+    
+    def parse_pdfs_to_scenarios(self, files: List[Tuple[str, bytes]]) -> Iterator[Dict]:
+        """
+        Extract text from several PDFs in parallel and generate scenarios
+        from each one as soon as its text is ready.
+        
+        Args:
+            files: (name, content) pairs
+        
+        Returns:
+            One result per file, in the order they finish: {"file", "scenarios"}
+            or {"file", "error"}
+        """
+        for name, text, error in self.extract_texts(files):
+            if error is not None:
+                yield {"file": name, "error": f"Could not read PDF: {error}"}
+                continue
+            if len(text) < MIN_PDF_TEXT_CHARS:
+                yield {"file": name, "error": "PDF appears to be empty or contains insufficient text"}
+                continue
+            try:
+                yield {"file": name, "scenarios": self.generate_scenarios_from_text(text)}
+            except Exception as e:
+                yield {"file": name, "error": str(e)}
@@ -0,0 +1,174 @@
+"""Table-driven simulation of the production period after launch."""
+from typing import Dict, List, Optional, Tuple
+import math
+import random
+import config
+from models import GameEvent
+
+
+# One row per capability: what goes wrong in production when it is immature
+PRODUCTION_ISSUES = {
+    "agent_development": {
+        "title": "Agent Development Issues",
+        "description": "Agents are experiencing frequent errors due to inadequate development practices.",
+        "cost": 50000,
+        "reputation": 10
+    },
+    "agent_operations": {
+        "title": "Operational Issues",
+        "description": "Poor monitoring and operations leading to downtime and performance problems.",
+        "cost": 75000,
+        "reputation": 15
+    },
+    "data_platforms": {
+        "title": "Data Platform Issues",
+        "description": "Data quality and availability issues causing agent failures.",
+        "cost": 60000,
+        "reputation": 12
+    },
+    "security": {
+        "title": "Security Breach",
+        "description": "Security vulnerabilities exploited, requiring immediate response.",
+        "cost": 150000,
+        "reputation": 25
+    },
+    "governance": {
+        "title": "Governance and Compliance Issues",
+        "description": "Lack of governance causing compliance violations and audit failures.",
+        "cost": 100000,
+        "reputation": 20
+    }
+}
+
+
+class ProductionSimulator:
+    """Simulates production incidents week by week from the maturity profile."""
+
+    def __init__(self, issues: Optional[Dict[str, Dict]] = None,
+                 ready_threshold: Optional[int] = None, minimum_threshold: Optional[int] = None,
+                 weekly_probability: Optional[Dict[str, float]] = None,
+                 min_weeks: Optional[int] = None):
+        """
+        Initialize the simulator with an issue table and thresholds.
+
+        Args:
+            issues: Incident per capability (defaults to PRODUCTION_ISSUES)
+            ready_threshold: Maturity at which a capability causes no incidents
+            minimum_threshold: Maturity below which its incidents are Critical
+            weekly_probability: Incident chance per week by severity
+            min_weeks: Fewest weeks of production to simulate
+
+        Omitted values default to config.
+        """
+        self.issues = issues or PRODUCTION_ISSUES
+        self.ready_threshold = config.PRODUCTION_READY_THRESHOLD if ready_threshold is None else ready_threshold
+        self.minimum_threshold = config.MINIMUM_ACCEPTABLE_THRESHOLD if minimum_threshold is None else minimum_threshold
+        self.weekly_probability = weekly_probability or config.PRODUCTION_INCIDENT_WEEKLY_PROBABILITY
+        self.min_weeks = config.MIN_PRODUCTION_WEEKS if min_weeks is None else min_weeks
+
+    def production_weeks(self, time_remaining_weeks: int) -> int:
+        """Get the number of weeks to simulate for the remaining time."""
+        return max(time_remaining_weeks, self.min_weeks)
+
+    def weekly_risks(self, maturity: Dict[str, int]) -> List[Tuple[str, str, float]]:
+        """Get (capability, severity, weekly probability) for each immature capability."""
+        risks = []
+        for capability in self.issues:
+            level = maturity.get(capability, 0)
+            if level >= self.ready_threshold:
+                continue
+            severity = "Critical" if level < self.minimum_threshold else "Major"
+            risks.append((capability, severity, self.weekly_probability[severity]))
+        return risks
+
+    def simulate(self, maturity: Dict[str, int], start_week: int, weeks: int,
+                 rng: Optional[random.Random] = None) -> List[GameEvent]:
+        """
+        Run the production period week by week and return its incidents.
+
+        Each incident is dated with the week it happens in; its `impact`
+        holds the negative cost and reputation change.
+        """
+        rng = rng or random
+        risks = self.weekly_risks(maturity)
+        incidents = []
+        for week in range(start_week + 1, start_week + weeks + 1):
+            for capability, severity, probability in risks:
+                if rng.random() < probability:
+                    issue = self.issues[capability]
+                    incidents.append(GameEvent(
+                        week=week,
+                        title=f"{severity}: {issue['title']}",
+                        description=issue['description'],
+                        impact={"cost": -issue['cost'], "reputation": -issue['reputation']}
+                    ))
+        return incidents
+
+    def forecast(self, maturity: Dict[str, int], weeks: int, runs: int = 1000,
+                 rng: Optional[random.Random] = None) -> Dict:
+        """
+        Monte Carlo forecast of production cost and reputation loss.
+
+        Instead of drawing every week, each run jumps straight from one
+        incident to the next with a geometric draw, so a run costs
+        O(incidents) rather than O(weeks x capabilities).
+
+        Returns:
+            Percentiles of cost and reputation loss, plus the chance of at
+            least one incident per immature capability.
+        """
+        rng = rng or random
+        risks = self.weekly_risks(maturity)
+        costs = []
+        reputation_losses = []
+        hit_counts = {capability: 0 for capability, _, _ in risks}
+
+        for _ in range(runs):
+            cost = 0
+            reputation = 0
+            for capability, _, probability in risks:
+                log_miss = math.log(1.0 - probability)
+                count = 0
+                week = 0
+                while True:
+                    week += int(math.log(1.0 - rng.random()) / log_miss) + 1
+                    if week > weeks:
+                        break
+                    count += 1
+                if count:
+                    issue = self.issues[capability]
+                    cost += count * issue['cost']
+                    reputation += count * issue['reputation']
+                    hit_counts[capability] += 1
+            costs.append(cost)
+            reputation_losses.append(reputation)
+
+        return {
+            "runs": runs,
+            "weeks": weeks,
+            "cost": _summarize(costs),
+            "reputation_loss": _summarize(reputation_losses),
+            "incident_probability": {
+                capability: hits / runs for capability, hits in hit_counts.items()
+            },
+            "risks": [
+                {"capability": capability, "severity": severity, "weekly_probability": probability}
+                for capability, severity, probability in risks
+            ]
+        }
+
+
+def _summarize(values: List[int]) -> Dict[str, float]:
+    """Summarize a sample as mean, min, max and 10/50/90th percentiles."""
+    if not values:
+        return {"mean": 0, "min": 0, "p10": 0, "p50": 0, "p90": 0, "max": 0}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "min": ordered[0],
+        "p10": ordered[int(last * 0.1)],
+        "p50": ordered[int(last * 0.5)],
+        "p90": ordered[int(last * 0.9)],
+        "max": ordered[-1]
+    }
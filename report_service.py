@@ -0,0 +1,109 @@
+"""Background generation of final game reports."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+import hashlib
+import json
+import time
+import uuid
+
+# (minimum score, grade), best first
+GRADES = ((95, "A+"), (85, "A"), (70, "B"), (55, "C"), (40, "D"), (0, "F"))
+
+
+def score_game(game_state: Dict) -> Dict:
+    """
+    Score a game locally, without the AI.
+
+    The score is the average maturity, reduced in proportion to the
+    reputation lost in production.
+
+    Returns:
+        Dictionary with `overall_score` (0-100) and `grade`
+    """
+    maturity = game_state['maturity']
+    score = sum(maturity.values()) / len(maturity)
+    if game_state.get('is_production'):
+        score *= 0.75 + 0.25 * game_state.get('reputation', 100) / 100
+    overall_score = int(round(score))
+    grade = next(grade for minimum, grade in GRADES if overall_score >= minimum)
+    return {"overall_score": overall_score, "grade": grade}
+
+
+def state_fingerprint(game_state: Dict) -> str:
+    """Fingerprint of a final game state, used to reuse its report."""
+    return hashlib.sha1(json.dumps(game_state, sort_keys=True).encode()).hexdigest()
+
+
+class ReportService:
+    """
+    Generates final reports on a thread pool and stores them in the game session.
+
+    A report handle {id, status, ...} is kept on the session's engine
+    (`final_report`), so it is persisted with the session and any worker
+    can answer a poll for it. Status goes from "pending" to "ready" (with
+    the `report`) when generation finishes.
+    """
+
+    def __init__(self, sessions, max_workers: int = 2):
+        """
+        Args:
+            sessions: Session store holding the game engines
+            max_workers: Reports generated concurrently
+        """
+        self.sessions = sessions
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+
+    def request(self, session_id: str, engine, game_state: Dict) -> Dict:
+        """
+        Get the report handle for a final game state, starting generation if needed.
+
+        Must be called while the session is checked out. A finished or
+        pending report for the same final state is reused.
+
+        Returns:
+            The report handle
+        """
+        fingerprint = state_fingerprint(game_state)
+        handle = engine.final_report
+        if handle and handle.get('fingerprint') == fingerprint and handle['status'] != 'failed':
+            return handle
+
+        handle = engine.final_report = {
+            'id': uuid.uuid4().hex,
+            'status': 'pending',
+            'fingerprint': fingerprint,
+            'requested_at': time.time()
+        }
+        self._executor.submit(self._generate, session_id, handle['id'], engine.generate_final_report, game_state)
+        return handle
+
+    def _generate(self, session_id: str, report_id: str, generate: Callable, game_state: Dict):
+        """Generate a report and store it in the session (worker thread)."""
+        try:
+            update = {'status': 'ready', 'report': generate(game_state)}
+        except Exception as e:
+            print(f"Error generating final report: {e}")
+            update = {'status': 'failed', 'error': str(e)}
+
+        with self.sessions.session(session_id) as engine:
+            # The game may have been restarted meanwhile
+            if engine.final_report and engine.final_report.get('id') == report_id:
+                engine.final_report = dict(engine.final_report, completed_at=time.time(), **update)
+
+    def get(self, session_id: str, report_id: str, wait: float = 0) -> Dict:
+        """
+        Get a report handle, waiting up to `wait` seconds for it to finish.
+
+        Raises:
+            KeyError: If the session has no report with this id
+        """
+        deadline = time.monotonic() + wait
+        delay = 0.05
+        while True:
+            handle = self.sessions.peek(session_id).final_report
+            if not handle or handle.get('id') != report_id:
+                raise KeyError(report_id)
+            if handle['status'] != 'pending' or time.monotonic() >= deadline:
+                return handle
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
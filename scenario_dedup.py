@@ -0,0 +1,182 @@
+"""Near-duplicate scenario detection with MinHash signatures and LSH."""
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+import re
+import zlib
+
+
+_WORD = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+# Offset added when an empty bin borrows from a neighbour (densification)
+_ROTATION = 0x9E3779B97F4A7C15
+
+
+def scenario_text(scenario: Dict) -> str:
+    """Get the text that identifies a scenario: title, description and options."""
+    parts = [scenario.get('title', ''), scenario.get('description', '')]
+    for option in scenario.get('options', []):
+        parts.append(option.get('text', ''))
+        parts.append(option.get('consequences', ''))
+    return " ".join(parts)
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures of word shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once and lands in
+    one of `num_perm` bins, keeping the minimum per bin. Empty bins borrow
+    from their next non-empty neighbour. A signature therefore costs
+    O(shingles) rather than O(shingles x num_perm).
+    """
+
+    def __init__(self, num_perm: int = 120, shingle_size: int = 3):
+        """Initialize the hasher."""
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> Set[int]:
+        """
+        Get the hashed word shingles of a text.
+
+        Words are hashed once with CRC-32 and each shingle is hashed as a
+        tuple of those integers, which is fast and, unlike hashing strings,
+        stable across processes.
+        """
+        words = [zlib.crc32(word.encode()) for word in _WORD.findall(text.lower())]
+        size = min(self.shingle_size, len(words)) or 1
+        return {
+            hash(shingle) & _MASK64
+            for shingle in zip(*(words[i:] for i in range(size)))
+        }
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """Get the MinHash signature of a text (None if it has no words to compare)."""
+        num_perm = self.num_perm
+        # Within a bin the rank grows with the hash value, so assigning in
+        # descending order leaves the minimum rank in every bin
+        minima = {value % num_perm: value // num_perm for value in sorted(self.shingles(text), reverse=True)}
+        bins: List[Optional[int]] = [minima.get(i) for i in range(num_perm)]
+
+        filled = [i for i, v in enumerate(bins) if v is not None]
+        if not filled:
+            return None
+        if len(filled) < self.num_perm:
+            # Densify: each empty bin borrows from the next filled bin (wrapping),
+            # offset by the distance so borrowed values rarely collide by chance
+            dense = list(bins)
+            next_filled = filled[0] + self.num_perm
+            for i in range(self.num_perm - 1, -1, -1):
+                if bins[i] is not None:
+                    next_filled = i
+                    continue
+                distance = next_filled - i
+                dense[i] = (bins[next_filled % self.num_perm] + distance * _ROTATION) & _MASK64
+            bins = dense
+        return tuple(bins)
+
+
+def estimate_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def _band_probability(similarity: float, bands: int, rows: int) -> float:
+    """Probability that two items of this similarity share at least one band."""
+    return 1.0 - (1.0 - similarity ** rows) ** bands
+
+
+def lsh_parameters(num_perm: int, threshold: float, steps: int = 50) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) for the threshold.
+
+    Minimizes the weighted area of false positives below the threshold and
+    false negatives above it under the LSH S-curve (numerically integrated).
+    Missed duplicates weigh more than extra candidates, which are cheap to
+    reject with the similarity estimate.
+    """
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        false_positive = sum(
+            _band_probability(threshold * (i + 0.5) / steps, bands, rows)
+            for i in range(steps)
+        ) * threshold / steps
+        false_negative = sum(
+            1.0 - _band_probability(threshold + (1 - threshold) * (i + 0.5) / steps, bands, rows)
+            for i in range(steps)
+        ) * (1 - threshold) / steps
+        error = 0.1 * false_positive + 0.9 * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures.
+
+    Signatures are split into bands; two items become candidates when any
+    band matches exactly, so a query only looks at its own buckets instead
+    of every indexed item. Candidates are then confirmed with the estimated
+    similarity.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 120, shingle_size: int = 3):
+        """Initialize an empty index."""
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_parameters(num_perm, threshold)
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, scenario: Dict) -> Optional[Tuple[int, ...]]:
+        """Get the MinHash signature of a scenario (None if it has no text)."""
+        return self.hasher.signature(scenario_text(scenario))
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows]
+
+    def add(self, key: Hashable, signature: Optional[Tuple[int, ...]]):
+        """Index a signature under `key` (replacing any previous one); items without a signature are not indexed."""
+        self.remove(key)
+        if signature is None:
+            return
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove `key` from the index if present."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def query(self, signature: Optional[Tuple[int, ...]]) -> List[Tuple[Hashable, float]]:
+        """Get (key, similarity) of indexed items at or above the threshold, best first."""
+        if signature is None:
+            return []
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_similarity(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
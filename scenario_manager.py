@@ -1,23 +1,108 @@
 """Scenario manager for adding and managing game scenarios."""
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
 import os
+import tempfile
+import threading
+import config
+from catalog_index import CatalogIndex
+from models.schemas import ScenarioSchema, validate_scenario, validate_scenarios
+from option_index import OptionValueIndex, gap_weights
+from scenario_dedup import NearDuplicateIndex
 
 
 class ScenarioManager:
     """Manages game scenarios and decision templates."""
     
-    def __init__(self, scenarios_file: str = "scenarios.json"):
-        """Initialize the scenario manager."""
+    def __init__(self, scenarios_file: str = "scenarios.json",
+                 dedup_threshold: Optional[float] = None, dedup_mode: Optional[str] = None):
+        """
+        Initialize the scenario manager.
+        
+        Args:
+            scenarios_file: JSON file the scenarios are stored in
+            dedup_threshold: Similarity at which an incoming scenario counts as
+                a near-duplicate (defaults to config.DEDUP_SIMILARITY_THRESHOLD)
+            dedup_mode: "reject" or "merge" near-duplicates, or "off"
+                (defaults to config.DEDUP_MODE)
+        """
         self.scenarios_file = scenarios_file
+        self.dedup_threshold = config.DEDUP_SIMILARITY_THRESHOLD if dedup_threshold is None else dedup_threshold
+        self.dedup_mode = config.DEDUP_MODE if dedup_mode is None else dedup_mode
+        self._lock = threading.RLock()
+        # Bumped on every change to the scenarios
+        self.version = 0
+        self._file_version = self._stat_file()
         self.scenarios = self._load_scenarios()
+        self._rebuild_indexes()
+    
+    def _rebuild_indexes(self):
+        """Rebuild the near-duplicate index over all scenarios."""
+        self.dedup_index = NearDuplicateIndex(self.dedup_threshold)
+        for position, scenario in enumerate(self.scenarios):
+            self.dedup_index.add(position, self.dedup_index.signature(scenario))
+        self._changed()
+    
+    def _changed(self):
+        """Invalidate derived data after the scenarios changed."""
+        self._option_index = None
+        self._catalog_index = None
+        self.version += 1
+    
+    @property
+    def option_index(self) -> OptionValueIndex:
+        """Option value index, rebuilt on first use after scenarios change."""
+        with self._lock:
+            if self._option_index is None:
+                self._option_index = OptionValueIndex(self.scenarios)
+            return self._option_index
+    
+    @property
+    def catalog_index(self) -> CatalogIndex:
+        """Listing index, rebuilt on first use after scenarios change."""
+        with self._lock:
+            if self._catalog_index is None:
+                self._catalog_index = CatalogIndex(self.scenarios)
+            return self._catalog_index
+    
+    def _stat_file(self):
+        """Get (mtime, size) of the scenarios file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.scenarios_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def refresh(self) -> bool:
+        """
+        Reload the scenarios if the file was saved by another process.
+        
+        Worker processes each hold their own copy of the catalog; this is a
+        single stat call when nothing changed.
+        
+        Returns:
+            True if the scenarios were reloaded
+        """
+        version = self._stat_file()
+        if version == self._file_version:
+            return False
+        with self._lock:
+            if version == self._file_version:
+                return False
+            self._file_version = version
+            self.scenarios = self._load_scenarios()
+            self._rebuild_indexes()
+        return True
     
     def _load_scenarios(self) -> List[Dict]:
         """Load scenarios from file."""
         if os.path.exists(self.scenarios_file):
             try:
                 with open(self.scenarios_file, 'r') as f:
-                    return json.load(f)
+                    scenarios, errors = validate_scenarios(json.load(f))
+                for error in errors:
+                    print(f"Skipping invalid scenario {error['id'] or error['index']}: {error['errors']}")
+                return scenarios
             except Exception as e:
                 print(f"Error loading scenarios: {e}")
         return self._get_default_scenarios()
@@ -277,26 +362,261 @@ class ScenarioManager:
         ]
     
     def save_scenarios(self) -> bool:
-        """Save scenarios to file."""
+        """
+        Save scenarios to file.
+        
+        Writes to a temporary file in the same directory, fsyncs it and
+        renames it over the scenarios file, so a crash never leaves a
+        truncated file behind.
+        """
+        tmp_path = None
         try:
-            with open(self.scenarios_file, 'w') as f:
-                json.dump(self.scenarios, f, indent=2)
+            directory = os.path.dirname(os.path.abspath(self.scenarios_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".scenarios-", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                # One scenario per line: readable, and encoded by the C encoder
+                # (json.dump with indent falls back to the slow Python one)
+                f.write("[\n")
+                f.write(",\n".join(json.dumps(scenario) for scenario in self.scenarios))
+                f.write("\n]\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.scenarios_file)
+            self._file_version = self._stat_file()
             return True
         except Exception as e:
             print(f"Error saving scenarios: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
     
+    def _ingest(self, scenario: Dict) -> Dict:
+        """
+        Add a validated scenario unless it near-duplicates an existing one.
+        
+        In "merge" mode the options of a near-duplicate that are new (by id
+        and text) are appended to the existing scenario instead.
+        """
+        signature = self.dedup_index.signature(scenario)
+        if self.dedup_mode != 'off':
+            matches = self.dedup_index.query(signature)
+            if matches:
+                position, similarity = matches[0]
+                existing = self.scenarios[position]
+                result = {
+                    'status': 'duplicate',
+                    'id': scenario['id'],
+                    'duplicate_of': existing['id'],
+                    'similarity': round(similarity, 3)
+                }
+                if self.dedup_mode == 'merge':
+                    known = {o['id'] for o in existing['options']} | {o['text'] for o in existing['options']}
+                    new_options = [
+                        o for o in scenario['options']
+                        if o['id'] not in known and o['text'] not in known
+                    ]
+                    if new_options:
+                        existing['options'].extend(new_options)
+                        self.dedup_index.add(position, self.dedup_index.signature(existing))
+                        self._changed()
+                        result['status'] = 'merged'
+                        result['options_added'] = len(new_options)
+                return result
+        
+        self.scenarios.append(scenario)
+        self.dedup_index.add(len(self.scenarios) - 1, signature)
+        self._changed()
+        return {'status': 'added', 'id': scenario['id']}
+    
+    def _rollback_point(self) -> List[int]:
+        """Record the catalog before ingesting (caller holds the lock); see _save_or_rollback."""
+        return [len(scenario['options']) for scenario in self.scenarios]
+    
+    def _save_or_rollback(self, point: List[int]) -> bool:
+        """
+        Save the scenarios; if the save fails, drop the scenarios and merged
+        options ingested since `point`, so the catalog never serves data that
+        was not stored.
+        """
+        if self.save_scenarios():
+            return True
+        del self.scenarios[len(point):]
+        for scenario, option_count in zip(self.scenarios, point):
+            del scenario['options'][option_count:]
+        self._rebuild_indexes()
+        return False
+    
+    def ingest_scenario(self, scenario: Dict) -> Dict:
+        """
+        Validate a scenario, check it for near-duplicates and store it.
+        
+        Returns:
+            Dictionary with the `status` ("added", "merged" or "duplicate"),
+            the scenario `id`, `duplicate_of`/`similarity` for near-duplicates
+            and whether the scenarios file was `saved`
+        
+        Raises:
+            SchemaError: If the scenario fails validation
+        """
+        scenario = validate_scenario(scenario)
+        with self._lock:
+            self.refresh()
+            point = self._rollback_point()
+            result = self._ingest(scenario)
+            result['saved'] = self._save_or_rollback(point) if result['status'] != 'duplicate' else True
+        return result
+    
     def add_scenario(self, scenario: Dict) -> bool:
-        """Add a new scenario."""
-        try:
-            self.scenarios.append(scenario)
-            return self.save_scenarios()
-        except Exception as e:
-            print(f"Error adding scenario: {e}")
-            return False
+        """
+        Validate and add a new scenario.
+        
+        Returns:
+            True if the scenario was stored (added or merged into a
+            near-duplicate), False if it was rejected or could not be saved
+        
+        Raises:
+            SchemaError: If the scenario fails validation
+        """
+        result = self.ingest_scenario(scenario)
+        return result['status'] != 'duplicate' and result['saved']
+    
+    def add_scenarios(self, scenarios: List[Dict]) -> Dict:
+        """
+        Validate a batch of scenarios and add the valid ones with a single save.
+        
+        Near-duplicates are checked against the stored scenarios and against
+        earlier scenarios of the same batch.
+        
+        Returns:
+            Dictionary with the normalized `scenarios` that were added, the
+            counts `added` and `merged`, the near-`duplicates`, the
+            per-scenario validation `errors`, and whether the save succeeded
+            (`saved`; if not, nothing was added or merged)
+        """
+        valid, errors = validate_scenarios(scenarios)
+        added = []
+        merged = 0
+        duplicates = []
+        with self._lock:
+            self.refresh()
+            point = self._rollback_point()
+            for scenario in valid:
+                result = self._ingest(scenario)
+                if result['status'] == 'added':
+                    added.append(scenario)
+                else:
+                    merged += result['status'] == 'merged'
+                    duplicates.append(result)
+            
+            saved = self._save_or_rollback(point) if added or merged else True
+            if not saved:
+                added, merged = [], 0
+        return {
+            'scenarios': added,
+            'added': len(added),
+            'merged': merged,
+            'duplicates': duplicates,
+            'errors': errors,
+            'saved': saved
+        }
+    
+    def import_ndjson(self, lines: Iterable, batch_size: int = 500, max_reported: int = 1000) -> Dict:
+        """
+        Import scenarios from newline-delimited JSON, one scenario per line.
+        
+        Lines are consumed one at a time and validated in batches while the
+        upload is read, without holding the catalog lock, so a slow upload
+        never blocks other requests. The valid scenarios are then checked
+        for near-duplicates and committed with a single durable save.
+        
+        Args:
+            lines: Iterable of lines (bytes or str)
+            batch_size: Number of records validated together
+            max_reported: Cap on the errors and duplicates listed in the result
+        
+        Returns:
+            Dictionary with the number of `lines` read, the counts `added`,
+            `merged`, `duplicate_count` and `error_count`, the per-line
+            `errors` and `duplicates` (up to max_reported each), and whether
+            the save succeeded (`saved`; if not, nothing was added or merged)
+        """
+        summary = {
+            'lines': 0,
+            'added': 0,
+            'merged': 0,
+            'duplicate_count': 0,
+            'error_count': 0,
+            'duplicates': [],
+            'errors': []
+        }
+        
+        def report(kind: str, count_key: str, entry: Dict):
+            summary[count_key] += 1
+            if len(summary[kind]) < max_reported:
+                summary[kind].append(entry)
+        
+        # (line number, normalized scenario) of every valid record
+        accepted: List[Tuple[int, Dict]] = []
+        
+        def flush(records: List[Dict], line_numbers: List[int]):
+            valid, errors = validate_scenarios(records)
+            for error in errors:
+                report('errors', 'error_count', {
+                    'line': line_numbers[error['index']],
+                    'id': error['id'],
+                    'errors': error['errors']
+                })
+            rejected = {error['index'] for error in errors}
+            valid_lines = [n for i, n in enumerate(line_numbers) if i not in rejected]
+            accepted.extend(zip(valid_lines, valid))
+        
+        records: List[Dict] = []
+        line_numbers: List[int] = []
+        for line_number, line in enumerate(lines, 1):
+            summary['lines'] = line_number
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='replace')
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                report('errors', 'error_count', {
+                    'line': line_number,
+                    'id': None,
+                    'errors': [{'field': '(root)', 'message': f'Invalid JSON: {e}'}]
+                })
+                continue
+            records.append(record)
+            line_numbers.append(line_number)
+            if len(records) >= batch_size:
+                flush(records, line_numbers)
+                records, line_numbers = [], []
+        if records:
+            flush(records, line_numbers)
+        
+        with self._lock:
+            self.refresh()
+            point = self._rollback_point()
+            for line_number, scenario in accepted:
+                result = self._ingest(scenario)
+                if result['status'] == 'added':
+                    summary['added'] += 1
+                else:
+                    summary['merged'] += result['status'] == 'merged'
+                    result['line'] = line_number
+                    report('duplicates', 'duplicate_count', result)
+            
+            summary['saved'] = self._save_or_rollback(point) if summary['added'] or summary['merged'] else True
+            if not summary['saved']:
+                summary['added'] = summary['merged'] = 0
+        return summary
     
     def get_scenario(self, scenario_id: str) -> Dict:
         """Get a specific scenario by ID."""
+        self.refresh()
         for scenario in self.scenarios:
             if scenario['id'] == scenario_id:
                 return scenario
@@ -304,8 +624,90 @@ class ScenarioManager:
     
     def get_all_scenarios(self) -> List[Dict]:
         """Get all scenarios."""
+        self.refresh()
         return self.scenarios
     
+    def query_scenarios(self, category: Optional[str] = None, week_min: Optional[int] = None,
+                        week_max: Optional[int] = None, cursor: Optional[str] = None,
+                        limit: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict:
+        """
+        Get one page of scenarios, ordered by week available and then catalog order.
+        
+        Args:
+            category: Only scenarios of this category
+            week_min: Only scenarios available from this week on
+            week_max: Only scenarios available by this week
+            cursor: `next_cursor` of the previous page
+            limit: Page size (defaults to config.SCENARIO_PAGE_SIZE, capped at
+                config.SCENARIO_PAGE_MAX)
+            fields: Only include these scenario fields
+        
+        Returns:
+            Dictionary with the `scenarios`, the `total` number of matches
+            and the `next_cursor` (None on the last page)
+        
+        Raises:
+            ValueError: If a field, the cursor or the limit is invalid
+        """
+        limit = config.SCENARIO_PAGE_SIZE if limit is None else limit
+        if not 1 <= limit <= config.SCENARIO_PAGE_MAX:
+            raise ValueError(f"Limit must be between 1 and {config.SCENARIO_PAGE_MAX}")
+        unknown = [field for field in fields or [] if field not in ScenarioSchema.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        
+        self.refresh()
+        with self._lock:
+            page = self.catalog_index.page(category, week_min, week_max, cursor, limit)
+            scenarios = [self.scenarios[position] for position in page.pop('positions')]
+        if fields:
+            scenarios = [{field: s[field] for field in fields if field in s} for s in scenarios]
+        page['scenarios'] = scenarios
+        return page
+    
     def get_scenarios_for_week(self, week: int) -> List[Dict]:
         """Get scenarios available for a specific week."""
+        self.refresh()
         return [s for s in self.scenarios if s.get('week_available', 0) <= week]
+    
+    def rank_scenarios(self, game_state: Dict, limit: int = 3, metric: str = "dollar",
+                       ready_threshold: Optional[int] = None) -> List[Dict]:
+        """
+        Get the predefined scenarios that best address the current maturity gaps.
+        
+        Only scenarios that are available this week, have not been decided
+        yet (by the `scenario_id` recorded with each decision) and have an option the player can afford (budget, resources and
+        time) are considered. Each option is scored by its maturity gain per
+        dollar (or per week/resource), weighted by how far each capability is
+        below the production-ready threshold.
+        
+        Args:
+            ready_threshold: Production-ready threshold of the game (defaults to config)
+        
+        Returns:
+            Up to `limit` scenarios, best first, each annotated with the
+            `recommended_option` id and its `relevance` score
+        """
+        self.refresh()
+        index = self.option_index
+        week = game_state['current_week']
+        budget = game_state['budget']
+        resources = game_state['resources']
+        time_remaining = game_state['time_remaining_weeks']
+        # Option ids repeat across scenarios, so decisions are matched by scenario id
+        decided = {decision.get('scenario_id') for decision in game_state.get('decisions_made', [])}
+        
+        def accept(entry) -> bool:
+            return (
+                entry.week_available <= week
+                and entry.cost <= budget
+                and entry.resources_required <= resources
+                and entry.time_weeks <= time_remaining
+                and entry.scenario_id not in decided
+            )
+        
+        ranked = index.rank(gap_weights(game_state['maturity'], ready_threshold), accept, limit, metric)
+        return [
+            dict(self.scenarios[entry.scenario_pos], recommended_option=entry.option_id, relevance=round(score, 3))
+            for score, entry in ranked
+        ]
@@ -0,0 +1,401 @@
+"""Game session stores: one game engine state per session id."""
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from memory_accounting import engine_size
+
+
+class SessionBusyError(RuntimeError):
+    """Raised when a session stays locked by another request for too long."""
+
+
+class SessionStore:
+    """
+    Base class for session stores.
+
+    `session` checks out a session's engine for exclusive use (one request
+    at a time per session) and persists any changes when the block exits
+    normally. `peek` loads an engine for read-only use without locking.
+    """
+
+    def __init__(self, engine_factory: Callable):
+        """
+        Args:
+            engine_factory: Creates an empty GameEngine
+        """
+        self.engine_factory = engine_factory
+
+    def session(self, session_id: str):
+        """Context manager yielding the session's engine, locked for this request."""
+        raise NotImplementedError
+
+    def peek(self, session_id: str):
+        """Get the session's engine for reading; changes are not saved."""
+        raise NotImplementedError
+
+    def state_tag(self, session_id: str) -> Optional[str]:
+        """
+        Get a tag that changes whenever the session's state may have changed
+        (None for unknown sessions), without loading the state.
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        """Remove a session."""
+        raise NotImplementedError
+
+    def memory_usage(self, limit: int = 20) -> Dict:
+        """Get the approximate size of the sessions, heaviest first."""
+        raise NotImplementedError
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Sessions kept as live engines in this process (single worker only).
+
+    The approximate memory of each session is measured after every request
+    that checks it out. A session above `session_limit` bytes, and the least
+    recently used idle sessions while the total is above `memory_limit`,
+    are spilled to `spill_dir` (reloaded on their next request) or, with
+    overflow="evict", dropped.
+    """
+
+    def __init__(self, engine_factory: Callable, memory_limit: int = 0, session_limit: int = 0,
+                 overflow: str = "spill", spill_dir: str = "session_spill"):
+        """
+        Args:
+            engine_factory: Creates an empty GameEngine
+            memory_limit: Cap on the total bytes of resident sessions (0: none)
+            session_limit: Cap on the bytes of one resident session (0: none)
+            overflow: "spill" to disk or "evict" sessions above the caps
+            spill_dir: Directory for spilled sessions
+        """
+        super().__init__(engine_factory)
+        if overflow not in ("spill", "evict"):
+            raise ValueError(f"Unknown session overflow policy '{overflow}' (expected 'spill' or 'evict')")
+        self.memory_limit = memory_limit
+        self.session_limit = session_limit
+        self.overflow = overflow
+        self.spill_dir = spill_dir
+        self._lock = threading.Lock()
+        # Least recently used first
+        self._engines: "OrderedDict[str, object]" = OrderedDict()
+        self._session_locks: Dict[str, threading.Lock] = {}
+        self._sizes: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._total = 0
+        # State tags: a per-store epoch and a counter bumped on every checkout
+        self._epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        self._version_counter = itertools.count(1)
+        self.spilled = 0
+        self.evicted = 0
+
+    def _spill_path(self, session_id: str) -> str:
+        name = hashlib.sha1(session_id.encode()).hexdigest()
+        return os.path.join(self.spill_dir, f"{name}.json")
+
+    def _engine(self, session_id: str, create: bool = True):
+        """Get the resident engine and lock of a session, reloading it if it was spilled."""
+        with self._lock:
+            engine = self._engines.get(session_id)
+            if engine is None:
+                engine = self._unspill(session_id)
+                if engine is None:
+                    if not create:
+                        return None, None
+                    engine = self.engine_factory()
+                self._engines[session_id] = engine
+                self._session_locks[session_id] = threading.Lock()
+                self._sizes[session_id] = 0
+                self._versions[session_id] = next(self._version_counter)
+            self._engines.move_to_end(session_id)
+            self._last_used[session_id] = time.time()
+            return engine, self._session_locks[session_id]
+
+    def _unspill(self, session_id: str):
+        """Load a spilled session back into an engine (None if it was not spilled)."""
+        path = self._spill_path(session_id)
+        try:
+            with open(path, 'r') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error loading spilled session '{session_id}': {e}")
+            return None
+        os.remove(path)
+        engine = self.engine_factory()
+        engine.restore(snapshot)
+        return engine
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator:
+        while True:
+            engine, lock = self._engine(session_id)
+            with lock:
+                # The session may have been spilled while we waited for it
+                if self._engines.get(session_id) is not engine:
+                    continue
+                try:
+                    yield engine
+                finally:
+                    self._account(session_id, engine)
+            break
+        self._enforce_limits()
+
+    def _account(self, session_id: str, engine):
+        """Re-measure a session after a request."""
+        size = engine_size(engine)
+        with self._lock:
+            if session_id in self._versions:
+                self._versions[session_id] = next(self._version_counter)
+            if session_id in self._sizes:
+                self._total += size - self._sizes[session_id]
+                self._sizes[session_id] = size
+
+    def _enforce_limits(self):
+        """Spill or evict sessions above the per-session or total caps."""
+        with self._lock:
+            over = []
+            if self.session_limit:
+                over = [sid for sid, size in self._sizes.items() if size > self.session_limit]
+            total = self._total - sum(self._sizes[sid] for sid in over)
+            if self.memory_limit and total > self.memory_limit:
+                for sid in self._engines:
+                    if total <= self.memory_limit:
+                        break
+                    if sid not in over:
+                        over.append(sid)
+                        total -= self._sizes[sid]
+            for sid in over:
+                # Sessions in use are left alone; they are checked again after their request
+                if not self._session_locks[sid].locked():
+                    self._remove(sid, spill=self.overflow == "spill")
+
+    def _remove(self, session_id: str, spill: bool = False, count_eviction: bool = True):
+        """
+        Drop a resident session (caller holds the store lock), spilling it first if asked.
+
+        Args:
+            count_eviction: Count a session that is dropped without spilling as evicted
+        """
+        engine = self._engines.pop(session_id)
+        self._session_locks.pop(session_id)
+        self._last_used.pop(session_id, None)
+        self._versions.pop(session_id, None)
+        self._total -= self._sizes.pop(session_id)
+        if spill and engine.game_state is not None:
+            try:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                with open(self._spill_path(session_id), 'w') as f:
+                    json.dump(engine.snapshot(), f)
+                self.spilled += 1
+                return
+            except (OSError, TypeError) as e:
+                print(f"Error spilling session '{session_id}', evicting it: {e}")
+        if count_eviction:
+            self.evicted += 1
+
+    def peek(self, session_id: str):
+        engine = self._engine(session_id, create=False)[0]
+        return engine if engine is not None else self.engine_factory()
+
+    def state_tag(self, session_id: str) -> Optional[str]:
+        version = self._versions.get(session_id)
+        if version is None:
+            # Not resident; reloading a spilled session assigns a fresh version
+            if self._engine(session_id, create=False)[0] is None:
+                return None
+            version = self._versions.get(session_id)
+        return f"{self._epoch}.{version}"
+
+    def delete(self, session_id: str):
+        with self._lock:
+            if session_id in self._engines:
+                self._remove(session_id, count_eviction=False)
+        try:
+            os.remove(self._spill_path(session_id))
+        except OSError:
+            pass
+
+    def memory_usage(self, limit: int = 20) -> Dict:
+        with self._lock:
+            heaviest = sorted(self._sizes.items(), key=lambda item: -item[1])[:limit]
+            return {
+                'store': 'memory',
+                'resident_sessions': len(self._engines),
+                'total_bytes': self._total,
+                'memory_limit_bytes': self.memory_limit,
+                'session_limit_bytes': self.session_limit,
+                'overflow': self.overflow,
+                'spilled': self.spilled,
+                'evicted': self.evicted,
+                'sessions': [
+                    {'session_id': sid, 'bytes': size, 'last_used': self._last_used.get(sid)}
+                    for sid, size in heaviest
+                ]
+            }
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions persisted in a local SQLite database shared by all worker processes.
+
+    Each request restores the engine from the stored snapshot and writes it
+    back when done. Sessions are locked individually with a lease on their
+    row: a request takes the lease with one conditional UPDATE and waits
+    (polling) while another request holds it, so requests for different
+    sessions never wait on each other. A lease that is not released (a
+    crashed worker) expires after `lease_seconds`.
+    """
+
+    def __init__(self, engine_factory: Callable, path: str = "sessions.db",
+                 lease_seconds: float = 120.0, wait_seconds: float = 30.0):
+        """
+        Args:
+            engine_factory: Creates an empty GameEngine
+            path: SQLite database file
+            lease_seconds: How long a session lock is held at most
+            wait_seconds: How long to wait for a locked session before giving up
+        """
+        super().__init__(engine_factory)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id TEXT PRIMARY KEY,"
+                " state TEXT,"
+                " version INTEGER NOT NULL DEFAULT 0,"
+                " lock_owner TEXT,"
+                " lock_expires REAL NOT NULL DEFAULT 0,"
+                " updated_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection (connections are not shared between threads or processes)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.wait_seconds)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _acquire(self, session_id: str) -> str:
+        """Take the session's lease, waiting while another request holds it."""
+        conn = self._connection()
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.001
+        while True:
+            now = time.time()
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO sessions (id) VALUES (?)", (session_id,))
+                acquired = conn.execute(
+                    "UPDATE sessions SET lock_owner = ?, lock_expires = ? WHERE id = ? AND lock_expires < ?",
+                    (owner, now + self.lease_seconds, session_id, now)
+                ).rowcount
+            if acquired:
+                return owner
+            if time.monotonic() >= deadline:
+                raise SessionBusyError(f"Session '{session_id}' is busy, try again")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def _load(self, session_id: str):
+        """Build an engine from the stored snapshot (an empty engine if there is none)."""
+        engine = self.engine_factory()
+        row = self._connection().execute(
+            "SELECT state FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row and row[0]:
+            engine.restore(json.loads(row[0]))
+        return engine
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator:
+        owner = self._acquire(session_id)
+        conn = self._connection()
+        state = None
+        try:
+            engine = self._load(session_id)
+            yield engine
+            if engine.game_state is not None:
+                state = json.dumps(engine.snapshot())
+        finally:
+            with conn:
+                if state is None:
+                    # Failed request or no game: keep the stored state, just release
+                    conn.execute(
+                        "UPDATE sessions SET lock_owner = NULL, lock_expires = 0 WHERE id = ? AND lock_owner = ?",
+                        (session_id, owner)
+                    )
+                    conn.execute("DELETE FROM sessions WHERE id = ? AND state IS NULL", (session_id,))
+                else:
+                    saved = conn.execute(
+                        "UPDATE sessions SET state = ?, version = version + 1, updated_at = ?,"
+                        " lock_owner = NULL, lock_expires = 0 WHERE id = ? AND lock_owner = ?",
+                        (state, time.time(), session_id, owner)
+                    ).rowcount
+                    if not saved:
+                        print(f"Session '{session_id}' lease expired; changes were not saved")
+
+    def peek(self, session_id: str):
+        return self._load(session_id)
+
+    def state_tag(self, session_id: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT version, updated_at FROM sessions WHERE id = ? AND state IS NOT NULL", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return f"{row[0]}.{int(row[1] * 1e6):x}"
+
+    def delete(self, session_id: str):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def memory_usage(self, limit: int = 20) -> Dict:
+        # Sessions are not resident between requests; report their stored size
+        conn = self._connection()
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(state)), 0) FROM sessions WHERE state IS NOT NULL"
+        ).fetchone()
+        rows = conn.execute(
+            "SELECT id, LENGTH(state), updated_at FROM sessions WHERE state IS NOT NULL"
+            " ORDER BY LENGTH(state) DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return {
+            'store': 'sqlite',
+            'stored_sessions': count,
+            'total_bytes': total,
+            'sessions': [
+                {'session_id': sid, 'bytes': size, 'last_used': updated_at}
+                for sid, size, updated_at in rows
+            ]
+        }
+
+
+def create_session_store(kind: str, engine_factory: Callable, path: Optional[str] = None,
+                         lease_seconds: float = 120.0, wait_seconds: float = 30.0,
+                         memory_limit: int = 0, session_limit: int = 0,
+                         overflow: str = "spill", spill_dir: str = "session_spill") -> SessionStore:
+    """Create a "memory" or "sqlite" session store."""
+    if kind == "memory":
+        return InMemorySessionStore(engine_factory, memory_limit, session_limit, overflow, spill_dir)
+    if kind == "sqlite":
+        return SQLiteSessionStore(engine_factory, path or "sessions.db", lease_seconds, wait_seconds)
+    raise ValueError(f"Unknown session store '{kind}' (expected 'memory' or 'sqlite')")
@@ -0,0 +1,45 @@
+"""Shared fixtures for the simulator tests."""
+import pytest
+import config
+from agents.offline_agent import OfflineDecisionAgent
+from game_engine import GameEngine
+
+
+@pytest.fixture
+def engine_factory():
+    """Create engines that use the offline agent (no model calls)."""
+    agent = OfflineDecisionAgent()
+    return lambda: GameEngine(agent)
+
+
+@pytest.fixture
+def engine(engine_factory):
+    """An engine with a freshly started, seeded game."""
+    engine = engine_factory()
+    engine.rng.seed(7)
+    engine.start_new_game()
+    return engine
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The web application with the offline agent, keeping all its files under tmp_path."""
+    from app import create_app
+    from scenario_manager import ScenarioManager
+    monkeypatch.setattr(config, "SESSION_DB_FILE", str(tmp_path / "sessions.db"))
+    monkeypatch.setattr(config, "SESSION_SPILL_DIR", str(tmp_path / "session_spill"))
+    monkeypatch.setattr(config, "READINESS_CACHE_FILE", str(tmp_path / "readiness_cache.db"))
+    monkeypatch.setattr(config, "ANALYTICS_DB_FILE", str(tmp_path / "analytics.db"))
+    app = create_app()
+    services = app.extensions['simulator']
+    services._decision_agent = OfflineDecisionAgent()
+    services._scenario_manager = ScenarioManager(str(tmp_path / "scenarios.json"))
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """A test client playing the session "test"."""
+    client = app.test_client()
+    client.environ_base["HTTP_X_SESSION_ID"] = "test"
+    return client
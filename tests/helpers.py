@@ -0,0 +1,17 @@
+"""Builders shared by the simulator tests."""
+import random
+from models.game_state import MATURITY_DIMENSIONS
+
+
+def make_option(rng: random.Random, index: int) -> dict:
+    """Build a random, valid decision option."""
+    return {
+        "id": f"opt_{index}",
+        "text": f"Option {index}",
+        "cost": rng.randint(0, 40000),
+        "time_weeks": rng.randint(0, 4),
+        "resources_required": 0,
+        "maturity_impact": {dimension: rng.randint(-5, 20) for dimension in rng.sample(MATURITY_DIMENSIONS, 3)},
+        "immediate_impact": rng.random() < 0.5,
+        "delayed_impact_weeks": rng.randint(1, 6)
+    }
@@ -0,0 +1,84 @@
+"""Tests for the cross-game analytics store and its endpoints."""
+import random
+import statistics
+import pytest
+import config
+from analytics import AnalyticsStore, game_summary, histogram_bucket
+from models import MATURITY_DIMENSIONS
+from report_service import score_game
+
+
+def random_state(rng: random.Random) -> dict:
+    return {
+        "maturity": {d: rng.randint(0, 100) for d in MATURITY_DIMENSIONS},
+        "budget": rng.randint(0, config.INITIAL_BUDGET),
+        "current_week": rng.randint(1, 52),
+        "decisions_made": [{"option_id": rng.choice("abcde")} for _ in range(rng.randint(0, 4))],
+        "is_production": rng.random() < 0.5,
+        "reputation": rng.randint(0, 100)
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnalyticsStore(str(tmp_path / "analytics.db"))
+
+
+def test_stats_match_the_games(store):
+    rng = random.Random(3)
+    summaries = [game_summary(state, score_game(state)) for state in (random_state(rng) for _ in range(40))]
+    for index, summary in enumerate(summaries):
+        assert store.record(f"g{index}", summary)
+
+    stats = store.stats(top_options=5)
+    scores = [s["score"] for s in summaries]
+    assert stats["games"] == 40
+    assert stats["metrics"]["score"]["mean"] == pytest.approx(statistics.mean(scores), abs=0.01)
+    assert stats["metrics"]["score"]["stddev"] == pytest.approx(statistics.pstdev(scores), abs=0.01)
+    assert stats["metrics"]["spent"]["max"] == max(s["spent"] for s in summaries)
+    assert sum(stats["distributions"]["score"]) == 40
+    assert stats["distributions"]["score"][histogram_bucket(scores[0])] >= 1
+    assert stats["grades"] == {g: sum(s["grade"] == g for s in summaries) for g in {s["grade"] for s in summaries}}
+    assert stats["production_rate"] == pytest.approx(sum(s["is_production"] for s in summaries) / 40)
+    picks = {o: sum(o in s["options"] for s in summaries) for o in "abcde"}
+    assert {p["option_id"]: p["games"] for p in stats["top_options"]} == picks
+
+
+def test_a_game_is_recorded_once(store):
+    summary = game_summary(random_state(random.Random(0)), {"overall_score": 50, "grade": "D"})
+    assert store.record("g", summary)
+    assert not store.record("g", dict(summary, score=99))
+    assert store.stats()["games"] == 1
+    assert store.leaderboard()[0]["score"] == 50
+
+
+def test_leaderboard_order(store):
+    state = random_state(random.Random(0))
+    for game_id, score in (("low", 20), ("first", 80), ("second", 80)):
+        store.record(game_id, game_summary(state, {"overall_score": score, "grade": "B"}), player=game_id)
+    assert [entry["game_id"] for entry in store.leaderboard()] == ["first", "second", "low"]
+    assert [entry["player"] for entry in store.leaderboard(limit=1)] == ["first"]
+
+
+def test_empty_stats(store):
+    stats = store.stats()
+    assert stats["games"] == 0
+    assert stats["production_rate"] == 0
+    assert stats["cost_per_maturity_point"] is None
+
+
+def test_ending_a_game_again_after_undo_is_not_recorded_twice(client):
+    client.post('/api/game/new')
+    client.post('/api/game/advance?weeks=2')
+    client.post('/api/game/end', json={'player': 'x' * 500})
+    assert client.post('/api/game/undo').get_json()['success']
+    client.post('/api/game/end')
+
+    board = client.get('/api/analytics/leaderboard').get_json()['leaderboard']
+    assert len(board) == 1
+    assert board[0]['player'] == 'x' * config.PLAYER_NAME_MAX_LENGTH
+    assert client.get('/api/analytics/stats').get_json()['stats']['games'] == 1
+
+    client.post('/api/game/new')
+    client.post('/api/game/end')
+    assert client.get('/api/analytics/stats').get_json()['stats']['games'] == 2
@@ -0,0 +1,56 @@
+"""Tests for the app factory and its lazily created services."""
+import json
+import os
+import subprocess
+import sys
+import config
+from app import create_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["vertexai", "PyPDF2", "game_engine", "scenario_manager", "session_store", "pdf_scenario_parser"]
+
+IMPORT_SCRIPT = """
+import json, sys
+from app import create_app
+create_app()
+print(json.dumps([name for name in sys.argv[1:] if name in sys.modules]))
+"""
+
+
+def test_creating_the_app_imports_no_heavy_modules():
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT, *HEAVY_MODULES],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(output.splitlines()[-1]) == []
+
+
+def test_services_are_created_on_first_use(app, client):
+    services = app.extensions['simulator']
+    assert services._sessions is None and services._reports is None and services._analytics is None
+
+    assert client.post('/api/game/new').status_code == 200
+    sessions = services.sessions
+    assert sessions is not None and services.sessions is sessions
+    assert services._reports is None and services._pdf_parser is None
+
+
+def test_session_store_follows_the_worker_count(monkeypatch):
+    monkeypatch.setattr(config, "SESSION_STORE", "memory")
+    monkeypatch.setattr(config, "WORKERS", 1)
+    assert create_app().extensions['simulator'].session_store_kind == "memory"
+    monkeypatch.setattr(config, "WORKERS", 4)
+    assert create_app().extensions['simulator'].session_store_kind == "sqlite"
+
+
+def test_sessions_are_kept_apart(app):
+    first, second = app.test_client(), app.test_client()
+    first.post('/api/game/new', headers={'X-Session-ID': 'first'})
+    first.post('/api/game/advance?weeks=3', headers={'X-Session-ID': 'first'})
+    second.set_cookie('session_id', 'second')
+    second.post('/api/game/new')
+
+    week = first.get('/api/game/state', headers={'X-Session-ID': 'first'}).get_json()['game_state']['current_week']
+    assert week == 3
+    assert second.get('/api/game/state').get_json()['game_state']['current_week'] == 0
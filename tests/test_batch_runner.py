@@ -0,0 +1,99 @@
+"""Tests for the headless batch runner and its policies."""
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import pytest
+from agents import OfflineDecisionAgent
+from batch_runner import BatchSummary, affordable_choices, make_policy, play_game, run_games
+from models import GameState, MaturityMetrics
+from scenario_manager import ScenarioManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def scenarios_file(tmp_path):
+    """A scenarios file that does not exist yet, so the built-in scenarios are played."""
+    return str(tmp_path / "scenarios.json")
+
+
+@pytest.fixture
+def scenarios(scenarios_file):
+    return ScenarioManager(scenarios_file).get_all_scenarios()
+
+
+def test_games_are_reproducible_per_seed(scenarios):
+    agent = OfflineDecisionAgent()
+    assert play_game(3, "random", scenarios, agent) == play_game(3, "random", scenarios, agent)
+    assert play_game(3, "random", scenarios, agent) != play_game(4, "random", scenarios, agent)
+
+
+def test_results_do_not_depend_on_the_worker_count(scenarios_file):
+    serial = list(run_games(6, "random", workers=1, seed=10, scenarios_file=scenarios_file))
+    parallel = sorted(run_games(6, "random", workers=2, seed=10, scenarios_file=scenarios_file),
+                      key=lambda summary: summary["seed"])
+    assert [summary["seed"] for summary in serial] == list(range(10, 16))
+    assert parallel == serial
+
+
+def test_greedy_beats_random(scenarios):
+    agent = OfflineDecisionAgent()
+    scores = {
+        policy: statistics.mean(play_game(seed, policy, scenarios, agent)["score"] for seed in range(20))
+        for policy in ("random", "greedy")
+    }
+    assert scores["greedy"] > scores["random"]
+
+
+def test_scripted_policy_follows_the_script(scenarios):
+    summary = play_game(0, "scripted", scenarios, OfflineDecisionAgent(),
+                        script=["opensource_basic", "basic_logging"])
+    assert summary["options"] == ["basic_logging", "opensource_basic"]
+    assert summary["decisions"] == 2
+
+
+@pytest.mark.parametrize("name, script, metric", [
+    ("best", None, "gain"),
+    ("scripted", None, "gain"),
+    ("greedy", None, "luck"),
+])
+def test_bad_policies(name, script, metric):
+    with pytest.raises(ValueError):
+        make_policy(name, random.Random(), script, metric)
+
+
+def test_affordable_choices(scenarios):
+    state = GameState(budget=60000, time_remaining_weeks=52, resources=10, current_week=5,
+                      maturity=MaturityMetrics())
+    choices = affordable_choices(state, scenarios, decided={"dev_framework_choice"})
+    assert choices
+    assert all(option["cost"] <= 60000 for _, option in choices)
+    assert all(scenario["week_available"] <= 5 for scenario, _ in choices)
+    assert "dev_framework_choice" not in {scenario["id"] for scenario, _ in choices}
+
+
+def test_batch_summary():
+    totals = BatchSummary()
+    totals.add({"score": 80, "is_production": True, "grade": "B", "options": ["a", "b"]})
+    totals.add({"score": 40, "is_production": False, "grade": "D", "options": ["a"]})
+    summary = totals.to_dict(elapsed=2.0)
+    assert summary["games"] == 2
+    assert summary["games_per_second"] == 1.0
+    assert summary["mean_score"] == 60
+    assert summary["production_rate"] == 0.5
+    assert summary["top_options"] == [{"option_id": "a", "pick_rate": 1.0}, {"option_id": "b", "pick_rate": 0.5}]
+
+
+def test_command_line(scenarios_file, tmp_path):
+    output = tmp_path / "results.ndjson"
+    completed = subprocess.run(
+        [sys.executable, "batch_runner.py", "--games", "3", "--policy", "greedy", "--workers", "1",
+         "--scenarios", scenarios_file, "--output", str(output), "--analytics", str(tmp_path / "analytics.db")],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line["seed"] for line in lines] == [0, 1, 2]
+    assert json.loads(completed.stderr)["games"] == 3
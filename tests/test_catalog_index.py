@@ -0,0 +1,78 @@
+"""Tests for cursor pagination over the scenario catalog."""
+import random
+import pytest
+from catalog_index import CatalogIndex, decode_cursor, encode_cursor
+from scenario_manager import ScenarioManager
+
+CATEGORIES = ["strategic", "technical", "organizational"]
+
+
+def random_catalog(rng: random.Random, size: int) -> list:
+    return [
+        {"id": f"s{position}", "category": rng.choice(CATEGORIES), "week_available": rng.randint(0, 12)}
+        for position in range(size)
+    ]
+
+
+def all_pages(index, limit, **filters):
+    positions, cursor = [], None
+    while True:
+        page = index.page(cursor=cursor, limit=limit, **filters)
+        positions.extend(page["positions"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return positions, page["total"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("limit", [1, 7, 100])
+def test_pages_match_brute_force(seed, limit):
+    rng = random.Random(seed)
+    catalog = random_catalog(rng, 80)
+    index = CatalogIndex(catalog)
+
+    for category in [None] + CATEGORIES:
+        week_min = rng.choice([None, 0, 3])
+        week_max = rng.choice([None, 5, 12])
+        expected = sorted(
+            (s["week_available"], position)
+            for position, s in enumerate(catalog)
+            if (category is None or s["category"] == category)
+            and (week_min is None or s["week_available"] >= week_min)
+            and (week_max is None or s["week_available"] <= week_max)
+        )
+        positions, total = all_pages(index, limit, category=category, week_min=week_min, week_max=week_max)
+        assert positions == [position for _, position in expected]
+        assert total == len(expected)
+
+
+def test_empty_and_unknown_category():
+    index = CatalogIndex(random_catalog(random.Random(0), 5))
+    assert index.page(category="mystery") == {"positions": [], "total": 0, "next_cursor": None}
+    assert index.page(week_min=9, week_max=3)["positions"] == []
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "1.2.3", "x.1"])
+def test_bad_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor((4, 17))) == (4, 17)
+
+
+def test_query_scenarios(tmp_path):
+    manager = ScenarioManager(str(tmp_path / "scenarios.json"))
+    total = len(manager.get_all_scenarios())
+    page = manager.query_scenarios(limit=2, fields=["id", "week_available"])
+
+    assert page["total"] == total
+    assert all(set(s) == {"id", "week_available"} for s in page["scenarios"])
+    rest = manager.query_scenarios(cursor=page["next_cursor"], limit=100)
+    assert len(page["scenarios"]) + len(rest["scenarios"]) == total
+    assert rest["next_cursor"] is None
+
+    for bad in ({"limit": 0}, {"fields": ["secret"]}, {"cursor": "nope"}):
+        with pytest.raises(ValueError):
+            manager.query_scenarios(**bad)
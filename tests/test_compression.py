@@ -0,0 +1,58 @@
+"""Tests for negotiated response compression."""
+import gzip
+import pytest
+from flask import Flask, jsonify
+from compression import compress, encoded_etag, init_compression
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    init_compression(app, min_bytes=100)
+
+    @app.route("/large")
+    def large():
+        response = jsonify({"items": list(range(500))})
+        response.set_etag("v1")
+        return response
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/image")
+    def image():
+        return app.response_class(b"\x89PNG" * 100, mimetype="image/png")
+
+    return app.test_client()
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.get_etag() == ("v1-gzip", False)
+    assert b'"items"' in gzip.decompress(response.data)
+
+
+def test_identity_when_not_accepted(client):
+    response = client.get("/large")
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.get_etag() == ("v1", False)
+
+
+@pytest.mark.parametrize("path", ["/small", "/image"])
+def test_small_and_binary_responses_are_not_compressed(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compress_helpers():
+    data = b"x" * 1000
+    assert gzip.decompress(compress(data, "gzip", best=True)) == data
+    assert compress(data, "gzip") == compress(data, "gzip")
+    with pytest.raises(ValueError):
+        compress(data, "zstd")
+    assert encoded_etag("abc", None) == "abc"
+    assert encoded_etag("abc", "br") == "abc-br"
@@ -0,0 +1,103 @@
+"""Tests for state tags and conditional GET of the game state and scenario catalog."""
+import pytest
+from session_store import InMemorySessionStore, SQLiteSessionStore
+
+SCENARIO = {
+    "id": "etag_test", "title": "Cache test", "description": "A scenario added to change the catalog.",
+    "options": [{"id": "o1", "text": "Do it", "cost": 1000}]
+}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path, engine_factory):
+    if request.param == "memory":
+        return InMemorySessionStore(engine_factory, spill_dir=str(tmp_path))
+    return SQLiteSessionStore(engine_factory, str(tmp_path / "sessions.db"))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store_client(request, app, client):
+    app.extensions['simulator'].session_store_kind = request.param
+    return client
+
+
+def test_state_tag_changes_per_request(store):
+    assert store.state_tag("a") is None
+    with store.session("a") as engine:
+        engine.start_new_game()
+    first = store.state_tag("a")
+    with store.session("a"):
+        pass
+    second = store.state_tag("a")
+
+    assert None not in (first, second) and first != second
+    store.peek("a")
+    assert store.state_tag("a") == second
+    assert store.state_tag("b") is None
+
+
+def test_state_tag_is_dropped_with_the_session(store):
+    with store.session("a") as engine:
+        engine.start_new_game()
+    store.delete("a")
+    assert store.state_tag("a") is None
+
+
+def test_game_state_revalidation(store_client):
+    client = store_client
+    assert client.get('/api/game/state').status_code == 404
+    client.post('/api/game/new')
+
+    first = client.get('/api/game/state')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert 'X-Session-ID' in first.headers['Vary']
+
+    cached = client.get('/api/game/state', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag and not cached.data
+
+    client.post('/api/game/advance?weeks=1')
+    changed = client.get('/api/game/state', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['game_state']['current_week'] == 1
+
+
+def test_game_state_tags_are_per_session(store_client):
+    client = store_client
+    client.post('/api/game/new')
+    etag = client.get('/api/game/state').headers['ETag']
+    client.post('/api/game/new', headers={'X-Session-ID': 'other'})
+    response = client.get('/api/game/state', headers={'X-Session-ID': 'other', 'If-None-Match': etag})
+    assert response.status_code == 200
+
+
+def test_catalog_revalidation(app, client):
+    first = client.get('/api/scenarios', headers={'Accept-Encoding': 'identity'})
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert client.get('/api/scenarios', headers={'If-None-Match': etag}).status_code == 304
+
+    gzipped = client.get('/api/scenarios', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzipped.headers['ETag'] not in (etag, None)
+    cached = client.get('/api/scenarios', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']
+    })
+    assert cached.status_code == 304
+
+    app.extensions['simulator'].scenario_manager.ingest_scenario(SCENARIO)
+    changed = client.get('/api/scenarios', headers={'If-None-Match': etag, 'Accept-Encoding': 'identity'})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert 'etag_test' in {s['id'] for s in changed.get_json()['scenarios']}
+
+
+def test_catalog_page_revalidation(client):
+    url = '/api/scenarios?limit=2&fields=id'
+    first = client.get(url)
+    etag = first.headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/scenarios?limit=3&fields=id', headers={'If-None-Match': etag}).status_code == 200
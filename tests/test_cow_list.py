@@ -0,0 +1,125 @@
+"""Tests for the copy-on-write list behind game forks."""
+import random
+import pytest
+from models.cow_list import CowList
+
+
+def test_behaves_like_a_list():
+    items = CowList([1, 2, 3])
+    items.append(4)
+    items.extend([5, 6])
+    assert items == [1, 2, 3, 4, 5, 6]
+    assert len(items) == 6
+    assert items[-1] == 6
+    assert items[1:3] == [2, 3]
+    assert items.pop() == 6
+    assert items.pop(0) == 1
+    items.insert(1, 9)
+    assert list(items) == [2, 9, 3, 4, 5]
+
+
+def test_fork_shares_items_without_sharing_changes():
+    original = CowList(range(5))
+    fork = original.fork()
+    fork.append(5)
+    original.append(50)
+    fork[0] = -1
+    del original[1]
+
+    assert original == [0, 2, 3, 4, 50]
+    assert fork == [-1, 1, 2, 3, 4, 5]
+
+
+def test_fork_of_a_fork():
+    first = CowList(["a"])
+    second = first.fork()
+    second.append("b")
+    third = second.fork()
+    third.append("c")
+    second.pop()
+
+    assert first == ["a"]
+    assert second == ["a"]
+    assert third == ["a", "b", "c"]
+    assert third[1] == "b"
+
+
+def test_pop_and_slice_delete_after_fork():
+    original = CowList(range(10))
+    fork = original.fork()
+    assert fork.pop() == 9
+    del fork[:3]
+    assert fork == [3, 4, 5, 6, 7, 8]
+    assert original == list(range(10))
+
+
+@pytest.mark.parametrize("index", [1, -2])
+def test_index_out_of_range(index):
+    items = CowList([1]).fork()
+    with pytest.raises(IndexError):
+        items[index]
+
+
+def test_many_forks_are_flattened():
+    items = CowList()
+    forks = []
+    for value in range(CowList.MAX_SEGMENTS * 2):
+        items.append(value)
+        forks.append(items.fork())
+    assert len(items._segments) <= CowList.MAX_SEGMENTS + 1
+    assert items == list(range(CowList.MAX_SEGMENTS * 2))
+    assert forks[3] == [0, 1, 2, 3]
+
+
+def test_tail_pop_after_fork_keeps_sharing():
+    original = CowList(range(1000))
+    fork = original.fork()
+    shared = fork._segments[0][0]
+
+    assert fork.pop() == 999
+    del fork[-1]
+    assert fork._segments[0][0] is shared
+    assert len(fork) == 998
+    assert fork[-1] == 997
+    assert original == list(range(1000))
+
+
+def test_pops_across_segments():
+    items = CowList([0, 1])
+    first = items.fork()
+    items.append(2)
+    second = items.fork()
+    assert [second.pop() for _ in range(3)] == [2, 1, 0]
+    with pytest.raises(IndexError):
+        second.pop()
+    second.append("x")
+    assert second == ["x"]
+    assert items == [0, 1, 2]
+    assert first == [0, 1]
+
+
+def test_random_operations_match_a_list():
+    rng = random.Random(0)
+    lists = [(CowList(), [])]
+    for _ in range(3000):
+        cow, plain = rng.choice(lists)
+        action = rng.random()
+        if action < 0.4:
+            value = rng.random()
+            cow.append(value)
+            plain.append(value)
+        elif action < 0.7 and plain:
+            assert cow.pop() == plain.pop()
+        elif action < 0.8 and plain:
+            index = rng.randrange(len(plain))
+            cow[index] = plain[index] = rng.random()
+        elif action < 0.85 and plain:
+            index = rng.randrange(len(plain))
+            del cow[index]
+            del plain[index]
+        elif len(lists) < 20:
+            lists.append((cow.fork(), list(plain)))
+    for cow, plain in lists:
+        assert cow == plain
+        assert list(cow) == plain
+        assert [cow[i] for i in range(-len(plain), len(plain))] == plain + plain
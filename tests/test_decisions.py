@@ -0,0 +1,22 @@
+"""Tests for offering and making decisions through the API."""
+
+
+def available_ids(client):
+    response = client.get('/api/decisions/available')
+    assert response.status_code == 200
+    return [decision['id'] for decision in response.get_json()['decisions']]
+
+
+def test_decided_scenario_is_not_offered_again(app, client):
+    client.post('/api/game/new')
+    client.post('/api/game/advance?weeks=1')
+    catalog = {s['id'] for s in app.extensions['simulator'].scenario_manager.get_all_scenarios()}
+    decision = next(d for d in client.get('/api/decisions/available').get_json()['decisions'] if d['id'] in catalog)
+
+    response = client.post('/api/decision/make', json={
+        'scenario_id': decision['id'],
+        'option': decision['options'][0]
+    })
+    assert response.get_json()['success']
+    assert response.get_json()['new_state']['decisions_made'][-1]['scenario_id'] == decision['id']
+    assert decision['id'] not in available_ids(client)
@@ -0,0 +1,65 @@
+"""Tests for the compiled random event rule table."""
+import random
+import pytest
+from event_rules import DEFAULT_EVENT_RULES, EventRule, EventRuleTable
+from models import MATURITY_DIMENSIONS, MaturityMetrics
+
+
+def random_rules(rng: random.Random, count: int) -> list:
+    rules = []
+    for index in range(count):
+        conditions = {}
+        for dimension in rng.sample(MATURITY_DIMENSIONS, rng.randint(0, 3)):
+            bounds = {}
+            if rng.random() < 0.7:
+                bounds["below"] = rng.randint(1, 100)
+            if rng.random() < 0.5:
+                bounds["at_least"] = rng.randint(0, 99)
+            conditions[dimension] = bounds
+        rules.append({"id": f"r{index}", "title": f"Rule {index}", "conditions": conditions,
+                      "weight": rng.uniform(0.1, 3)})
+    return rules
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matching_equals_evaluating_every_condition(seed):
+    rng = random.Random(seed)
+    table = EventRuleTable.from_dicts(random_rules(rng, 25))
+    for _ in range(300):
+        maturity = MaturityMetrics(**{d: rng.randint(0, 100) for d in MATURITY_DIMENSIONS})
+        expected = [
+            rule for rule in table.rules
+            if all(rule.matches_value(d, getattr(maturity, d)) for d in rule.conditions)
+        ]
+        assert table.matching(maturity) == expected
+
+
+def test_choose_only_picks_matching_rules_by_weight():
+    table = EventRuleTable.from_dicts([
+        {"id": "rare", "title": "Rare", "conditions": {"security": {"below": 50}}, "weight": 1},
+        {"id": "common", "title": "Common", "conditions": {"security": {"below": 50}}, "weight": 3},
+        {"id": "never", "title": "Never", "conditions": {"security": {"at_least": 50}}},
+    ])
+    rng = random.Random(0)
+    maturity = MaturityMetrics(security=10)
+    picks = [table.choose(maturity, rng).id for _ in range(4000)]
+    assert "never" not in picks
+    assert 0.7 < picks.count("common") / len(picks) < 0.8
+    assert table.choose(MaturityMetrics(security=50), rng).id == "never"
+
+
+def test_no_match():
+    table = EventRuleTable.from_dicts(DEFAULT_EVENT_RULES)
+    mature = MaturityMetrics(**{d: 100 for d in MATURITY_DIMENSIONS})
+    assert table.matching(mature) == []
+    assert table.choose(mature) is None
+
+
+@pytest.mark.parametrize("rule", [
+    {"id": "x", "title": "X", "conditions": {"luck": {"below": 5}}},
+    {"id": "x", "title": "X", "conditions": {"security": {"above": 5}}},
+    {"id": "x", "title": "X", "weight": 0},
+])
+def test_invalid_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        EventRule.from_dict(rule)
@@ -0,0 +1,74 @@
+"""Tests for fast-forwarding time without decisions."""
+import pytest
+import config
+from game_engine import RANDOM_EVENT_WEEKLY_PROBABILITY
+
+DELAYED = {
+    "id": "delayed", "text": "Slow investment", "cost": 1000, "time_weeks": 0, "resources_required": 0,
+    "maturity_impact": {"security": 12}, "immediate_impact": False, "delayed_impact_weeks": 3
+}
+
+
+def without_random_events(engine):
+    engine._weeks_until_event = lambda: 10 ** 6
+    return engine
+
+
+def test_delta_adds_up(engine):
+    state = engine.game_state
+    before = state.to_dict()
+    delta = engine.advance_weeks(30)
+    after = state.to_dict()
+
+    assert delta["weeks"] == 30 == after["current_week"] - before["current_week"]
+    assert delta["budget"] == after["budget"] - before["budget"]
+    assert delta["time_remaining_weeks"] == after["time_remaining_weeks"] - before["time_remaining_weeks"]
+    assert delta["reputation"] == after["reputation"] - before["reputation"]
+    assert delta["maturity"] == {k: after["maturity"][k] - v for k, v in before["maturity"].items()}
+    assert delta["events"] == after["events"][len(before["events"]):]
+
+
+def test_pending_impacts_are_realized_in_their_week(engine):
+    without_random_events(engine)
+    engine.process_decision_impact(DELAYED)
+
+    assert engine.advance_weeks(2)["maturity"]["security"] == 0
+    delta = engine.advance_weeks(5)
+    assert delta["maturity"]["security"] == 12
+    assert [event["week"] for event in delta["events"]] == [3]
+    assert engine.pending_impacts == []
+
+
+def test_random_events_keep_their_weekly_rate(engine):
+    calls = []
+    engine._generate_random_event = lambda: calls.append(engine.game_state.current_week)
+    weeks = 5000
+    engine.advance_weeks(weeks)
+
+    assert len(calls) == pytest.approx(weeks * RANDOM_EVENT_WEEKLY_PROBABILITY, rel=0.15)
+    assert len(set(calls)) == len(calls)
+
+
+def test_zero_and_negative_weeks(engine):
+    assert engine.advance_weeks(0)["weeks"] == 0
+    with pytest.raises(ValueError):
+        engine.advance_weeks(-1)
+
+
+def test_advance_endpoint(client):
+    assert client.post('/api/game/advance?weeks=2').status_code == 404
+    client.post('/api/game/new')
+
+    body = client.post('/api/game/advance?weeks=4').get_json()
+    assert body['success']
+    assert body['delta']['weeks'] == 4
+    assert body['state']['current_week'] == 4
+    assert client.get('/api/game/state').get_json()['game_state']['current_week'] == 4
+
+
+@pytest.mark.parametrize("weeks", [0, -3, config.MAX_ADVANCE_WEEKS + 1])
+def test_advance_endpoint_limits(client, weeks):
+    client.post('/api/game/new')
+    response = client.post(f'/api/game/advance?weeks={weeks}')
+    assert response.status_code == 400
+    assert not response.get_json()['success']
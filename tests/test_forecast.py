@@ -0,0 +1,37 @@
+"""Tests for the read-only production forecast."""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORECAST_SCRIPT = """
+import json, sys
+from agents.offline_agent import OfflineDecisionAgent
+from game_engine import GameEngine
+engine = GameEngine(OfflineDecisionAgent())
+with open(sys.argv[1]) as f:
+    engine.restore(json.load(f))
+print(json.dumps(engine.forecast_production(200)))
+"""
+
+
+def test_forecast_leaves_the_game_rng_alone(engine):
+    engine.advance_weeks(5)
+    state = engine.rng.getstate()
+    first = engine.forecast_production(200)
+    assert engine.rng.getstate() == state
+    assert engine.forecast_production(200) == first
+
+
+def test_forecast_is_the_same_in_another_process(engine, tmp_path):
+    engine.advance_weeks(5)
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps(engine.snapshot()))
+
+    output = subprocess.run(
+        [sys.executable, "-c", FORECAST_SCRIPT, str(path)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(output.splitlines()[-1]) == json.loads(json.dumps(engine.forecast_production(200)))
@@ -0,0 +1,207 @@
+"""Tests for the event-sourced game log: undo, redo, replay, trimming and snapshots."""
+import random
+import pytest
+from tests.helpers import make_option
+from models.game_log import (
+    Adjusted, DecisionRecorded, EventAdded, FieldSet, GameLog, ImpactRealized,
+    ImpactScheduled, MaturityAdjusted, WeeksPassed, event_from_record
+)
+from models.game_state import GameEvent, GameState, MaturityMetrics
+
+
+def play(engine, rng: random.Random, actions: int):
+    """Play random decisions and fast-forwards."""
+    for index in range(actions):
+        if engine.game_state.game_over:
+            return
+        if rng.random() < 0.7:
+            engine.process_decision_impact(make_option(rng, index))
+        else:
+            engine.advance_weeks(rng.randint(0, 5))
+
+
+def state_of(engine):
+    return engine.game_state.to_dict(), list(engine.pending_impacts)
+
+
+def test_undo_redo_restores_every_state(engine):
+    rng = random.Random(1)
+    states = [state_of(engine)]
+    for index in range(30):
+        if index % 3:
+            engine.process_decision_impact(make_option(rng, index))
+        else:
+            engine.advance_weeks(3)
+        states.append(state_of(engine))
+
+    for expected in reversed(states[:-1]):
+        assert engine.undo() is not None
+        assert state_of(engine) == expected
+    assert engine.undo() is None
+
+    for expected in states[1:]:
+        assert engine.redo() is not None
+        assert state_of(engine) == expected
+    assert engine.redo() is None
+
+
+def test_new_action_discards_redo(engine):
+    engine.process_decision_impact(make_option(random.Random(2), 0))
+    engine.undo()
+    assert engine.log.can_redo
+    engine.advance_weeks(1)
+    assert not engine.log.can_redo
+
+
+def test_failed_action_is_reverted(engine):
+    before = state_of(engine)
+    with pytest.raises(RuntimeError):
+        with engine._step("decision"):
+            engine._change(Adjusted("budget", -1000))
+            engine._change(WeeksPassed(2))
+            raise RuntimeError("boom")
+    assert state_of(engine) == before
+    assert not engine.log.is_open
+    assert len(engine.log.done) == 1
+
+
+def test_realized_impact_is_reinserted_at_its_index():
+    state = GameState(budget=0, time_remaining_weeks=10, resources=0, current_week=0, maturity=MaturityMetrics())
+    pending = [{"week": 5, "impact": {}}, {"week": 3, "impact": {}}, {"week": 5, "impact": {"security": 1}}]
+    original = list(pending)
+    event = ImpactRealized(1, pending[1])
+    event.apply(state, pending)
+    assert pending == [original[0], original[2]]
+    event.revert(state, pending)
+    assert pending == original
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_rebuilds_the_state(engine, seed):
+    play(engine, random.Random(seed), 40)
+    assert engine.replay().to_dict() == engine.game_state.to_dict()
+
+
+def test_replay_after_trimming(engine_factory, monkeypatch):
+    monkeypatch.setattr("config.UNDO_MAX_STEPS", 5)
+    engine = engine_factory()
+    engine.start_new_game()
+    play(engine, random.Random(3), 20)
+    assert len(engine.log.done) == 5
+    assert engine.log.trimmed > 0
+    assert engine.replay().to_dict() == engine.game_state.to_dict()
+
+
+def test_trimmed_log_undoes_only_kept_steps(engine_factory, monkeypatch):
+    monkeypatch.setattr("config.UNDO_MAX_STEPS", 4)
+    engine = engine_factory()
+    engine.start_new_game()
+    rng = random.Random(4)
+    states = [state_of(engine)]
+    for index in range(10):
+        engine.process_decision_impact(make_option(rng, index))
+        states.append(state_of(engine))
+
+    for expected in reversed(states[-5:-1]):
+        engine.undo()
+        assert state_of(engine) == expected
+    assert not engine.log.can_undo
+    assert engine.undo() is None
+
+
+def test_start_of_game_cannot_be_undone(engine):
+    assert not engine.log.can_undo
+    assert engine.undo() is None
+    assert engine.game_state.events
+
+
+def test_fork_is_independent(engine):
+    rng = random.Random(5)
+    play(engine, rng, 10)
+    before = state_of(engine)
+    steps = len(engine.log.done)
+
+    fork = engine.fork()
+    fork.undo()
+    fork.process_decision_impact(make_option(rng, 99))
+
+    assert state_of(engine) == before
+    assert len(engine.log.done) == steps
+    engine.undo()
+    assert fork.game_state.decisions_made[-1]["option_id"] == "opt_99"
+
+
+def test_snapshot_round_trip_keeps_history(engine, engine_factory):
+    play(engine, random.Random(6), 15)
+    engine.undo()
+    restored = engine_factory()
+    restored.restore(engine.snapshot())
+
+    assert state_of(restored) == state_of(engine)
+    assert restored.game_id == engine.game_id
+    assert restored.history() == engine.history()
+    restored.redo()
+    engine.redo()
+    assert state_of(restored) == state_of(engine)
+
+
+def test_snapshot_without_log_restores_without_history(engine, engine_factory):
+    play(engine, random.Random(8), 5)
+    snapshot = engine.snapshot()
+    del snapshot["log"]
+    restored = engine_factory()
+    restored.restore(snapshot)
+    assert state_of(restored) == state_of(engine)
+    assert not restored.log.can_undo
+
+
+@pytest.mark.parametrize("event", [
+    Adjusted("budget", -100),
+    WeeksPassed(3),
+    MaturityAdjusted("security", 7),
+    EventAdded(GameEvent(week=2, title="t", description="d", impact={"budget": 1})),
+    DecisionRecorded({"week": 1, "option_id": "a"}),
+    ImpactScheduled({"week": 4, "impact": {"security": 2}, "description": "x"}),
+    ImpactRealized(0, {"week": 4, "impact": {}, "description": "x"}),
+    FieldSet("game_over", False, True),
+])
+def test_record_round_trip(event):
+    assert event_from_record(event.to_record()) == event
+
+
+def test_unknown_record_is_rejected():
+    with pytest.raises(ValueError):
+        event_from_record(["teleported", 3])
+
+
+def test_from_dict_applies_the_cap(monkeypatch):
+    log = GameLog(max_steps=0)
+    state = GameState(budget=0, time_remaining_weeks=100, resources=0, current_week=0, maturity=MaturityMetrics())
+    for _ in range(10):
+        log.begin("advance", state.current_week)
+        event = WeeksPassed(1)
+        event.apply(state, [])
+        log.record(event)
+        log.commit()
+    assert len(log.done) == 10
+
+    monkeypatch.setattr("config.UNDO_MAX_STEPS", 3)
+    restored = GameLog.from_dict(log.to_dict())
+    assert len(restored.done) == 3
+    assert restored.trimmed == 7
+
+
+def test_undo_after_fork_shares_the_histories(engine):
+    play(engine, random.Random(9), 30)
+    fork = engine.fork()
+    before = state_of(engine)
+    fork.undo()
+
+    for attribute in ("events", "decisions_made"):
+        mine, theirs = getattr(fork.game_state, attribute), getattr(engine.game_state, attribute)
+        # No private copy was made: the fork still reads the items shared with the engine
+        assert not mine._tail
+        assert [id(items) for items, _ in mine._segments] == [id(items) for items, _ in theirs._segments]
+    assert not fork.log.done._tail
+    assert state_of(engine) == before
+    assert fork.replay().to_dict() == fork.game_state.to_dict()
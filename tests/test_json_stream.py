@@ -0,0 +1,64 @@
+"""Tests for the incremental JSON array parser used for streamed decisions."""
+import json
+import pytest
+from agents.json_stream import JSONArrayStreamParser
+
+ELEMENTS = [
+    {"id": "d1", "title": "Brackets [in] {strings}", "options": [{"id": "a", "cost": 1}]},
+    {"id": "d2", "title": "Escaped \"quotes\" and \\ slashes", "options": []},
+    {"id": "d3", "nested": {"deep": [[1, 2], {"x": "]"}]}},
+]
+TEXT = "```json\n" + json.dumps(ELEMENTS, indent=2) + "\n```"
+
+
+def feed_all(parser, chunks):
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return completed
+
+
+def test_whole_text():
+    parser = JSONArrayStreamParser()
+    assert parser.feed(TEXT) == ELEMENTS
+    assert parser.done
+
+
+def test_character_by_character():
+    parser = JSONArrayStreamParser()
+    assert feed_all(parser, TEXT) == ELEMENTS
+    assert parser.done
+
+
+@pytest.mark.parametrize("size", [2, 5, 13, 64])
+def test_every_chunk_size(size):
+    parser = JSONArrayStreamParser()
+    chunks = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+    assert feed_all(parser, chunks) == ELEMENTS
+
+
+def test_elements_are_returned_as_soon_as_complete():
+    parser = JSONArrayStreamParser()
+    first = json.dumps(ELEMENTS[0])
+    assert parser.feed("[" + first[:-1]) == []
+    assert parser.feed(first[-1] + ", {") == [ELEMENTS[0]]
+    assert not parser.done
+
+
+def test_invalid_element_is_skipped():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"id": 1}, {"id": oops}, {"id": 3}]') == [{"id": 1}, {"id": 3}]
+    assert parser.done
+
+
+def test_text_after_the_array_is_ignored():
+    parser = JSONArrayStreamParser()
+    parser.feed('[{"id": 1}] and then')
+    assert parser.done
+    assert parser.feed('[{"id": 2}]') == []
+
+
+def test_unfinished_array():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('Sure! [{"id": 1}, {"id": 2') == [{"id": 1}]
+    assert not parser.done
@@ -0,0 +1,38 @@
+"""Tests for session memory accounting and the tracemalloc diff."""
+import tracemalloc
+import pytest
+from memory_accounting import TracemallocDiff, deep_sizeof, engine_size
+
+
+@pytest.fixture
+def tracing():
+    was_tracing = tracemalloc.is_tracing()
+    yield
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = list(range(1000))
+    assert deep_sizeof([shared, shared]) < deep_sizeof([shared, list(range(1000))])
+    assert deep_sizeof({"a": shared}) > deep_sizeof(shared)
+
+
+def test_engine_size_grows_with_the_game(engine):
+    size = engine_size(engine)
+    engine.advance_weeks(20)
+    assert engine_size(engine) > size
+
+
+def test_first_diff_has_no_tracing_noise(tracing):
+    tracemalloc.start()
+    # A live snapshot owns traced memory in tracemalloc.py, as an earlier tracker's would
+    held = tracemalloc.take_snapshot()
+    tracker = TracemallocDiff()
+    kept = [bytearray(1000) for _ in range(200)]
+    top = tracker.diff(limit=1000)["top"]
+
+    noisy = [s for s in top if "tracemalloc" in s["location"] or "importlib" in s["location"]]
+    assert not noisy
+    assert any(s["location"].startswith(__file__) and s["size_diff"] >= 200000 for s in top)
+    assert kept and held
@@ -0,0 +1,59 @@
+"""Tests for the process-wide model client registry."""
+import os
+import pytest
+from agents.decision_agent import DecisionAgent
+from agents.model_clients import GENERATION_SETTINGS, ModelClients, model_clients
+from pdf_scenario_parser import PDFScenarioParser
+
+
+def require_vertexai():
+    """Skip unless the installed Vertex AI SDK has the generative models the registry uses."""
+    models = pytest.importorskip("vertexai.generative_models")
+    if not hasattr(models, "GenerativeModel"):
+        pytest.skip("vertexai.generative_models.GenerativeModel is not available")
+
+
+def test_agents_and_parsers_create_no_clients():
+    created = model_clients.created
+    for _ in range(10):
+        DecisionAgent()
+        PDFScenarioParser(workers=0)
+    assert model_clients.created == created
+
+
+def test_usage_of_an_unused_registry():
+    assert ModelClients().usage() == {"models": [], "generation_configs": [], "created": 0}
+
+
+def test_unknown_purpose():
+    with pytest.raises(KeyError):
+        ModelClients().generation_config("poetry")
+
+
+def test_every_prompt_template_has_generation_settings():
+    from agents.prompts import DECISIONS, FINAL_REPORT, PDF_SCENARIOS, READINESS
+    assert {t.name for t in (DECISIONS, READINESS, FINAL_REPORT, PDF_SCENARIOS)} == set(GENERATION_SETTINGS)
+
+
+def test_forked_child_forgets_its_parents_clients():
+    clients = ModelClients()
+    clients._models["model"] = object()
+    clients._configs["decisions"] = object()
+    clients.created = 1
+    assert clients.usage()["models"] == ["model"]
+
+    clients._pid = os.getpid() + 1  # as seen from a child process
+    assert clients.usage() == {"models": [], "generation_configs": [], "created": 0}
+
+
+def test_clients_are_shared():
+    require_vertexai()
+    clients = ModelClients()
+    assert clients.model("gemini-test") is clients.model("gemini-test")
+    assert clients.generation_config("decisions") is clients.generation_config("decisions")
+    assert clients.usage() == {"models": ["gemini-test"], "generation_configs": ["decisions"], "created": 1}
+
+
+def test_agents_share_the_process_clients():
+    require_vertexai()
+    assert DecisionAgent().model is DecisionAgent().model is PDFScenarioParser(workers=0).model
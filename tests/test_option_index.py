@@ -0,0 +1,86 @@
+"""Tests for the option value index and its threshold-algorithm ranking."""
+import json
+import random
+import pytest
+from models import MATURITY_DIMENSIONS
+from option_index import METRICS, OptionValueIndex, gap_weights
+from scenario_manager import ScenarioManager
+
+
+def random_catalog(rng: random.Random, size: int) -> list:
+    return [
+        {
+            "id": f"s{position}",
+            "week_available": rng.randint(0, 10),
+            "options": [
+                {
+                    "id": f"o{position}_{index}",
+                    "cost": rng.randint(0, 200000),
+                    "time_weeks": rng.randint(0, 8),
+                    "resources_required": rng.randint(0, 5),
+                    "maturity_impact": {d: rng.randint(-10, 30) for d in MATURITY_DIMENSIONS}
+                }
+                for index in range(rng.randint(1, 4))
+            ]
+        }
+        for position in range(size)
+    ]
+
+
+def brute_force(index, weights, accept, limit, metric):
+    best = {}
+    for entry in index.entries:
+        if not accept(entry):
+            continue
+        score = sum(w * v for w, v in zip(weights, entry.values(metric)) if w > 0)
+        if score > 0 and score > best.get(entry.scenario_pos, (0,))[0]:
+            best[entry.scenario_pos] = (score, entry)
+    return sorted(best.values(), key=lambda item: -item[0])[:limit]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("metric", METRICS)
+def test_rank_matches_brute_force(seed, metric):
+    rng = random.Random(seed)
+    index = OptionValueIndex(random_catalog(rng, 60))
+    weights = gap_weights({d: rng.randint(0, 90) for d in MATURITY_DIMENSIONS})
+    week, budget = rng.randint(0, 10), rng.randint(20000, 200000)
+
+    def accept(entry):
+        return entry.week_available <= week and entry.cost <= budget
+
+    for limit in (1, 3, 10):
+        expected = brute_force(index, weights, accept, limit, metric)
+        ranked = index.rank(weights, accept, limit, metric)
+        assert [score for score, _ in ranked] == pytest.approx([score for score, _ in expected])
+        assert [e.option_id for _, e in ranked] == [e.option_id for _, e in expected]
+
+
+def test_rank_without_gaps_is_empty():
+    index = OptionValueIndex(random_catalog(random.Random(0), 5))
+    weights = gap_weights({d: 100 for d in MATURITY_DIMENSIONS})
+    assert weights == (0.0,) * len(MATURITY_DIMENSIONS)
+    assert index.rank(weights, lambda entry: True) == []
+
+
+def test_gap_weights_use_the_threshold():
+    weights = gap_weights({d: 40 for d in MATURITY_DIMENSIONS}, ready_threshold=80)
+    assert weights == (0.5,) * len(MATURITY_DIMENSIONS)
+
+
+def test_decided_scenarios_are_excluded_by_scenario_id(tmp_path):
+    option = {"id": "a", "text": "Invest", "cost": 1000, "time_weeks": 1, "resources_required": 1,
+              "maturity_impact": {"security": 10}}
+    catalog = [
+        {"id": scenario_id, "title": scenario_id, "description": f"{scenario_id} decision", "options": [option]}
+        for scenario_id in ("first", "second")
+    ]
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps(catalog))
+    manager = ScenarioManager(str(path))
+    state = {"current_week": 0, "budget": 10000, "resources": 5, "time_remaining_weeks": 10,
+             "maturity": {d: 0 for d in MATURITY_DIMENSIONS}, "decisions_made": []}
+
+    assert {s["id"] for s in manager.rank_scenarios(state)} == {"first", "second"}
+    state["decisions_made"] = [{"scenario_id": "first", "option_id": "a"}]
+    assert [s["id"] for s in manager.rank_scenarios(state)] == ["second"]
@@ -0,0 +1,105 @@
+"""Tests for per-game parameters and the parameter sweep."""
+import argparse
+import random
+import pytest
+import config
+from agents import OfflineDecisionAgent
+from game_engine import GameEngine
+from models import GameConfig
+from parameter_sweep import (
+    grid_points, latin_hypercube, linear_fit, parse_range, run_sweep, sensitivities, to_game_config
+)
+
+RANGES = {"initial_budget": (100000, 300000), "production_ready_threshold": (40, 80)}
+
+
+def test_game_config_defaults_and_overrides():
+    defaults = GameConfig.defaults()
+    assert defaults.initial_budget == config.INITIAL_BUDGET
+    assert GameConfig.from_dict(defaults.to_dict()) == defaults
+
+    custom = GameConfig.from_dict({"initial_budget": "5000", "production_ready_threshold": 70})
+    assert custom.initial_budget == 5000
+    assert custom.production_ready_threshold == 70
+    assert custom.initial_time_weeks == defaults.initial_time_weeks
+
+
+@pytest.mark.parametrize("values", [
+    {"budget": 1},
+    {"initial_time_weeks": 0},
+    {"initial_resources": -1},
+    {"minimum_acceptable_threshold": 70, "production_ready_threshold": 60},
+    {"production_ready_threshold": 101},
+])
+def test_game_config_rejects_bad_values(values):
+    with pytest.raises(ValueError):
+        GameConfig.from_dict(values)
+
+
+def test_engines_keep_their_own_parameters():
+    agent = OfflineDecisionAgent()
+    small = GameEngine(agent, GameConfig.from_dict({"initial_budget": 1000, "initial_time_weeks": 10}))
+    default = GameEngine(agent)
+    assert small.start_new_game().budget == 1000
+    assert small.game_state.time_remaining_weeks == 10
+    assert default.start_new_game().budget == config.INITIAL_BUDGET
+
+
+def test_grid_points():
+    points = grid_points(RANGES, 3)
+    assert len(points) == 9
+    assert {p["initial_budget"] for p in points} == {100000, 200000, 300000}
+    assert {p["production_ready_threshold"] for p in points} == {40, 60, 80}
+    assert len(grid_points({"initial_resources": (3, 4)}, 5)) == 2
+
+
+def test_latin_hypercube_uses_every_stratum_once():
+    samples = 10
+    points = latin_hypercube(RANGES, samples, random.Random(0))
+    assert len(points) == samples
+    for name, (low, high) in RANGES.items():
+        width = (high - low) / samples
+        # Sorted, the i-th value lies in the i-th stratum (up to rounding)
+        for stratum, value in enumerate(sorted(p[name] for p in points)):
+            assert low + stratum * width - 0.5 <= value <= low + (stratum + 1) * width + 0.5
+
+
+def test_to_game_config_caps_the_minimum_threshold():
+    game_config = to_game_config({"production_ready_threshold": 30, "minimum_acceptable_threshold": 50})
+    assert game_config.minimum_acceptable_threshold == 30
+
+
+def test_linear_fit():
+    assert linear_fit([1, 2, 3], [2, 4, 6]) == pytest.approx((2.0, 1.0))
+    assert linear_fit([1, 2, 3], [3, 2, 1]) == pytest.approx((-1.0, -1.0))
+    assert linear_fit([1, 1, 1], [1, 2, 3]) == (0.0, 0.0)
+    assert linear_fit([1, 2, 3], [5, 5, 5]) == (0.0, 0.0)
+
+
+def test_sweep_shows_the_budget_effect(tmp_path):
+    ranges = {"initial_budget": (100000, 1500000)}
+    points = grid_points(ranges, 3)
+    scenarios_file = str(tmp_path / "scenarios.json")
+    results = sorted(run_sweep(points, games=4, scenarios_file=scenarios_file), key=lambda r: r["index"])
+
+    assert [r["parameters"]["initial_budget"] for r in results] == [100000, 800000, 1500000]
+    assert all(r["games"] == 4 for r in results)
+    report = sensitivities(results, ranges)
+    assert report["initial_budget"]["spent"]["effect"] > 0
+    assert report["initial_budget"]["average_maturity"]["correlation"] > 0
+
+    parallel = sorted(run_sweep(points, games=4, workers=2, scenarios_file=scenarios_file),
+                      key=lambda r: r["index"])
+    assert parallel == results
+
+
+def test_sweep_rejects_invalid_points(tmp_path):
+    with pytest.raises(ValueError):
+        list(run_sweep([{"initial_time_weeks": 0}], games=1, scenarios_file=str(tmp_path / "s.json")))
+
+
+def test_parse_range():
+    assert parse_range("initial_budget=1:5") == ("initial_budget", (1, 5))
+    for text in ("initial_budget", "luck=1:5", "initial_budget=5:1", "initial_budget=a:b"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_range(text)
@@ -0,0 +1,100 @@
+"""Tests for PDF text extraction and batch scenario ingestion."""
+import io
+import json
+import pytest
+from reportlab.pdfgen import canvas
+import config
+from pdf_scenario_parser import PDFScenarioParser, extract_pdf_text
+
+TEXT = "Agents need a shared tool gateway with audit logging before they reach production. " * 3
+
+
+def make_pdf(*pages: str) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for text in pages:
+        for line, start in enumerate(range(0, len(text), 80)):
+            pdf.drawString(40, 800 - 14 * line, text[start:start + 80])
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+class FakeScenarioParser(PDFScenarioParser):
+    """Parser whose scenario generation turns each document into one scenario, without a model."""
+
+    def generate_scenarios_from_text(self, pdf_text):
+        words = pdf_text.split()
+        return [{
+            "id": f"pdf_{words[0].lower()}", "title": words[0], "description": pdf_text[:200],
+            "options": [{"id": "o1", "text": "Act on it", "cost": 1000}]
+        }]
+
+
+def test_extract_pdf_text():
+    data = make_pdf("First page " + TEXT, "Second page")
+    text = extract_pdf_text(data)
+    assert "First page" in text and "Second page" in text
+    assert "Second page" not in extract_pdf_text(data, max_pages=1)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_extract_texts(workers):
+    parser = PDFScenarioParser(workers=workers)
+    files = [("a.pdf", make_pdf("Alpha " + TEXT)), ("b.pdf", make_pdf("Beta " + TEXT)), ("bad.pdf", b"not a pdf")]
+    results = {name: (text, error) for name, text, error in parser.extract_texts(files)}
+    if workers:
+        parser.executor.shutdown()
+
+    assert results["a.pdf"][0].startswith("Alpha") and results["a.pdf"][1] is None
+    assert results["b.pdf"][0].startswith("Beta")
+    assert results["bad.pdf"][0] is None and results["bad.pdf"][1] is not None
+
+
+def test_parse_pdfs_reports_each_file():
+    parser = FakeScenarioParser(workers=0)
+    results = {r["file"]: r for r in parser.parse_pdfs_to_scenarios([
+        ("good.pdf", make_pdf("Gateway " + TEXT)),
+        ("short.pdf", make_pdf("Too short")),
+        ("bad.pdf", b"%PDF-broken"),
+    ])}
+    assert results["good.pdf"]["scenarios"][0]["id"] == "pdf_gateway"
+    assert "insufficient text" in results["short.pdf"]["error"]
+    assert results["bad.pdf"]["error"].startswith("Could not read PDF")
+
+
+@pytest.fixture
+def pdf_client(app, client):
+    app.extensions['simulator']._pdf_parser = FakeScenarioParser(workers=0)
+    return client
+
+
+def upload(client, files):
+    return client.post('/api/scenarios/add-from-pdfs', data={
+        'pdf_files': [(io.BytesIO(data), name) for name, data in files]
+    }, content_type='multipart/form-data')
+
+
+def test_batch_upload_streams_one_line_per_file(app, pdf_client):
+    response = upload(pdf_client, [
+        ("one.pdf", make_pdf("Gateway " + TEXT)),
+        ("two.pdf", make_pdf("Lineage tracking for every dataset the agents read. " * 3)),
+        ("empty.pdf", make_pdf("")),
+    ])
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    by_file = {line["file"]: line for line in lines[:-1]}
+
+    assert by_file["one.pdf"]["scenarios_added"] == 1
+    assert by_file["two.pdf"]["scenarios_added"] == 1
+    assert "error" in by_file["empty.pdf"]
+    assert lines[-1] == {"done": True, "files": 3, "scenarios_added": 2}
+    ids = {s["id"] for s in app.extensions['simulator'].scenario_manager.get_all_scenarios()}
+    assert {"pdf_gateway", "pdf_lineage"} <= ids
+
+
+def test_batch_upload_validation(pdf_client, monkeypatch):
+    assert upload(pdf_client, []).status_code == 400
+    assert upload(pdf_client, [("notes.txt", b"text")]).status_code == 400
+    monkeypatch.setattr(config, "PDF_BATCH_MAX_FILES", 1)
+    pdf = make_pdf(TEXT)
+    assert upload(pdf_client, [("a.pdf", pdf), ("b.pdf", pdf)]).status_code == 400
@@ -0,0 +1,84 @@
+"""Tests for the table-driven production simulator."""
+import random
+import pytest
+import config
+from models import MATURITY_DIMENSIONS
+from production_simulator import PRODUCTION_ISSUES, ProductionSimulator
+
+# One capability per severity: ready, Major (between the thresholds) and Critical
+MATURITY = {
+    "agent_development": 80,
+    "agent_operations": 50,
+    "data_platforms": 50,
+    "security": 10,
+    "governance": 30
+}
+
+
+def test_weekly_risks_by_severity():
+    risks = ProductionSimulator().weekly_risks(MATURITY)
+    assert risks == [
+        ("agent_operations", "Major", 0.015),
+        ("data_platforms", "Major", 0.015),
+        ("security", "Critical", 0.04),
+        ("governance", "Critical", 0.04)
+    ]
+
+
+def test_parameters_come_from_config(monkeypatch):
+    monkeypatch.setattr(config, "PRODUCTION_INCIDENT_WEEKLY_PROBABILITY", {"Major": 0.5, "Critical": 0.9})
+    monkeypatch.setattr(config, "MIN_PRODUCTION_WEEKS", 10)
+    simulator = ProductionSimulator()
+    assert {severity: p for _, severity, p in simulator.weekly_risks(MATURITY)} == {"Major": 0.5, "Critical": 0.9}
+    assert simulator.production_weeks(3) == 10
+    assert simulator.production_weeks(12) == 12
+    assert ProductionSimulator(min_weeks=0).production_weeks(0) == 0
+
+
+def test_simulate_dates_incidents_in_their_week():
+    simulator = ProductionSimulator(weekly_probability={"Major": 0.0, "Critical": 1.0})
+    incidents = simulator.simulate(MATURITY, start_week=20, weeks=3, rng=random.Random(0))
+
+    assert [incident.week for incident in incidents] == [21, 21, 22, 22, 23, 23]
+    security = PRODUCTION_ISSUES["security"]
+    assert incidents[0].title == f"Critical: {security['title']}"
+    assert incidents[0].impact == {"cost": -security["cost"], "reputation": -security["reputation"]}
+
+
+def test_ready_platform_has_no_incidents():
+    simulator = ProductionSimulator(weekly_probability={"Major": 1.0, "Critical": 1.0})
+    ready = {dimension: 100 for dimension in MATURITY_DIMENSIONS}
+    assert simulator.weekly_risks(ready) == []
+    assert simulator.simulate(ready, 0, 52, random.Random(0)) == []
+    assert simulator.forecast(ready, 52, runs=10, rng=random.Random(0))["cost"]["max"] == 0
+
+
+def test_forecast_matches_the_weekly_simulation():
+    simulator = ProductionSimulator()
+    weeks, runs = 30, 4000
+    forecast = simulator.forecast(MATURITY, weeks, runs, random.Random(1))
+
+    rng = random.Random(2)
+    costs = [
+        -sum(incident.impact["cost"] for incident in simulator.simulate(MATURITY, 0, weeks, rng))
+        for _ in range(runs)
+    ]
+    expected = sum(p * weeks * PRODUCTION_ISSUES[c]["cost"] for c, _, p in simulator.weekly_risks(MATURITY))
+    assert forecast["cost"]["mean"] == pytest.approx(expected, rel=0.1)
+    assert sum(costs) / runs == pytest.approx(expected, rel=0.1)
+    assert forecast["incident_probability"]["security"] == pytest.approx(1 - 0.96 ** weeks, abs=0.03)
+
+
+def test_launch_charges_every_incident_at_once(engine):
+    engine.production_simulator = ProductionSimulator(weekly_probability={"Major": 0.2, "Critical": 0.5})
+    week = engine.game_state.current_week
+    budget = engine.game_state.budget
+
+    engine.launch_to_production()
+    incidents = [e for e in engine.game_state.events if e.title.startswith(("Major:", "Critical:"))]
+
+    assert incidents
+    assert all(week < incident.week <= week + engine.game_state.time_remaining_weeks for incident in incidents)
+    assert engine.game_state.current_week == week
+    assert engine.game_state.budget == budget + sum(incident.impact["cost"] for incident in incidents)
+    assert engine.game_state.reputation == 0
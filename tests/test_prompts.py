@@ -0,0 +1,125 @@
+"""Tests for the prompt templates, JSON answer parsing and per-call usage accounting."""
+import json
+from types import SimpleNamespace
+import pytest
+from agents.decision_agent import DecisionAgent
+from agents.prompts import (
+    DECISIONS, FINAL_REPORT, PDF_SCENARIOS, READINESS, PromptTemplate, PromptUsage,
+    flight_key, generate, generate_stream, maturity_line, parse_json_response, prompt_usage
+)
+from models import MATURITY_DIMENSIONS
+
+STATE = {
+    "budget": 750000, "time_remaining_weeks": 40, "resources": 8,
+    "maturity": {d: 10 * i for i, d in enumerate(MATURITY_DIMENSIONS)}
+}
+
+
+class FakeModel:
+    """Answers every prompt with the same text and usage metadata."""
+
+    def __init__(self, text="[]", fail=False):
+        self.text = text
+        self.fail = fail
+        self.prompts = []
+
+    def response(self):
+        usage = SimpleNamespace(prompt_token_count=100, candidates_token_count=20, cached_content_token_count=80)
+        return SimpleNamespace(text=self.text, usage_metadata=usage)
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError("model failed")
+        return iter([self.response(), self.response()]) if stream else self.response()
+
+
+def test_prompts_start_with_the_static_prefix():
+    agent = DecisionAgent()
+    first = agent._build_decision_prompt(STATE, 3)
+    second = agent._build_decision_prompt(dict(STATE, budget=1), 9)
+    assert first.startswith(DECISIONS.prefix) and second.startswith(DECISIONS.prefix)
+    assert first != second
+    assert "week 3; budget $750,000" in first
+
+
+@pytest.mark.parametrize("template", [DECISIONS, READINESS, FINAL_REPORT, PDF_SCENARIOS])
+def test_templates_keep_their_json_braces_out_of_formatting(template):
+    names = [part.split("}")[0].split(":")[0] for part in template.state.split("{")[1:]]
+    prompt = template.render(**{name: 1 for name in names})
+    assert prompt.startswith(template.prefix)
+    assert template.prefix.endswith("\n\n")
+
+
+def test_render():
+    template = PromptTemplate("t", "  Instructions {not a field}  ", "Value: {value}")
+    assert template.render(value=3) == "Instructions {not a field}\n\nValue: 3"
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": 1}',
+    '```json\n{"a": 1}\n```',
+    '```\n{"a": 1}\n```',
+    '  \n```json{"a": 1}```  ',
+])
+def test_parse_json_response(text):
+    assert parse_json_response(text) == {"a": 1}
+
+
+def test_parse_json_response_rejects_prose():
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_response("Sure! Here it is: {}")
+
+
+def test_maturity_line():
+    assert maturity_line({"security": 40}) == (
+        "agent_development 0, agent_operations 0, data_platforms 0, security 40, governance 0"
+    )
+
+
+def test_usage_totals_and_averages():
+    usage = PromptUsage(recent=2)
+    template = PromptTemplate("t", "p" * 98, "{x}")
+    response = FakeModel().response()
+    usage.record(template, template.render(x="ab"), response, seconds=1.0)
+    usage.record(template, template.render(x="ab"), seconds=3.0, failed=True)
+    usage.record(template, template.render(x="ab"), response, seconds=2.0, first_chunk_seconds=0.5)
+
+    snapshot = usage.snapshot()
+    totals = snapshot["templates"]["t"]
+    assert totals["calls"] == 3 and totals["failures"] == 1 and totals["streamed"] == 1
+    assert totals["prompt_tokens"] == 200 and totals["cached_tokens"] == 160
+    assert totals["mean_prompt_chars"] == 102
+    assert totals["static_prefix_share"] == pytest.approx(100 / 102, abs=0.001)
+    assert totals["mean_seconds"] == 2.0
+    assert totals["mean_first_chunk_seconds"] == 0.5
+    assert len(snapshot["recent"]) == 2
+
+
+def test_flight_key_ignores_whitespace_only():
+    model = FakeModel()
+    assert flight_key(model, DECISIONS, "a  b\n c") == flight_key(model, DECISIONS, "a b c")
+    assert flight_key(model, DECISIONS, "a b") != flight_key(model, READINESS, "a b")
+    assert flight_key(model, DECISIONS, "a b") != flight_key(FakeModel(), DECISIONS, "a b")
+
+
+def test_generate_records_the_call():
+    template = PromptTemplate("test_generate", "Prefix", "{n}")
+    model = FakeModel('{"ok": true}')
+    assert generate(model, template, template.render(n=1)).text == '{"ok": true}'
+    with pytest.raises(RuntimeError):
+        generate(FakeModel(fail=True), template, template.render(n=2))
+
+    totals = prompt_usage.snapshot()["templates"]["test_generate"]
+    assert totals["calls"] == 2 and totals["failures"] == 1
+    assert totals["output_tokens"] == 20
+
+
+def test_generate_stream_records_the_call_once():
+    template = PromptTemplate("test_stream", "Prefix", "{n}")
+    chunks = list(generate_stream(FakeModel(), template, template.render(n=1)))
+    assert len(chunks) == 2
+
+    totals = prompt_usage.snapshot()["templates"]["test_stream"]
+    assert totals["calls"] == 1 and totals["streamed"] == 1
+    assert totals["prompt_tokens"] == 100
@@ -0,0 +1,95 @@
+"""Tests for readiness verdicts and the memo of their AI-written prose."""
+import pytest
+import config
+from agents.decision_agent import DecisionAgent
+from agents.readiness import (
+    ReadinessMemo, bucket_ranges, maturity_bucket, memo_key, readiness_verdict
+)
+from models import MATURITY_DIMENSIONS, GameConfig
+
+PROSE = {"potential_issues": ["Outages"], "recommendations": ["Add monitoring"]}
+
+
+def maturity(*levels):
+    return dict(zip(MATURITY_DIMENSIONS, levels))
+
+
+def test_verdict_from_the_thresholds():
+    verdict = readiness_verdict(maturity(80, 70, 65, 30, 55))
+    assert verdict == {
+        "ready_for_production": False,
+        "risk_level": "medium",
+        "weak_areas": ["security", "governance"],
+        "critical_gaps": ["security"]
+    }
+    assert readiness_verdict(maturity(*[75] * 5))["ready_for_production"]
+    lenient = GameConfig.from_dict({"production_ready_threshold": 50, "minimum_acceptable_threshold": 20})
+    assert readiness_verdict(maturity(80, 70, 65, 30, 55), lenient)["ready_for_production"]
+
+
+def test_buckets_and_ranges():
+    bucket = maturity_bucket(maturity(0, 9, 10, 99, 100), 10)
+    assert bucket == (0, 0, 1, 9, 9)
+    assert list(bucket_ranges(bucket, 10).values()) == ["0-9", "0-9", "10-19", "90-100", "90-100"]
+    assert list(bucket_ranges(maturity_bucket(maturity(0, 24, 25, 74, 75), 25), 25).values()) == [
+        "0-24", "0-24", "25-49", "50-74", "75-100"
+    ]
+
+
+def test_memo_key_separates_what_the_prose_depends_on():
+    bucket = maturity_bucket(maturity(45, 45, 45, 45, 45), 10)
+    key = memo_key(bucket, 10)
+    assert memo_key(bucket, 10) == key
+    assert memo_key(bucket, 20) != key
+    assert memo_key(bucket, 10, GameConfig.from_dict({"production_ready_threshold": 70})) != key
+    # Same bucket, but the averages fall on either side of the risk level boundary
+    riskier, safer = maturity(45, 45, 45, 45, 59), maturity(49, 49, 49, 49, 59)
+    bucket = maturity_bucket(riskier, 10)
+    assert maturity_bucket(safer, 10) == bucket
+    assert memo_key(bucket, 10, verdict=readiness_verdict(riskier)) != memo_key(bucket, 10, verdict=readiness_verdict(safer))
+
+
+def test_memo_persists_across_instances(tmp_path):
+    path = str(tmp_path / "memo.db")
+    ReadinessMemo(path).put("key", PROSE)
+    memo = ReadinessMemo(path)
+    assert memo.get("key") == PROSE
+    assert memo.get("other") is None
+    assert memo.usage()["entries"] == 1
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """A decision agent whose model writes PROSE, counting the calls."""
+    monkeypatch.setattr(config, "READINESS_CACHE_FILE", str(tmp_path / "memo.db"))
+    agent = DecisionAgent()
+    agent.calls = []
+
+    def generate(ranges, verdict, game_config):
+        agent.calls.append(ranges)
+        return agent.prose
+
+    agent.prose = PROSE
+    agent._generate_readiness_prose = generate
+    return agent
+
+
+def test_analysis_asks_the_model_once_per_bucket(agent):
+    first = agent.analyze_production_readiness(maturity(42, 45, 47, 61, 70))
+    second = agent.analyze_production_readiness(maturity(48, 41, 43, 69, 79))
+
+    assert len(agent.calls) == 1
+    assert agent.calls[0]["agent_development"] == "40-49"
+    assert first["potential_issues"] == second["potential_issues"] == PROSE["potential_issues"]
+    assert first["weak_areas"] == ["agent_development", "agent_operations", "data_platforms"]
+
+    agent.analyze_production_readiness(maturity(30, 45, 47, 61, 70))
+    assert len(agent.calls) == 2
+
+
+def test_failed_prose_is_not_memoized(agent):
+    agent.prose = None
+    analysis = agent.analyze_production_readiness(maturity(*[50] * 5))
+    assert analysis["potential_issues"] and analysis["recommendations"]
+    agent.analyze_production_readiness(maturity(*[50] * 5))
+    assert len(agent.calls) == 2
@@ -0,0 +1,97 @@
+"""Tests for the local score and the background final report."""
+import threading
+import pytest
+from agents.offline_agent import OfflineDecisionAgent
+from report_service import score_game
+
+
+class GatedAgent(OfflineDecisionAgent):
+    """Offline agent whose final report waits for `release` (and fails if `error` is set)."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.error = None
+        self.calls = 0
+
+    def generate_final_report(self, game_state, game_config=None):
+        self.calls += 1
+        assert self.release.wait(5)
+        if self.error:
+            raise RuntimeError(self.error)
+        return super().generate_final_report(game_state, game_config)
+
+
+@pytest.fixture
+def agent(app):
+    agent = app.extensions['simulator']._decision_agent = GatedAgent()
+    yield agent
+    agent.release.set()
+
+
+def end_game(client):
+    response = client.post('/api/game/end')
+    assert response.status_code == 200
+    return response.get_json()['result']
+
+
+@pytest.mark.parametrize("maturity, production, reputation, expected", [
+    (100, False, 100, {"overall_score": 100, "grade": "A+"}),
+    (60, False, 100, {"overall_score": 60, "grade": "C"}),
+    (60, True, 100, {"overall_score": 60, "grade": "C"}),
+    (60, True, 0, {"overall_score": 45, "grade": "D"}),
+    (10, False, 100, {"overall_score": 10, "grade": "F"}),
+])
+def test_score_game(maturity, production, reputation, expected):
+    state = {"maturity": {"security": maturity, "governance": maturity},
+             "is_production": production, "reputation": reputation}
+    assert score_game(state) == expected
+
+
+def test_report_is_generated_in_the_background(client, agent):
+    client.post('/api/game/new')
+    result = end_game(client)
+    assert result['report_status'] == 'pending'
+    assert result['score']['grade']
+
+    pending = client.get(f"/api/reports/{result['report_id']}").get_json()
+    assert pending['status'] == 'pending' and pending['report'] is None
+
+    agent.release.set()
+    ready = client.get(f"/api/reports/{result['report_id']}?wait=5").get_json()
+    assert ready['status'] == 'ready'
+    assert ready['report']
+
+    again = end_game(client)
+    assert again['report_id'] == result['report_id']
+    assert again['report'] == ready['report']
+    assert agent.calls == 1
+
+
+def test_failed_report_is_generated_again(client, agent):
+    client.post('/api/game/new')
+    agent.error = "model unavailable"
+    agent.release.set()
+    result = end_game(client)
+
+    failed = client.get(f"/api/reports/{result['report_id']}?wait=5").get_json()
+    assert failed['status'] == 'failed'
+    assert failed['error'] == "model unavailable"
+
+    agent.error = None
+    retried = end_game(client)
+    assert retried['report_id'] != result['report_id']
+    assert client.get(f"/api/reports/{retried['report_id']}?wait=5").get_json()['status'] == 'ready'
+
+
+def test_new_game_drops_the_report(client, agent):
+    client.post('/api/game/new')
+    result = end_game(client)
+    client.post('/api/game/new')
+    agent.release.set()
+    assert client.get(f"/api/reports/{result['report_id']}").status_code == 404
+
+
+def test_unknown_report(client):
+    client.post('/api/game/new')
+    assert client.get('/api/reports/nope').status_code == 404
@@ -0,0 +1,69 @@
+"""Tests for near-duplicate scenario detection."""
+import pytest
+from scenario_dedup import MinHasher, NearDuplicateIndex, estimate_similarity
+from scenario_manager import ScenarioManager
+
+TEXT = (
+    "The security team reports that agents can call internal tools without any audit trail. "
+    "Leadership asks whether to build a central tool gateway with policy checks and logging, "
+    "or to let each team add its own controls over the next quarter."
+)
+REWORDED = TEXT.replace("next quarter", "coming quarter")
+UNRELATED = (
+    "Data engineers propose moving the feature store to a managed lakehouse so that training "
+    "and serving read the same tables, at the price of a migration freeze for six weeks."
+)
+
+
+def scenario(scenario_id: str, text: str) -> dict:
+    return {
+        "id": scenario_id,
+        "title": "Tool access",
+        "description": text,
+        "options": [{"id": "o1", "text": "Build the gateway", "cost": 1000}]
+    }
+
+
+def test_similarity_estimates():
+    hasher = MinHasher()
+    assert estimate_similarity(hasher.signature(TEXT), hasher.signature(TEXT)) == 1.0
+    assert estimate_similarity(hasher.signature(TEXT), hasher.signature(REWORDED)) > 0.8
+    assert estimate_similarity(hasher.signature(TEXT), hasher.signature(UNRELATED)) < 0.2
+
+
+def test_index_finds_near_duplicates_only():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("original", index.hasher.signature(TEXT))
+    index.add("other", index.hasher.signature(UNRELATED))
+
+    assert [key for key, _ in index.query(index.hasher.signature(REWORDED))] == ["original"]
+    index.remove("original")
+    assert index.query(index.hasher.signature(REWORDED)) == []
+    assert len(index) == 1
+
+
+@pytest.mark.parametrize("text", ["", "   ", "!!! ---"])
+def test_text_without_words_has_no_signature(text):
+    index = NearDuplicateIndex()
+    assert index.hasher.signature(text) is None
+    index.add("empty", None)
+    index.add("other", index.hasher.signature("!!! ..."))
+    assert len(index) == 0
+    assert index.query(None) == []
+
+
+def test_manager_rejects_and_merges_near_duplicates(tmp_path):
+    manager = ScenarioManager(str(tmp_path / "scenarios.json"), dedup_mode="reject")
+    assert manager.add_scenarios([scenario("a", TEXT)])["added"] == 1
+
+    result = manager.add_scenarios([scenario("b", REWORDED), scenario("c", UNRELATED)])
+    assert result["added"] == 1
+    assert [(d["id"], d["duplicate_of"]) for d in result["duplicates"]] == [("b", "a")]
+
+    manager.dedup_mode = "merge"
+    extended = scenario("d", REWORDED)
+    extended["options"].append({"id": "o2", "text": "Let teams decide", "cost": 0})
+    result = manager.add_scenarios([extended])
+    assert result["merged"] == 1
+    merged = next(s for s in manager.get_all_scenarios() if s["id"] == "a")
+    assert [o["text"] for o in merged["options"]] == ["Build the gateway", "Let teams decide"]
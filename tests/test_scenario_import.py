@@ -0,0 +1,110 @@
+"""Tests for the NDJSON bulk scenario import."""
+import json
+import threading
+import pytest
+from scenario_manager import ScenarioManager
+
+
+def scenario(scenario_id: str, words: str) -> dict:
+    return {
+        "id": scenario_id,
+        "title": f"Scenario {scenario_id}",
+        "description": f"The team must decide how to handle {words} before the next release.",
+        "options": [{"id": f"{scenario_id}_o1", "text": f"Invest in {words}", "cost": 1000}]
+    }
+
+
+TOPICS = [
+    "vector database sharding", "prompt injection filtering", "GPU quota negotiation",
+    "agent memory retention rules", "model card documentation", "on-call rotation for agents"
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ScenarioManager(str(tmp_path / "scenarios.json"), dedup_mode="reject")
+
+
+def test_import_reports_per_line(manager, tmp_path):
+    lines = [
+        json.dumps(scenario("a", TOPICS[0])),
+        "",
+        "{not json",
+        json.dumps({"id": "bad", "title": "No options", "options": []}),
+        json.dumps(dict(scenario("a", TOPICS[0]), id="a2")),
+        json.dumps(scenario("b", TOPICS[1])).encode(),
+    ]
+    result = manager.import_ndjson(lines, batch_size=2)
+
+    assert result["lines"] == 6
+    assert (result["added"], result["error_count"], result["duplicate_count"]) == (2, 2, 1)
+    assert [e["line"] for e in result["errors"]] == [3, 4]
+    assert result["duplicates"][0]["line"] == 5
+    assert result["saved"]
+    stored = ScenarioManager(str(tmp_path / "scenarios.json"))
+    assert {"a", "b"} <= {s["id"] for s in stored.get_all_scenarios()}
+
+
+def test_import_caps_reported_entries(manager):
+    result = manager.import_ndjson(["{"] * 5, max_reported=2)
+    assert result["error_count"] == 5
+    assert len(result["errors"]) == 2
+
+
+def test_reading_the_upload_does_not_block_the_catalog(manager):
+    blocked = []
+
+    def lines():
+        for index, topic in enumerate(TOPICS):
+            reader = threading.Thread(target=manager.query_scenarios, kwargs={"limit": 1})
+            reader.start()
+            reader.join(timeout=2)
+            blocked.append(reader.is_alive())
+            yield json.dumps(scenario(f"s{index}", topic))
+
+    result = manager.import_ndjson(lines(), batch_size=2)
+    assert result["added"] == len(TOPICS)
+    assert not any(blocked)
+
+
+@pytest.fixture
+def failing_save(manager, monkeypatch):
+    monkeypatch.setattr(manager, "save_scenarios", lambda: False)
+    return manager
+
+
+def catalog_state(manager):
+    return json.dumps(manager.get_all_scenarios()), manager.query_scenarios(limit=100)["total"]
+
+
+def test_failed_save_rolls_back_an_import(failing_save):
+    before = catalog_state(failing_save)
+    result = failing_save.import_ndjson([json.dumps(scenario(f"s{i}", t)) for i, t in enumerate(TOPICS)])
+    assert not result["saved"]
+    assert result["added"] == 0
+    assert catalog_state(failing_save) == before
+    # The rolled back scenarios are not duplicates of anything
+    assert failing_save.dedup_index.query(failing_save.dedup_index.signature(scenario("s0", TOPICS[0]))) == []
+
+
+def test_failed_save_rolls_back_single_and_batch_adds(failing_save):
+    before = catalog_state(failing_save)
+    assert not failing_save.ingest_scenario(scenario("a", TOPICS[0]))["saved"]
+    result = failing_save.add_scenarios([scenario("b", TOPICS[1])])
+    assert not result["saved"]
+    assert (result["added"], result["scenarios"]) == (0, [])
+    assert catalog_state(failing_save) == before
+
+
+def test_failed_save_rolls_back_merged_options(manager, monkeypatch):
+    manager.dedup_mode = "merge"
+    original = scenario("a", TOPICS[0])
+    assert manager.add_scenarios([original])["saved"]
+    before = catalog_state(manager)
+
+    extended = dict(original, id="a2", options=original["options"] + [{"id": "new", "text": "Wait", "cost": 0}])
+    monkeypatch.setattr(manager, "save_scenarios", lambda: False)
+    result = manager.add_scenarios([extended])
+    assert not result["saved"]
+    assert result["merged"] == 0
+    assert catalog_state(manager) == before
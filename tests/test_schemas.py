@@ -0,0 +1,66 @@
+"""Tests for scenario and option validation."""
+import pytest
+from models.game_state import DecisionOption
+from models.schemas import SchemaError, to_decision_option, validate_scenario, validate_scenarios
+
+
+def scenario(scenario_id: str = "s1", **overrides) -> dict:
+    data = {
+        "id": scenario_id,
+        "title": "  Pick a platform  ",
+        "options": [{"id": "o1", "text": "Build", "cost": 1000, "maturity_impact": {"security": 5}}]
+    }
+    data.update(overrides)
+    return data
+
+
+def test_validate_scenario_normalizes_defaults():
+    result = validate_scenario(scenario())
+    assert result["title"] == "Pick a platform"
+    assert result["category"] == "strategic"
+    assert result["week_available"] == 0
+    option = result["options"][0]
+    assert option["time_weeks"] == 1
+    assert option["immediate_impact"] is True
+    assert option["maturity_impact"] == {
+        "agent_development": 0, "agent_operations": 0, "data_platforms": 0, "security": 5, "governance": 0
+    }
+
+
+@pytest.mark.parametrize("overrides, field", [
+    ({"options": []}, "options"),
+    ({"title": ""}, "title"),
+    ({"category": "mystery"}, "category"),
+    ({"week_available": -1}, "week_available"),
+    ({"options": [{"id": "o1", "text": "x", "cost": -5}]}, "options.0.cost"),
+    ({"options": [{"id": "o1", "text": "x", "cost": 1, "maturity_impact": {"luck": 3}}]},
+     "options.0.maturity_impact.luck"),
+])
+def test_validate_scenario_reports_fields(overrides, field):
+    with pytest.raises(SchemaError) as info:
+        validate_scenario(scenario(**overrides))
+    assert field in [error["field"] for error in info.value.errors]
+
+
+def test_validate_scenarios_reports_errors_per_index():
+    batch = [scenario("a"), scenario("b", options=[]), scenario("c"), {"id": "d"}, "not a scenario"]
+    valid, errors = validate_scenarios(batch)
+
+    assert [s["id"] for s in valid] == ["a", "c"]
+    assert [(e["index"], e["id"]) for e in errors] == [(1, "b"), (3, "d"), (4, None)]
+    assert errors[0]["errors"][0]["field"] == "options"
+
+
+def test_validate_scenarios_rejects_a_non_list():
+    with pytest.raises(SchemaError):
+        validate_scenarios({"id": "a"})
+
+
+def test_to_decision_option():
+    option = to_decision_option({"id": "o1", "text": "Build", "cost": 10, "maturity_impact": {"governance": 2}})
+    assert isinstance(option, DecisionOption)
+    assert option.cost == 10
+    assert option.maturity_impact["governance"] == 2
+
+    with pytest.raises(SchemaError):
+        to_decision_option({"id": "o1", "text": "Build"})
@@ -0,0 +1,137 @@
+"""Tests for the session stores: persistence, leases and memory caps."""
+import time
+import pytest
+from session_store import InMemorySessionStore, SQLiteSessionStore, SessionBusyError, create_session_store
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, engine_factory):
+    return SQLiteSessionStore(engine_factory, str(tmp_path / "sessions.db"), lease_seconds=5, wait_seconds=0.05)
+
+
+def test_sqlite_store_persists_sessions(sqlite_store, engine_factory, tmp_path):
+    with sqlite_store.session("a") as engine:
+        engine.start_new_game()
+        engine.advance_weeks(4)
+        expected = engine.snapshot()
+
+    other = SQLiteSessionStore(engine_factory, str(tmp_path / "sessions.db"))
+    assert other.peek("a").snapshot() == expected
+    assert other.peek("b").game_state is None
+
+
+def test_sqlite_store_keeps_state_when_a_request_fails(sqlite_store):
+    with sqlite_store.session("a") as engine:
+        engine.start_new_game()
+    tag = sqlite_store.state_tag("a")
+
+    with pytest.raises(RuntimeError):
+        with sqlite_store.session("a") as engine:
+            engine.advance_weeks(4)
+            raise RuntimeError("boom")
+
+    assert sqlite_store.peek("a").game_state.current_week == 0
+    assert sqlite_store.state_tag("a") == tag
+    with sqlite_store.session("a"):
+        pass
+
+
+def test_sqlite_store_lease_blocks_other_requests(sqlite_store):
+    with sqlite_store.session("a") as engine:
+        engine.start_new_game()
+        with pytest.raises(SessionBusyError):
+            with sqlite_store.session("a"):
+                pass
+        with sqlite_store.session("b"):
+            pass
+
+
+def test_sqlite_store_expired_lease_is_taken_over(tmp_path, engine_factory):
+    path = str(tmp_path / "sessions.db")
+    crashed = SQLiteSessionStore(engine_factory, path, lease_seconds=0.05, wait_seconds=0.05)
+    store = SQLiteSessionStore(engine_factory, path, lease_seconds=5, wait_seconds=1)
+
+    with crashed.session("a") as stale:
+        stale.start_new_game()
+        time.sleep(0.1)
+        with store.session("a") as engine:
+            engine.start_new_game()
+            engine.advance_weeks(2)
+        stale.advance_weeks(9)
+
+    # The stale request lost its lease, so its changes were not saved
+    assert store.peek("a").game_state.current_week == 2
+
+
+def test_sqlite_store_delete(sqlite_store):
+    with sqlite_store.session("a") as engine:
+        engine.start_new_game()
+
+    sqlite_store.delete("a")
+    assert sqlite_store.peek("a").game_state is None
+    assert sqlite_store.state_tag("a") is None
+    assert sqlite_store.memory_usage()["stored_sessions"] == 0
+
+
+def play(store, session_id: str, weeks: int = 3):
+    with store.session(session_id) as engine:
+        if engine.game_state is None:
+            engine.rng.seed(0)
+            engine.start_new_game()
+        engine.advance_weeks(weeks)
+        return engine.snapshot()
+
+
+def test_memory_store_spills_sessions_above_the_session_limit(tmp_path, engine_factory):
+    store = InMemorySessionStore(engine_factory, session_limit=1, spill_dir=str(tmp_path))
+    expected = play(store, "a")
+
+    usage = store.memory_usage()
+    assert usage["resident_sessions"] == 0
+    assert usage["total_bytes"] == 0
+    assert store.spilled == 1
+    assert store.state_tag("a") is not None
+    assert store.peek("a").snapshot() == expected
+    assert play(store, "a", 2)["game_state"]["current_week"] == 5
+
+
+def test_memory_store_spills_least_recently_used_sessions(tmp_path, engine_factory):
+    store = InMemorySessionStore(engine_factory, spill_dir=str(tmp_path))
+    play(store, "a")
+    store.memory_limit = store.memory_usage()["total_bytes"] * 5 // 2
+    play(store, "b")
+    store.peek("a")
+    play(store, "c")
+
+    resident = {s["session_id"] for s in store.memory_usage()["sessions"]}
+    assert resident == {"a", "c"}
+    assert store.spilled == 1
+    assert store.peek("b").game_state.current_week == 3
+
+
+def test_memory_store_evicts_sessions(tmp_path, engine_factory):
+    store = InMemorySessionStore(engine_factory, session_limit=1, overflow="evict", spill_dir=str(tmp_path))
+    play(store, "a")
+    assert store.evicted == 1
+    assert store.spilled == 0
+    assert store.peek("a").game_state is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_memory_store_delete_is_not_an_eviction(tmp_path, engine_factory):
+    store = InMemorySessionStore(engine_factory, spill_dir=str(tmp_path))
+    play(store, "a")
+    store.delete("a")
+    assert store.evicted == 0
+    assert store.state_tag("a") is None
+    assert store.memory_usage()["resident_sessions"] == 0
+
+
+def test_memory_store_rejects_unknown_overflow(engine_factory):
+    with pytest.raises(ValueError):
+        InMemorySessionStore(engine_factory, overflow="drop")
+
+
+def test_unknown_store_kind(engine_factory):
+    with pytest.raises(ValueError):
+        create_session_store("redis", engine_factory)
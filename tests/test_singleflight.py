@@ -0,0 +1,123 @@
+"""Tests for coalescing identical model calls and their per-key rate limit."""
+import threading
+import time
+import pytest
+from agents.singleflight import RateLimitedError, SingleFlight
+
+FOLLOWERS = 4
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight: SingleFlight, call):
+    """Start a leader and FOLLOWERS callers of `call`; returns (results, errors)."""
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(call())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(FOLLOWERS + 1)]
+    threads[0].start()
+    wait_for(lambda: flight.usage()["in_flight"] == 1)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: flight.usage()["coalesced"] == FOLLOWERS)
+    return threads, results, errors
+
+
+def test_concurrent_calls_are_coalesced():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"answer": 42}
+
+    threads, results, errors = run_concurrently(flight, lambda: flight.do("key", fn))
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"answer": 42}] * (FOLLOWERS + 1)
+    assert not errors
+    assert flight.usage() == {"calls": 1, "coalesced": FOLLOWERS, "rate_limited": 0, "in_flight": 0}
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise ValueError("model failed")
+
+    threads, results, errors = run_concurrently(flight, lambda: flight.do("key", fn))
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not results
+    assert len(errors) == FOLLOWERS + 1
+    assert all(isinstance(e, ValueError) for e in errors)
+    # The failed call is not cached
+    assert flight.do("key", lambda: "retried") == "retried"
+
+
+def test_streams_are_replayed_to_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        yield "a"
+        release.wait(5)
+        yield "b"
+        yield "c"
+
+    threads, results, errors = run_concurrently(flight, lambda: list(flight.stream("key", fn)))
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert results == [["a", "b", "c"]] * (FOLLOWERS + 1)
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.usage()["coalesced"] == 0
+
+
+def test_rate_limit_per_key():
+    flight = SingleFlight(rate_per_minute=1, burst=2)
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    with pytest.raises(RateLimitedError):
+        flight.do("key", lambda: 3)
+    with pytest.raises(RateLimitedError):
+        list(flight.stream("key", lambda: iter([1])))
+    assert flight.do("other", lambda: 4) == 4
+    assert flight.usage()["rate_limited"] == 2
+
+
+def test_rate_limit_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("agents.singleflight.time.monotonic", lambda: now[0])
+    flight = SingleFlight(rate_per_minute=6, burst=1)
+    flight.do("key", lambda: 1)
+    with pytest.raises(RateLimitedError):
+        flight.do("key", lambda: 2)
+    now[0] += 10
+    assert flight.do("key", lambda: 3) == 3
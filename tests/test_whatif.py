@@ -0,0 +1,46 @@
+"""Tests for the what-if comparison endpoint."""
+import pytest
+
+OPTION = {"id": "o1", "text": "Harden", "cost": 10000, "time_weeks": 0, "maturity_impact": {"security": 10}}
+
+
+@pytest.mark.parametrize("store", ["memory", "sqlite"])
+def test_what_if_does_not_touch_the_session(app, client, store):
+    app.extensions['simulator'].session_store_kind = store
+    client.post('/api/game/new')
+    sessions = app.extensions['simulator'].sessions
+    before = client.get('/api/game/state')
+    tag = sessions.state_tag("test")
+
+    response = client.post('/api/game/whatif', json={
+        "branches": [{"label": "wait", "options": []}, {"options": [OPTION, OPTION]}]
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [b["applied"] for b in data["branches"]] == [0, 2]
+    assert data["branches"][1]["diff"]["maturity"]["security"] == 20
+    assert data["branches"][1]["diff"]["budget"] == -20000
+
+    assert sessions.state_tag("test") == tag
+    assert client.get('/api/game/state', headers={"If-None-Match": before.headers["ETag"]}).status_code == 304
+
+
+@pytest.mark.parametrize("body", [
+    {},
+    {"branches": []},
+    {"branches": ["not a branch"]},
+    {"branches": [{"options": "not a list"}]},
+    {"branches": [{"options": [{"id": "bad"}]}]},
+    {"branches": [{"options": []}], "baseline": 3},
+    ["not", "an", "object"],
+])
+def test_what_if_rejects_bad_requests(client, body):
+    client.post('/api/game/new')
+    response = client.post('/api/game/whatif', json=body)
+    assert response.status_code == 400
+    assert not response.get_json()["success"]
+
+
+def test_what_if_needs_a_game(client):
+    response = client.post('/api/game/whatif', json={"branches": [{"options": []}]})
+    assert response.status_code == 400
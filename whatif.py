@@ -0,0 +1,111 @@
+"""What-if branches: play alternative decisions from the current game and compare them."""
+from itertools import islice
+from typing import Dict, List, Optional
+from models import MATURITY_DIMENSIONS
+from report_service import score_game
+
+# Numeric outcome fields compared between branches
+OUTCOME_FIELDS = ("budget", "resources", "time_remaining_weeks", "current_week", "reputation")
+
+
+def outcome(engine, forecast_runs: int = 0) -> Dict:
+    """Summarize the state of a (branch) engine."""
+    state = engine.game_state
+    maturity = state.maturity.to_dict()
+    result = {field: getattr(state, field) for field in OUTCOME_FIELDS}
+    result["maturity"] = maturity
+    result["average_maturity"] = round(state.maturity.get_average(), 2)
+    result["score"] = score_game({
+        "maturity": maturity,
+        "is_production": state.is_production,
+        "reputation": state.reputation
+    })
+    if forecast_runs > 0 and not state.is_production:
+        forecast = engine.forecast_production(forecast_runs)
+        result["forecast"] = {
+            "expected_cost": forecast["cost"]["mean"],
+            "p90_cost": forecast["cost"]["p90"],
+            "expected_reputation_loss": forecast["reputation_loss"]["mean"]
+        }
+    return result
+
+
+def diff_outcomes(base: Dict, other: Dict) -> Dict:
+    """Get `other - base` for every numeric outcome."""
+    diff = {field: other[field] - base[field] for field in OUTCOME_FIELDS}
+    diff["maturity"] = {d: other["maturity"][d] - base["maturity"][d] for d in MATURITY_DIMENSIONS}
+    diff["average_maturity"] = round(other["average_maturity"] - base["average_maturity"], 2)
+    diff["score"] = other["score"]["overall_score"] - base["score"]["overall_score"]
+    if "forecast" in base and "forecast" in other:
+        diff["forecast"] = {
+            key: round(other["forecast"][key] - base["forecast"][key], 4)
+            for key in base["forecast"]
+        }
+    return diff
+
+
+def run_branch(engine, options: List[Dict]) -> Dict:
+    """
+    Apply decision options to an engine, in order.
+
+    Returns:
+        Dictionary with the number of options `applied` and, if a decision
+        could not be taken, the `stopped` reason
+    """
+    applied = 0
+    for option in options:
+        result = engine.process_decision_impact(option)
+        if not result.get("success"):
+            return {"applied": applied, "stopped": result.get("message")}
+        applied += 1
+    return {"applied": applied}
+
+
+def run_what_if(engine, branches: List[Dict], forecast_runs: int = 0,
+                baseline: Optional[int] = 0) -> Dict:
+    """
+    Run several branches from the engine's current state and compare them.
+
+    Each branch is a dictionary with an optional `label` and a list of
+    decision `options`. Branches run on copy-on-write forks with the same
+    random state, so differences come from the decisions alone. The engine
+    itself is not changed.
+
+    Returns:
+        Dictionary with the `current` outcome and, per branch, its
+        `outcome`, the `change` from the current state and the `diff`
+        against the baseline branch
+
+    Raises:
+        SchemaError: If an option is invalid
+    """
+    if not engine.game_state:
+        raise ValueError("No active game")
+    if not branches:
+        raise ValueError("At least one branch is required")
+
+    current = outcome(engine.fork(), forecast_runs)
+    results = []
+    for index, branch in enumerate(branches):
+        fork = engine.fork()
+        run = run_branch(fork, branch.get("options", []))
+        branch_outcome = outcome(fork, forecast_runs)
+        results.append(dict(
+            run,
+            label=branch.get("label") or f"Branch {index + 1}",
+            outcome=branch_outcome,
+            change=diff_outcomes(current, branch_outcome),
+            events=[
+                {"week": e.week, "title": e.title, "impact": e.impact}
+                for e in islice(fork.game_state.events, len(engine.game_state.events), None)
+            ]
+        ))
+
+    if baseline is not None and not 0 <= baseline < len(results):
+        raise ValueError(f"Baseline must be a branch index below {len(results)}")
+    if baseline is not None:
+        base = results[baseline]["outcome"]
+        for result in results:
+            result["diff"] = diff_outcomes(base, result["outcome"])
+
+    return {"current": current, "branches": results, "baseline": baseline}
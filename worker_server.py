@@ -0,0 +1,61 @@
+"""Pre-fork HTTP server: several worker processes sharing one listening socket."""
+from typing import Callable, List
+import os
+import signal
+import socket
+from werkzeug.serving import make_server
+
+
+def serve_workers(app_factory: Callable, host: str = "0.0.0.0", port: int = 5000,
+                  workers: int = 2, threaded: bool = True):
+    """
+    Serve the application from `workers` forked processes.
+
+    The parent binds the socket once and forks the workers, each of which
+    creates its own application with `app_factory` and accepts connections
+    from the shared socket, so the kernel spreads requests over the
+    processes (and cores). Game sessions must live in a shared store (see
+    session_store.SQLiteSessionStore) since any worker may get any request.
+
+    Requires os.fork (Linux/macOS).
+    """
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+
+    children: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                server = make_server(host, port, app_factory(), threaded=threaded, fd=sock.fileno())
+                server.serve_forever()
+            except Exception as e:
+                print(f"Worker {os.getpid()} failed: {e}")
+                status = 1
+            finally:
+                os._exit(status)
+        children.append(pid)
+
+    print(f" * Serving on http://{host}:{port} with {workers} worker processes")
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for _ in children:
+            os.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        sock.close()